@@ -0,0 +1,415 @@
+#!/usr/bin/env python3
+"""
+Microbenchmarks of the AIGC Preview API Test Suite Runner's own hot paths
+
+A run's wall time and memory should be the API's, not the harness's. This
+suite measures the runner's internal paths on synthetic data, without any
+network access, at 1k, 100k and 1M rows:
+
+- `generate_test_combinations`: building and iterating a large test matrix
+- `create_api_request_body` and `process_api_response`, per combination
+- `save_results_to_csv` and `iter_results_from_csv` (the streamed read the
+  report uses)
+- `generate_html_report` (the streamed, paginated report that replaced
+  `create_html_content`) and `create_image_gallery_html`
+
+Every benchmark and size runs in a fresh child process: it is timed (the
+best of repeated runs for fast ones), then a pass with `tracemalloc` gives
+the peak Python memory of the measured call alone (setup data excluded).
+Results are compared with the committed `benchmark_baseline.json`; times
+are scaled by a CPU calibration loop, so the comparison holds across
+machines. The exit code is 1 when a benchmark got slower or bigger than
+the tolerance allows, so CI can gate on it.
+"""
+
+import contextlib
+import gc
+import io
+import json
+import multiprocessing
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Dict, List, Any, Callable, Optional, Tuple
+
+from combination_matrix import TestMatrix
+from test_suite_runner import TestSuiteRunner
+
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmark_baseline.json")
+DEFAULT_SIZES = (1_000, 100_000, 1_000_000)
+MIN_TIMED_SECONDS = 0.5  # fast benchmarks are repeated until this much has been timed; the best run counts
+MAX_REPEATS = 50
+IMAGES_PER_TEST = 4
+
+
+def parse_size(text: str) -> int:
+    """`1000`, `100k` or `1m` → row count."""
+    text = text.strip().lower()
+    scale = {"k": 1_000, "m": 1_000_000}.get(text[-1:], 1)
+    return int(float(text[:-1] if scale > 1 else text) * scale)
+
+
+def format_size(rows: int) -> str:
+    if rows >= 1_000_000 and rows % 1_000_000 == 0:
+        return f"{rows // 1_000_000}m"
+    if rows >= 1_000 and rows % 1_000 == 0:
+        return f"{rows // 1_000}k"
+    return str(rows)
+
+
+def synthetic_config(rows: int) -> Dict[str, Any]:
+    """A full-matrix config with `rows` combinations: 10 locations × 10 persons × 10 pipelines × N image lists."""
+    lists = max(1, rows // 1000)
+    return {
+        "test_suite_name": "Runner microbenchmarks",
+        "base_url": "http://localhost:8080",
+        "endpoint": "/create-slideshow-urls",
+        "timeout_seconds": 300,
+        "image_lists": {
+            f"list_{i}": {
+                "name": f"Image list {i}",
+                "description": f"Synthetic list {i}",
+                "urls": [f"https://storage.googleapis.com/bench/list_{i}/image_{j}.jpg" for j in range(IMAGES_PER_TEST)],
+            }
+            for i in range(lists)
+        },
+        "location_prompts": {f"location_{i}": {"name": f"Location {i}", "value": f"A location number {i}"}
+                             for i in range(10)},
+        "person_prompts": {f"person_{i}": {"name": f"Person {i}", "value": f"A person number {i}"}
+                           for i in range(10)},
+        "pipeline_configs": {f"pipeline_{i}": {"name": f"Pipeline {i}", "description": f"Pipeline {i}",
+                                               "filename": f"pipeline_{i}.json"}
+                             for i in range(10)},
+        "test_settings": {"animation_prompt": "smooth camera movements", "max_retries": 0},
+        "html_report": {"page_size": 500},
+    }
+
+
+def synthetic_response(test_number: int) -> Dict[str, Any]:
+    return {
+        "status": "success",
+        "images_requested": IMAGES_PER_TEST,
+        "processed_images": [f"https://storage.googleapis.com/bench/out/{test_number}_{j}.jpg"
+                             for j in range(IMAGES_PER_TEST)],
+        "saved_state_blob": f"aigc_saved_state_{test_number:08d}.json",
+    }
+
+
+def make_runner(rows: int, workdir: str) -> TestSuiteRunner:
+    """A runner with a synthetic config and matrix, and no transport (nothing is sent)."""
+    runner = TestSuiteRunner(os.path.join(workdir, "benchmark_config.json"), thumbnails=False)
+    runner.config = synthetic_config(rows)
+    runner.matrix = TestMatrix(runner.config)
+    runner.total_combinations = len(runner.matrix)
+    return runner
+
+
+def make_results(runner: TestSuiteRunner, rows: int) -> List[Dict]:
+    metrics = {"attempts": 1, "phases": {"connect": 0.001, "upload": 0.002, "ttfb": 40.0, "download": 0.01}}
+    results = []
+    for number, combination in enumerate(runner.matrix, 1):
+        if number > rows:
+            break
+        results.append(runner.process_api_response(combination, number % 17 != 0, synthetic_response(number),
+                                                   40.0 + number % 13, None if number % 17 else "HTTP 500", number,
+                                                   metrics))
+    return results
+
+
+# Benchmarks: setup(runner, rows, workdir) → state (not measured), then run(runner, state) is measured
+
+def setup_nothing(runner: TestSuiteRunner, rows: int, workdir: str) -> Any:
+    return None
+
+
+def run_generate_combinations(runner: TestSuiteRunner, state: Any) -> int:
+    with contextlib.redirect_stdout(io.StringIO()):
+        matrix = runner.generate_test_combinations()
+    return sum(1 for _ in matrix)
+
+
+def setup_combinations(runner: TestSuiteRunner, rows: int, workdir: str) -> List[Dict]:
+    return list(runner.matrix)[:rows]
+
+
+def run_create_request_bodies(runner: TestSuiteRunner, combinations: List[Dict]) -> int:
+    for combination in combinations:
+        runner.create_api_request_body(combination, {})
+    return len(combinations)
+
+
+def setup_responses(runner: TestSuiteRunner, rows: int, workdir: str) -> List[Tuple[Dict, Dict]]:
+    return [(combination, synthetic_response(number)) for number, combination in enumerate(runner.matrix, 1)][:rows]
+
+
+def run_process_responses(runner: TestSuiteRunner, pairs: List[Tuple[Dict, Dict]]) -> int:
+    metrics = {"attempts": 1, "phases": {"connect": 0.001, "upload": 0.002, "ttfb": 40.0, "download": 0.01}}
+    for number, (combination, response) in enumerate(pairs, 1):
+        runner.process_api_response(combination, True, response, 40.0, None, number, metrics)
+    return len(pairs)
+
+
+def setup_results(runner: TestSuiteRunner, rows: int, workdir: str) -> Tuple[List[Dict], str]:
+    return make_results(runner, rows), os.path.join(workdir, "results.csv")
+
+
+def run_save_csv(runner: TestSuiteRunner, state: Tuple[List[Dict], str]) -> int:
+    results, filename = state
+    with contextlib.redirect_stdout(io.StringIO()):
+        runner.save_results_to_csv(filename, results)
+    return len(results)
+
+
+def setup_csv_file(runner: TestSuiteRunner, rows: int, workdir: str) -> str:
+    results, filename = setup_results(runner, rows, workdir)
+    with contextlib.redirect_stdout(io.StringIO()):
+        runner.save_results_to_csv(filename, results)
+    return filename
+
+
+def run_iter_csv(runner: TestSuiteRunner, filename: str) -> int:
+    return sum(1 for _ in runner.iter_results_from_csv(filename))
+
+
+def setup_report(runner: TestSuiteRunner, rows: int, workdir: str) -> List[Dict]:
+    os.chdir(workdir)  # the report is written to the working directory
+    return make_results(runner, rows)
+
+
+def run_html_report(runner: TestSuiteRunner, results: List[Dict]) -> int:
+    with contextlib.redirect_stdout(io.StringIO()):
+        if not runner.generate_html_report(results=results):
+            raise RuntimeError("HTML report generation failed")
+    return len(results)
+
+
+def setup_galleries(runner: TestSuiteRunner, rows: int, workdir: str) -> List[List[str]]:
+    return [synthetic_response(number)["processed_images"] for number in range(rows)]
+
+
+def run_image_galleries(runner: TestSuiteRunner, galleries: List[List[str]]) -> int:
+    for urls in galleries:
+        runner.create_image_gallery_html(urls, "Processed")
+    return len(galleries)
+
+
+BENCHMARKS: List[Tuple[str, Callable, Callable]] = [
+    ("generate_test_combinations", setup_nothing, run_generate_combinations),
+    ("create_api_request_body", setup_combinations, run_create_request_bodies),
+    ("process_api_response", setup_responses, run_process_responses),
+    ("save_results_to_csv", setup_results, run_save_csv),
+    ("iter_results_from_csv", setup_csv_file, run_iter_csv),
+    ("generate_html_report", setup_report, run_html_report),
+    ("create_image_gallery_html", setup_galleries, run_image_galleries),
+]
+
+
+def measure(name: str, rows: int, connection) -> None:
+    """Child process: time one benchmark, then measure its peak memory in a second pass."""
+    try:
+        setup, run = next((setup, run) for benchmark, setup, run in BENCHMARKS if benchmark == name)
+        with tempfile.TemporaryDirectory(prefix="aigc-bench-") as workdir:
+            runner = make_runner(rows, workdir)
+            state = setup(runner, rows, workdir)
+            gc.collect()
+            timings = []
+            while len(timings) < MAX_REPEATS and sum(timings) < MIN_TIMED_SECONDS:
+                start = time.perf_counter()
+                count = run(runner, state)
+                timings.append(time.perf_counter() - start)
+
+            gc.collect()
+            tracemalloc.start()
+            run(runner, state)
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+        connection.send({"seconds": min(timings), "peak_mib": peak / 1024 / 1024, "rows": count})
+    except Exception as e:
+        connection.send({"error": f"{type(e).__name__}: {e}"})
+
+
+def run_benchmark(name: str, rows: int) -> Dict[str, Any]:
+    receiver, sender = multiprocessing.Pipe(duplex=False)
+    process = multiprocessing.Process(target=measure, args=(name, rows, sender))
+    process.start()
+    sender.close()
+    try:
+        result = receiver.recv()
+    except EOFError:
+        result = {"error": f"benchmark process died (exit code {process.exitcode})"}
+    process.join()
+    return result
+
+
+def calibrate() -> float:
+    """Seconds for a fixed mix of dict, string and JSON work - the machine's speed for scaling baselines."""
+    best = float("inf")
+    for _ in range(5):
+        start = time.perf_counter()
+        for i in range(20_000):
+            record = {f"field_{j}": f"value {i} {j}" for j in range(10)}
+            json.dumps(record)
+            "; ".join(record.values()).split("; ")
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def baseline_scale(expected: Dict[str, Any], baseline: Dict[str, Any], calibration: float) -> float:
+    """Factor for a baseline entry's time on this machine; entries merged from several runs keep their own calibration."""
+    recorded = expected.get("calibration_seconds", baseline.get("calibration_seconds"))
+    return calibration / recorded if recorded else 1.0
+
+
+def compare(results: Dict[str, Dict], baseline: Dict[str, Any], calibration: float,
+            time_tolerance: float, memory_tolerance: float) -> List[str]:
+    """Regressions against the baseline, as printable lines."""
+    regressions = []
+    for key, result in results.items():
+        expected = baseline.get("results", {}).get(key)
+        if not expected or "error" in result or "error" in expected:
+            continue
+        scale = baseline_scale(expected, baseline, calibration)
+        allowed_seconds = expected["seconds"] * scale * (1 + time_tolerance / 100)
+        allowed_mib = expected["peak_mib"] * (1 + memory_tolerance / 100) + 1  # +1 MiB: noise on small sizes
+        if result["seconds"] > allowed_seconds:
+            regressions.append(f"{key}: {result['seconds']:.3f}s, expected at most {allowed_seconds:.3f}s "
+                               f"({expected['seconds'] * scale:.3f}s scaled baseline + {time_tolerance:.0f}%)")
+        if result["peak_mib"] > allowed_mib:
+            regressions.append(f"{key}: peak {result['peak_mib']:.1f} MiB, expected at most {allowed_mib:.1f} MiB "
+                               f"(baseline {expected['peak_mib']:.1f} MiB + {memory_tolerance:.0f}%)")
+    return regressions
+
+
+def main():
+    """Run the benchmarks, print a table, compare with (or update) the baseline."""
+    print("⏱️  AIGC Test Suite Runner microbenchmarks")
+    print("="*50)
+
+    sizes = list(DEFAULT_SIZES)
+    only = None
+    baseline_file = BASELINE_FILE
+    update_baseline = False
+    output_file = None
+    time_tolerance = 30.0
+    memory_tolerance = 20.0
+
+    args = sys.argv[1:]
+    i = 0
+    while i < len(args):
+        arg = args[i]
+        try:
+            if arg == "--sizes":
+                sizes = [parse_size(size) for size in args[i + 1].split(",")]
+                i += 1  # Skip the next argument as it's the size list
+            elif arg == "--only":
+                only = args[i + 1].split(",")
+                i += 1  # Skip the next argument as it's the benchmark list
+            elif arg == "--baseline":
+                baseline_file = args[i + 1]
+                i += 1  # Skip the next argument as it's the baseline filename
+            elif arg == "--json":
+                output_file = args[i + 1]
+                i += 1  # Skip the next argument as it's the output filename
+            elif arg in ("--time-tolerance", "--memory-tolerance"):
+                value = float(args[i + 1])
+                if arg == "--time-tolerance":
+                    time_tolerance = value
+                else:
+                    memory_tolerance = value
+                i += 1  # Skip the next argument as it's the percentage
+            elif arg == "--update-baseline":
+                update_baseline = True
+            elif arg == "--help":
+                print("Usage: python benchmarks.py [options]")
+                print("\nOptions:")
+                print("  --sizes <list>            Row counts to run (default: 1k,100k,1m)")
+                print("  --only <list>             Only these benchmarks (comma-separated names)")
+                print("  --baseline <file>         Baseline to compare with (default: benchmark_baseline.json)")
+                print("  --update-baseline         Write the measured numbers to the baseline instead of comparing")
+                print("  --json <file>             Also write the measured numbers to this file")
+                print("  --time-tolerance <pct>    Allowed slowdown over the scaled baseline (default: 30)")
+                print("  --memory-tolerance <pct>  Allowed peak-memory growth over the baseline (default: 20)")
+                print("  --help                    Show this help message")
+                print("\nBenchmarks: " + ", ".join(name for name, _, _ in BENCHMARKS))
+                sys.exit(0)
+        except (IndexError, ValueError):
+            print(f"❌ {arg} requires a value!")
+            sys.exit(2)
+        i += 1
+
+    names = [name for name, _, _ in BENCHMARKS if only is None or name in only]
+    unknown = set(only or []) - set(names)
+    if unknown:
+        print(f"❌ Unknown benchmarks: {', '.join(sorted(unknown))}")
+        sys.exit(2)
+
+    calibration = calibrate()
+    print(f"🔧 Calibration: {calibration * 1000:.1f} ms (Python {platform.python_version()}, {platform.machine()})")
+    print(f"   {'benchmark':<28}{'rows':>7}{'time':>11}{'rows/s':>12}{'peak MiB':>10}")
+    results: Dict[str, Dict] = {}
+    for name in names:
+        for rows in sizes:
+            key = f"{name}@{format_size(rows)}"
+            result = run_benchmark(name, rows)
+            results[key] = result
+            if "error" in result:
+                print(f"   {name:<28}{format_size(rows):>7}  ❌ {result['error']}")
+                continue
+            result["rows_per_second"] = result["rows"] / result["seconds"] if result["seconds"] else 0
+            result["calibration_seconds"] = calibration
+            print(f"   {name:<28}{format_size(rows):>7}{result['seconds']:>10.3f}s{result['rows_per_second']:>12,.0f}"
+                  f"{result['peak_mib']:>10.1f}")
+
+    report = {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "calibration_seconds": calibration,
+        "results": {key: {field: round(value, 4) if isinstance(value, float) else value
+                          for field, value in result.items()} for key, result in results.items()},
+    }
+    if output_file:
+        with open(output_file, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"📄 Results saved to: {output_file}")
+
+    failed = [key for key, result in results.items() if "error" in result]
+    if update_baseline:
+        previous = {}
+        if os.path.exists(baseline_file):
+            with open(baseline_file) as f:
+                previous = json.load(f).get("results", {})
+        # Keep entries that weren't rerun; failed benchmarks get no baseline
+        report["results"] = {**previous, **{key: result for key, result in report["results"].items()
+                                            if "error" not in result}}
+        with open(baseline_file, "w") as f:
+            json.dump(report, f, indent=2)
+            f.write("\n")
+        print(f"📌 Baseline updated: {baseline_file}")
+        sys.exit(1 if failed else 0)
+
+    try:
+        with open(baseline_file) as f:
+            baseline = json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"⚠️  No usable baseline ({e}) - run with --update-baseline to create one")
+        sys.exit(1 if failed else 0)
+    regressions = compare(results, baseline, calibration, time_tolerance, memory_tolerance)
+    scale = calibration / baseline["calibration_seconds"] if baseline.get("calibration_seconds") else 1.0
+    print(f"📏 Compared with {os.path.basename(baseline_file)} from {baseline.get('created', '?')} "
+          f"(baseline times × {scale:.2f} for this machine)")
+    for line in regressions:
+        print(f"   ❌ {line}")
+    if failed:
+        print(f"❌ {len(failed)} benchmarks failed: {', '.join(failed)}")
+    if not regressions and not failed:
+        print("✅ No regressions")
+    sys.exit(1 if regressions or failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+N-dimensional test matrix for the AIGC Preview API Test Suite Runner
+
+Builds test combinations lazily from any number of dimensions: the four
+built-in sections of the config (`image_lists`, `location_prompts`,
+`person_prompts`, `pipeline_configs`) plus optional extra dimensions from
+the `dimensions` section, each of which maps onto one request body field.
+Combinations can be filtered with include/exclude rules and reduced to a
+pairwise or t-way covering array so that adding a dimension doesn't
+multiply the number of API calls.
+"""
+
+import itertools
+import random
+from typing import Dict, List, Tuple, Any, Optional, Iterator
+
+from image_payloads import expand_image_files
+
+BUILTIN_DIMENSIONS = ("image_lists", "location_prompts", "person_prompts", "pipeline_configs")
+
+# Give up looking for a constraint-satisfying row for a tuple after this many candidates
+MAX_CONSTRAINED_SEARCH = 100000
+
+
+def parse_matrix_mode(mode: str) -> Tuple[str, int]:
+    """Parse `full`, `pairwise` or `<t>-way` into (mode, strength)."""
+    mode = (mode or "full").strip().lower()
+    if mode == "full":
+        return "full", 0
+    if mode == "pairwise":
+        return "covering", 2
+    if mode.endswith("-way") and mode[:-4].isdigit() and int(mode[:-4]) >= 1:
+        return "covering", int(mode[:-4])
+    raise ValueError(f"Unknown matrix mode '{mode}' (expected full, pairwise or <t>-way)")
+
+
+class TestMatrix:
+    """Re-iterable, lazily generated set of test combinations."""
+
+    __test__ = False  # not a pytest test class, despite the name
+
+    def __init__(self, config: Dict, mode: Optional[str] = None, base_dir: str = ""):
+        self.config = config
+        self.base_dir = base_dir  # local image files are resolved relative to this
+        settings = config.get("matrix", {})
+        self.mode, self.strength = parse_matrix_mode(mode or settings.get("mode", "full"))
+        self.include = settings.get("include", [])
+        self.exclude = settings.get("exclude", [])
+        self.seed = settings.get("seed", 0)
+
+        # (dimension name, request field, {value key: value data})
+        self.dimensions: List[Tuple[str, Optional[str], Dict[str, Dict]]] = [
+            (name, None, config[name]) for name in BUILTIN_DIMENSIONS
+        ]
+        for name, spec in config.get("dimensions", {}).items():
+            if name in BUILTIN_DIMENSIONS:
+                raise ValueError(f"Dimension '{name}' clashes with a built-in config section")
+            self.dimensions.append((name, spec.get("field", name), spec["values"]))
+        self.value_keys = [list(values.keys()) for _, _, values in self.dimensions]
+
+        self._rows: Optional[List[Tuple[str, ...]]] = None
+        self._length: Optional[int] = None
+        self.uncoverable_tuples = 0
+
+    @property
+    def full_size(self) -> int:
+        """Size of the unconstrained cartesian product."""
+        size = 1
+        for keys in self.value_keys:
+            size *= len(keys)
+        return size
+
+    def describe(self) -> str:
+        if self.mode == "full":
+            return "full matrix"
+        return "pairwise covering array" if self.strength == 2 else f"{self.strength}-way covering array"
+
+    def __iter__(self) -> Iterator[Dict]:
+        for row in self.iter_rows():
+            yield self.build_combination(row)
+
+    def __len__(self) -> int:
+        if self._length is None:
+            if self.mode == "full" and not self.include and not self.exclude:
+                self._length = self.full_size
+            else:
+                self._length = sum(1 for _ in self.iter_rows())
+        return self._length
+
+    def iter_rows(self) -> Iterator[Tuple[str, ...]]:
+        """Yield rows of value keys, one key per dimension."""
+        if self.mode == "full":
+            for row in itertools.product(*self.value_keys):
+                if self.is_allowed(row):
+                    yield row
+        else:
+            if self._rows is None:
+                self._rows = self.covering_rows(self.strength)
+            yield from self._rows
+
+    # Constraints --------------------------------------------------------
+
+    def rule_matches(self, rule: Dict[str, Any], row: Tuple[str, ...]) -> bool:
+        """A rule matches when every dimension it names has one of the listed keys."""
+        for index, (name, _, _) in enumerate(self.dimensions):
+            if name in rule:
+                wanted = rule[name] if isinstance(rule[name], list) else [rule[name]]
+                if row[index] not in [str(key) for key in wanted]:
+                    return False
+        return True
+
+    def is_allowed(self, row: Tuple[str, ...]) -> bool:
+        if self.include and not any(self.rule_matches(rule, row) for rule in self.include):
+            return False
+        return not any(self.rule_matches(rule, row) for rule in self.exclude)
+
+    # Covering arrays ----------------------------------------------------
+
+    def covering_rows(self, strength: int) -> List[Tuple[str, ...]]:
+        """Greedy (AETG-style) t-way covering array that respects the constraints.
+
+        Every allowed t-tuple of dimension values appears in at least one row;
+        tuples that only occur in excluded combinations are counted in
+        `uncoverable_tuples` instead.
+        """
+        count = len(self.dimensions)
+        strength = max(1, min(strength, count))
+        sizes = [len(keys) for keys in self.value_keys]
+        groups = list(itertools.combinations(range(count), strength))
+        rng = random.Random(self.seed)
+
+        uncovered = set()
+        for group in groups:
+            for values in itertools.product(*(range(sizes[d]) for d in group)):
+                uncovered.add((group, values))
+
+        def covered_by(row: List[int]) -> set:
+            return {(group, tuple(row[d] for d in group)) for group in groups}
+
+        def to_keys(row: List[int]) -> Tuple[str, ...]:
+            return tuple(self.value_keys[d][v] for d, v in enumerate(row))
+
+        rows = []
+        self.uncoverable_tuples = 0
+        while uncovered:
+            seed_group, seed_values = min(uncovered)
+            best_row, best_gain = None, 0
+            for _ in range(20):
+                row = self._greedy_row(seed_group, seed_values, sizes, groups, uncovered, rng)
+                if not self.is_allowed(to_keys(row)):
+                    continue
+                gain = len(covered_by(row) & uncovered)
+                if gain > best_gain:
+                    best_row, best_gain = row, gain
+
+            if best_row is None:
+                best_row = self._constrained_row(seed_group, seed_values, sizes, to_keys)
+            if best_row is None:
+                uncovered.discard((seed_group, seed_values))
+                self.uncoverable_tuples += 1
+                continue
+
+            uncovered -= covered_by(best_row)
+            rows.append(to_keys(best_row))
+        return rows
+
+    def _greedy_row(self, seed_group: Tuple[int, ...], seed_values: Tuple[int, ...], sizes: List[int],
+                    groups: List[Tuple[int, ...]], uncovered: set, rng: random.Random) -> List[int]:
+        """Fix the seed tuple, then pick each remaining value to cover the most new tuples."""
+        row: List[Optional[int]] = [None] * len(sizes)
+        for d, v in zip(seed_group, seed_values):
+            row[d] = v
+        remaining = [d for d in range(len(sizes)) if row[d] is None]
+        rng.shuffle(remaining)
+
+        for d in remaining:
+            relevant = [g for g in groups if d in g and all(row[o] is not None for o in g if o != d)]
+            best_values, best_gain = [], -1
+            for v in range(sizes[d]):
+                row[d] = v
+                gain = sum(1 for g in relevant if (g, tuple(row[o] for o in g)) in uncovered)
+                if gain > best_gain:
+                    best_values, best_gain = [v], gain
+                elif gain == best_gain:
+                    best_values.append(v)
+            row[d] = rng.choice(best_values)
+        return row
+
+    def _constrained_row(self, seed_group: Tuple[int, ...], seed_values: Tuple[int, ...],
+                         sizes: List[int], to_keys) -> Optional[List[int]]:
+        """Exhaustively look for any allowed row containing the seed tuple."""
+        free = [d for d in range(len(sizes)) if d not in seed_group]
+        for attempt, values in enumerate(itertools.product(*(range(sizes[d]) for d in free))):
+            if attempt >= MAX_CONSTRAINED_SEARCH:
+                break
+            row = [0] * len(sizes)
+            for d, v in zip(seed_group, seed_values):
+                row[d] = v
+            for d, v in zip(free, values):
+                row[d] = v
+            if self.is_allowed(to_keys(row)):
+                return row
+        return None
+
+    # Combinations -------------------------------------------------------
+
+    def build_combination(self, row: Tuple[str, ...]) -> Dict:
+        """Turn a row of value keys into the combination dict used by the runner."""
+        img_key, loc_key, person_key, pipe_key = row[:4]
+        img_data = self.config["image_lists"][img_key]
+        loc_data = self.config["location_prompts"][loc_key]
+        person_data = self.config["person_prompts"][person_key]
+        pipe_data = self.config["pipeline_configs"][pipe_key]
+
+        image_urls = img_data.get("urls", [])
+        image_files = self.local_files(img_data)
+        combination = {
+            "test_id": "_".join(row),
+            "image_list_key": img_key,
+            "image_list_name": img_data["name"],
+            "image_list_description": img_data["description"],
+            "image_urls": image_urls,
+            "image_files": image_files,
+            "image_count": len(image_urls) + len(image_files),
+            "location_prompt_key": loc_key,
+            "location_prompt_name": loc_data["name"],
+            "location_prompt_value": loc_data["value"],
+            "person_prompt_key": person_key,
+            "person_prompt_name": person_data["name"],
+            "person_prompt_value": person_data["value"],
+            "pipeline_config_key": pipe_key,
+            "pipeline_config_name": pipe_data["name"],
+            "pipeline_config_filename": pipe_data["filename"],
+            "dimension_keys": dict(zip((name for name, _, _ in self.dimensions), row)),
+            "request_fields": {},
+            "request_files": {},
+        }
+
+        for (name, field, values), key in zip(self.dimensions[4:], row[4:]):
+            value_data = values[key]
+            combination[f"{name}_key"] = key
+            combination[f"{name}_name"] = value_data.get("name", key)
+            if value_data.get("value") is not None:
+                combination["request_fields"][field] = value_data["value"]
+            if value_data.get("files"):
+                combination["request_files"][field] = self.local_files(value_data)
+        return combination
+
+    def local_files(self, data: Dict) -> List[str]:
+        """Expanded local image files (files and directories) listed under `files`."""
+        return list(expand_image_files(tuple(data.get("files", [])), self.base_dir))
+
+    @property
+    def extra_dimension_names(self) -> List[str]:
+        return [name for name, _, _ in self.dimensions[4:]]
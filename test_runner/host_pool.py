@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Multi-host routing for the AIGC Preview API Test Suite Runner
+
+`--host` can name several AIGC deployments (regions, Cloud Run revisions,
+a local GPU box), optionally weighted: `a.example.com=3,b.example.com`.
+Every attempt is routed to one healthy host:
+
+- `least_outstanding` (default): the host with the fewest requests in
+  flight per unit of weight
+- `latency`: the host with the lowest expected wait, i.e. its in-flight
+  requests (plus this one) times its smoothed latency, per unit of weight;
+  hosts without a latency yet are tried first
+
+A background thread probes every host's `/health` endpoint. A host is
+ejected after `eject_after_failures` consecutive failed probes or failed
+attempts (no response or a 5xx), and readmitted after
+`readmit_after_successes` consecutive healthy probes. If every host is
+ejected, requests go to all of them rather than nowhere. The caller can
+also turn hosts down per attempt (e.g. while their circuit breaker is
+open); the next best host is picked instead.
+"""
+
+import threading
+from typing import Dict, List, Tuple, Any, Optional, Callable
+
+from transport import HttpTransport
+
+ROUTING_MODES = ("least_outstanding", "latency")
+
+
+class HostPoolError(Exception):
+    """Invalid host list or routing settings."""
+
+
+def normalize_url(url: str) -> str:
+    url = url.strip().rstrip("/")
+    return url if url.startswith(("http://", "https://")) else f"http://{url}"
+
+
+def parse_host_list(spec: str) -> List[Tuple[str, float]]:
+    """`host[=weight],host[=weight],...` → [(base URL, weight)]."""
+    hosts = []
+    for entry in spec.split(","):
+        if not entry.strip():
+            continue
+        url, _, weight = entry.rpartition("=") if "=" in entry else (entry, "", "1")
+        try:
+            weight = float(weight)
+        except ValueError:
+            raise HostPoolError(f"Invalid weight in '{entry}' (expected host=<number>)")
+        if weight <= 0:
+            raise HostPoolError(f"Weight of '{url}' must be positive")
+        hosts.append((normalize_url(url), weight))
+    if not hosts:
+        raise HostPoolError(f"No hosts in '{spec}'")
+    if len({url for url, _ in hosts}) != len(hosts):
+        raise HostPoolError(f"Duplicate host in '{spec}'")
+    return hosts
+
+
+class PooledHost:
+    """One deployment in the pool, with its routing state and counters."""
+
+    def __init__(self, url: str, weight: float = 1.0):
+        self.url = url
+        self.weight = weight
+        self.outstanding = 0
+        self.latency = None  # exponentially smoothed seconds of successful attempts
+        self.healthy = True
+        self.consecutive_failures = 0
+        self.consecutive_successes = 0
+        self.requests = 0
+        self.errors = 0
+        self.ejections = 0
+
+    def expected_wait(self) -> float:
+        if self.latency is None:
+            return -1.0 / self.weight  # no latency yet: probe it first
+        return (self.outstanding + 1) * self.latency / self.weight
+
+
+class HostPool:
+    """Routes attempts across hosts and ejects/readmits them based on health checks and failures."""
+
+    def __init__(self, hosts: List[Tuple[str, float]], routing: str = "least_outstanding",
+                 health_path: str = "/health", health_interval_seconds: float = 10, health_timeout_seconds: float = 5,
+                 eject_after_failures: int = 3, readmit_after_successes: int = 2, latency_smoothing: float = 0.3,
+                 log: Callable[[str], None] = print):
+        if routing not in ROUTING_MODES:
+            raise HostPoolError(f"Unknown routing '{routing}' (expected {' or '.join(ROUTING_MODES)})")
+        self.hosts = [PooledHost(url, weight) for url, weight in hosts]
+        self.routing = routing
+        self.health_path = "/" + health_path.strip("/")
+        self.health_interval_seconds = health_interval_seconds
+        self.health_timeout_seconds = health_timeout_seconds
+        self.eject_after_failures = max(1, eject_after_failures)
+        self.readmit_after_successes = max(1, readmit_after_successes)
+        self.latency_smoothing = latency_smoothing
+        self.log = log
+        self._next = 0  # rotates ties so equal hosts share the load
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._transport: Optional[HttpTransport] = None
+
+    @classmethod
+    def from_config(cls, config: Dict, hosts: List[Tuple[str, float]],
+                    log: Callable[[str], None] = print) -> "HostPool":
+        settings = config.get("hosts", {})
+        return cls(
+            hosts,
+            routing=settings.get("routing", "least_outstanding"),
+            health_path=settings.get("health_path", "/health"),
+            health_interval_seconds=settings.get("health_interval_seconds", 10),
+            health_timeout_seconds=settings.get("health_timeout_seconds", 5),
+            eject_after_failures=settings.get("eject_after_failures", 3),
+            readmit_after_successes=settings.get("readmit_after_successes", 2),
+            latency_smoothing=settings.get("latency_smoothing", 0.3),
+            log=log,
+        )
+
+    def acquire(self, admit: Optional[Callable[[PooledHost], bool]] = None) -> Optional[PooledHost]:
+        """Pick the host for one attempt and count it as outstanding there.
+
+        Hosts are offered to `admit` best first; None if it turns every one down.
+        """
+        with self._lock:
+            candidates = [host for host in self.hosts if host.healthy] or self.hosts
+            start = self._next % len(candidates)
+            rotated = candidates[start:] + candidates[:start]
+            if self.routing == "latency":
+                ranked = sorted(rotated, key=PooledHost.expected_wait)
+            else:
+                ranked = sorted(rotated, key=lambda h: h.outstanding / h.weight)
+            host = next((host for host in ranked if admit is None or admit(host)), None)
+            if host is None:
+                return None
+            self._next += 1
+            host.outstanding += 1
+            host.requests += 1
+            return host
+
+    def cancel(self, host: PooledHost) -> None:
+        """Undo acquire() for an attempt that was never sent."""
+        with self._lock:
+            host.outstanding -= 1
+            host.requests -= 1
+
+    def release(self, host: PooledHost, latency: float, status: Optional[int]) -> None:
+        """Report an attempt's outcome; `status` is None when no response arrived."""
+        with self._lock:
+            host.outstanding -= 1
+            if status != 200:
+                host.errors += 1
+            if status is None or status >= 500:
+                # Timeout, connection error or server error: count towards ejection, whatever /health says
+                self._record_failure(host)
+                return
+            if status == 200:
+                alpha = self.latency_smoothing
+                host.latency = latency if host.latency is None else alpha * latency + (1 - alpha) * host.latency
+            host.consecutive_failures = 0
+
+    def _record_failure(self, host: PooledHost) -> None:
+        host.consecutive_successes = 0
+        host.consecutive_failures += 1
+        if host.healthy and host.consecutive_failures >= self.eject_after_failures:
+            host.healthy = False
+            host.ejections += 1
+            self.log(f"  🚫 Ejected {host.url} after {host.consecutive_failures} consecutive failures")
+
+    def _record_health(self, host: PooledHost, ok: bool) -> None:
+        with self._lock:
+            if not ok:
+                self._record_failure(host)
+                return
+            host.consecutive_failures = 0
+            host.consecutive_successes += 1
+            if not host.healthy and host.consecutive_successes >= self.readmit_after_successes:
+                host.healthy = True
+                self.log(f"  ✅ Readmitted {host.url} after {host.consecutive_successes} healthy checks")
+
+    def check_health(self, transport) -> None:
+        """Probe every host's health endpoint once."""
+        for host in self.hosts:
+            try:
+                response = transport.get(f"{host.url}{self.health_path}", self.health_timeout_seconds)
+                ok = response.status == 200
+            except Exception:
+                ok = False
+            self._record_health(host, ok)
+
+    def start(self) -> None:
+        """Probe now and then every `health_interval_seconds` on a background thread, over its own connections."""
+        self._transport = HttpTransport(pool_size=len(self.hosts))
+
+        def run() -> None:
+            while True:
+                self.check_health(self._transport)
+                if self._stop.wait(self.health_interval_seconds):
+                    break
+
+        self._thread = threading.Thread(target=run, name="aigc-host-health", daemon=True)
+        self._thread.start()
+
+    def close(self) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=self.health_timeout_seconds + 1)
+        if self._transport:
+            self._transport.close()
+
+    def describe(self) -> str:
+        weights = "" if all(host.weight == 1 for host in self.hosts) else " (weighted)"
+        return f"{len(self.hosts)} hosts{weights}, {self.routing.replace('_', ' ')} routing"
+
+    def stats(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [{"url": host.url, "weight": host.weight, "requests": host.requests, "errors": host.errors,
+                     "ejections": host.ejections, "healthy": host.healthy} for host in self.hosts]
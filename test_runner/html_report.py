@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Paginated HTML report support for the AIGC Preview API Test Suite Runner
+
+Soak runs produce tens of thousands of results; rendered as one page, that
+is a huge string in memory and a document no browser can display. The
+report is therefore written incrementally from an iterator of results:
+
+1. one streaming pass computes the summary statistics, the image URLs to
+   thumbnail and, per page, how many rows fall in each
+   (pipeline, image list, status) group
+2. a second pass writes the rows straight to page files of `page_size` rows
+
+The index page carries only the summary and the per-page group counts, so
+filtering by pipeline, image list and status there tells which pages hold
+matching rows without loading any of them; each page filters its own rows.
+"""
+
+import os
+from collections import Counter
+from typing import Dict, List, Any, Iterable
+
+PAGE_FILE_PATTERN = "page_{:04d}.html"
+
+
+def row_filter_values(result: Dict[str, Any]) -> Dict[str, str]:
+    """The values a report row can be filtered by."""
+    return {
+        "pipeline": str(result.get("pipeline_config_key", "")),
+        "list": str(result.get("image_list_key", "")),
+        "status": "success" if result.get("success", False) else "failed",
+    }
+
+
+class ReportSummary:
+    """Summary statistics and per-page filter counts, accumulated one result at a time."""
+
+    def __init__(self, page_size: int = 500):
+        self.page_size = max(1, page_size)
+        self.total = 0
+        self.successful = 0
+        self.start_time = None
+        self.end_time = None
+        self.pipelines: Dict[str, str] = {}
+        self.image_lists: Dict[str, str] = {}
+        self.page_counts: List[Counter] = []
+        self.image_urls: Dict[str, None] = {}  # insertion-ordered set
+
+    def add(self, result: Dict[str, Any], image_urls: Iterable[str] = ()) -> None:
+        if self.total % self.page_size == 0:
+            self.page_counts.append(Counter())
+        self.total += 1
+        if result.get("success", False):
+            self.successful += 1
+        timestamp = result.get("timestamp")
+        if timestamp:
+            self.start_time = min(self.start_time or timestamp, timestamp)
+            self.end_time = max(self.end_time or timestamp, timestamp)
+        values = row_filter_values(result)
+        self.pipelines.setdefault(values["pipeline"], str(result.get("pipeline_config_name") or values["pipeline"]))
+        self.image_lists.setdefault(values["list"], str(result.get("image_list_name") or values["list"]))
+        self.page_counts[-1][(values["pipeline"], values["list"], values["status"])] += 1
+        self.image_urls.update(dict.fromkeys(image_urls))
+
+    @property
+    def failed(self) -> int:
+        return self.total - self.successful
+
+    @property
+    def success_rate(self) -> float:
+        return self.successful / self.total * 100 if self.total else 0
+
+    @property
+    def page_count(self) -> int:
+        return len(self.page_counts)
+
+    def page_manifest(self, pages_dir: str) -> List[Dict[str, Any]]:
+        """Per page: file (relative to the index), row range and group counts, for the index page's filters."""
+        return [
+            {
+                "file": f"{pages_dir}/{PAGE_FILE_PATTERN.format(page + 1)}",
+                "first": page * self.page_size + 1,
+                "last": page * self.page_size + sum(counts.values()),
+                "counts": [[pipeline, image_list, status, count]
+                           for (pipeline, image_list, status), count in sorted(counts.items())],
+            }
+            for page, counts in enumerate(self.page_counts)
+        ]
+
+
+def pages_directory(html_filename: str) -> str:
+    """Directory for the pages of a report: `test_results_X.html` → `test_results_X_pages`."""
+    return os.path.splitext(html_filename)[0] + "_pages"
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Local-file base64 inputs for the AIGC Preview API Test Suite Runner
+
+Image lists (and extra dimension values such as `model_b64`) can reference
+local files and directories instead of URLs. Each file is memory-mapped and
+base64-encoded in chunks straight into the serialized JSON array the API
+expects (`[{"data": ..., "mime_type": ...}, ...]`), so a file is never held
+in memory both raw and encoded.
+
+The encoded fragment is built once per distinct list of files and shared
+by every combination that uses it; request bodies splice the cached bytes
+in instead of re-serializing hundreds of MB of base64 per test.
+"""
+
+import binascii
+import hashlib
+import json
+import mimetypes
+import mmap
+import os
+import threading
+import time
+from functools import lru_cache
+from typing import Dict, List, Tuple, Any, Optional
+
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".webp", ".gif", ".bmp", ".tif", ".tiff", ".heic")
+
+# Multiple of 3 so chunks encode without padding in the middle of a file
+ENCODE_CHUNK_BYTES = 3 * 1024 * 1024
+
+
+@lru_cache(maxsize=None)
+def expand_image_files(paths: Tuple[str, ...], base_dir: str = "") -> Tuple[str, ...]:
+    """Resolve files and directories (their images, sorted by name) relative to `base_dir`."""
+    files = []
+    for path in paths:
+        path = os.path.join(base_dir, os.path.expanduser(path))
+        if os.path.isdir(path):
+            files.extend(
+                os.path.join(path, name) for name in sorted(os.listdir(path))
+                if name.lower().endswith(IMAGE_EXTENSIONS) and os.path.isfile(os.path.join(path, name))
+            )
+        else:
+            files.append(path)
+    return tuple(files)
+
+
+def mime_type_for(path: str) -> str:
+    mime_type, _ = mimetypes.guess_type(path)
+    return mime_type or "application/octet-stream"
+
+
+def append_base64(out: bytearray, path: str) -> int:
+    """Base64-encode `path` into `out` through an mmap; returns the raw file size."""
+    size = os.path.getsize(path)
+    if size == 0:
+        return 0
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        for offset in range(0, size, ENCODE_CHUNK_BYTES):
+            out += binascii.b2a_base64(mapped[offset:offset + ENCODE_CHUNK_BYTES], newline=False)
+    return size
+
+
+class EncodedImageList:
+    """Serialized JSON array of base64 image objects for one list of files."""
+
+    def __init__(self, files: Tuple[str, ...], fragment: bytes, raw_bytes: int, encode_seconds: float):
+        self.files = files
+        self.fragment = fragment
+        self.raw_bytes = raw_bytes
+        self.encode_seconds = encode_seconds
+        self.digest = hashlib.sha256(fragment).hexdigest()
+
+    @classmethod
+    def encode(cls, files: Tuple[str, ...]) -> "EncodedImageList":
+        start = time.perf_counter()
+        out = bytearray(b"[")
+        raw_bytes = 0
+        for index, path in enumerate(files):
+            if index:
+                out += b","
+            out += b'{"data":"'
+            raw_bytes += append_base64(out, path)
+            out += b'","mime_type":' + json.dumps(mime_type_for(path)).encode("utf-8") + b"}"
+        out += b"]"
+        return cls(files, bytes(out), raw_bytes, time.perf_counter() - start)
+
+    def __len__(self) -> int:
+        return len(self.files)
+
+
+class Base64PayloadCache:
+    """Encodes each distinct list of files once per run, even with concurrent workers."""
+
+    def __init__(self):
+        self._encoded: Dict[Tuple[str, ...], EncodedImageList] = {}
+        self._locks: Dict[Tuple[str, ...], threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def get(self, files: Tuple[str, ...]) -> Tuple[EncodedImageList, float]:
+        """The encoded list and the encode time spent by *this* call (0 when it was cached)."""
+        with self._lock:
+            lock = self._locks.setdefault(files, threading.Lock())
+        with lock:
+            encoded = self._encoded.get(files)
+            if encoded is not None:
+                return encoded, 0.0
+            encoded = EncodedImageList.encode(files)
+            self._encoded[files] = encoded
+            return encoded, encoded.encode_seconds
+
+    @property
+    def total_bytes(self) -> int:
+        with self._lock:
+            return sum(len(encoded.fragment) for encoded in self._encoded.values())
+
+
+def encode_request_body(body: Dict[str, Any], encode_json) -> bytes:
+    """Serialize `body` with `encode_json`, splicing in pre-encoded `EncodedImageList` fields as raw JSON."""
+    encoded_fields = {key: value for key, value in body.items() if isinstance(value, EncodedImageList)}
+    if not encoded_fields:
+        return encode_json(body)
+    plain = {key: value for key, value in body.items() if key not in encoded_fields}
+    prefix = encode_json(plain)
+    parts = [prefix[:-1]]  # drop the closing brace
+    separator = b"," if plain else b""
+    for key, value in encoded_fields.items():
+        parts.append(separator + json.dumps(key).encode("utf-8") + b":" + value.fragment)
+        separator = b","
+    parts.append(b"}")
+    return b"".join(parts)
+
+
+def cache_key_body(body: Dict[str, Any]) -> Dict[str, Any]:
+    """`body` with encoded image lists replaced by their content digest, for cheap response-cache keys."""
+    return {
+        key: f"sha256:{value.digest}" if isinstance(value, EncodedImageList) else value
+        for key, value in body.items()
+    }
+
+
+def payload_stats(body: Dict[str, Any]) -> Dict[str, Optional[int]]:
+    """Count and base64 size of the encoded images in `body`."""
+    encoded = [value for value in body.values() if isinstance(value, EncodedImageList)]
+    return {
+        "base64_images_count": sum(len(value) for value in encoded),
+        "base64_bytes": sum(len(value.fragment) for value in encoded),
+    }
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Streaming latency histograms for the AIGC Preview API Test Suite Runner
+
+Values are counted in logarithmic buckets with ~1% relative precision, so
+percentiles can be reported for any number of tests in constant memory
+without keeping or sorting every sample.
+"""
+
+import math
+from typing import Dict, List, Tuple, Any, Optional, Iterable
+
+REPORTED_PERCENTILES = (50, 90, 95, 99)
+
+
+class LatencyHistogram:
+    """Log-bucketed histogram of non-negative values (seconds)."""
+
+    def __init__(self, precision: float = 0.01):
+        self._log_base = math.log1p(precision)
+        self._buckets: Dict[int, int] = {}
+        self._zeros = 0
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+
+    def record(self, value: float) -> None:
+        value = max(0.0, value)
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+        if value <= 1e-6:
+            self._zeros += 1
+            return
+        index = math.floor(math.log(value) / self._log_base)
+        self._buckets[index] = self._buckets.get(index, 0) + 1
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        for index, count in other._buckets.items():
+            self._buckets[index] = self._buckets.get(index, 0) + count
+        self._zeros += other._zeros
+        self.count += other.count
+        self.total += other.total
+        for value in (other.min, other.max):
+            if value is not None:
+                self.min = value if self.min is None else min(self.min, value)
+                self.max = value if self.max is None else max(self.max, value)
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, percentile: float) -> float:
+        """Value at or below which `percentile` % of the samples fall (within bucket precision)."""
+        if not self.count:
+            return 0.0
+        rank = max(1, math.ceil(self.count * percentile / 100))
+        if rank <= self._zeros:
+            return 0.0
+        seen = self._zeros
+        for index in sorted(self._buckets):
+            seen += self._buckets[index]
+            if seen >= rank:
+                # Midpoint of the bucket, clamped to the observed range
+                value = math.exp((index + 0.5) * self._log_base)
+                return min(max(value, self.min), self.max)
+        return self.max
+
+    def summary(self) -> Dict[str, float]:
+        values = {f"p{p}": self.percentile(p) for p in REPORTED_PERCENTILES}
+        values["max"] = self.max or 0.0
+        values["mean"] = self.mean
+        values["count"] = self.count
+        return values
+
+
+class GroupedHistograms:
+    """One histogram per group key, e.g. per pipeline config or image count."""
+
+    def __init__(self):
+        self.groups: Dict[Any, LatencyHistogram] = {}
+
+    def record(self, key: Any, value: float) -> None:
+        histogram = self.groups.get(key)
+        if histogram is None:
+            histogram = self.groups[key] = LatencyHistogram()
+        histogram.record(value)
+
+    def items(self) -> List[Tuple[Any, LatencyHistogram]]:
+        try:
+            return sorted(self.groups.items())
+        except TypeError:  # mixed key types
+            return sorted(self.groups.items(), key=lambda item: str(item[0]))
+
+
+def format_percentile_table(title: str, groups: Iterable[Tuple[Any, LatencyHistogram]],
+                            unit_scale: float = 1.0, unit: str = "s") -> List[str]:
+    """Render histograms as aligned text lines for the console summary."""
+    lines = [title, f"   {'':<22}{'n':>6}" + "".join(f"{label:>10}" for label in
+                                                        [f"p{p}" for p in REPORTED_PERCENTILES] + ["max"])]
+    for key, histogram in groups:
+        values = histogram.summary()
+        cells = [values[f"p{p}"] for p in REPORTED_PERCENTILES] + [values["max"]]
+        lines.append(f"   {str(key)[:22]:<22}{values['count']:>6}" +
+                     "".join(f"{value * unit_scale:>{10 - len(unit)}.1f}{unit}" for value in cells))
+    return lines
@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""
+Live run metrics and console progress for the AIGC Preview API Test Suite Runner
+
+`RunMetrics` keeps the state of a running suite in a handful of counters,
+updated from the worker threads under one lock: requests in flight, tests
+completed/succeeded/failed per pipeline config, retries and a cumulative
+latency histogram per pipeline. `MetricsServer` serves them as Prometheus
+text on `GET /metrics` from a background thread, so the run can be scraped
+(or just curled) while it is going.
+
+`ProgressLine` is the console side: one line, redrawn in place at most
+every `interval` seconds, replacing the several lines printed per test when
+stdout is a terminal. Messages that must stay visible (failures, retries)
+are printed above it.
+"""
+
+import collections
+import http.server
+import sys
+import threading
+import time
+from typing import Dict, List, Tuple, Any, Optional, TextIO
+
+# Upper bounds (seconds) of the latency histogram buckets; AIGC calls take seconds to minutes
+LATENCY_BUCKETS = (0.5, 1, 2.5, 5, 10, 20, 30, 45, 60, 90, 120, 180, 300, 600)
+THROUGHPUT_WINDOW_SECONDS = 60
+CLEAR_LINE = "\r\033[K"
+
+
+class MetricsError(Exception):
+    """The metrics endpoint could not start (e.g. the listen port is taken)."""
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+class RunMetrics:
+    """Thread-safe counters of one run, rendered in the Prometheus text exposition format."""
+
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self.start = time.monotonic()
+        self.total = 0
+        self.in_flight = 0
+        self.retries = 0
+        self.completed: Dict[str, int] = {}
+        self.succeeded: Dict[str, int] = {}
+        self.failed: Dict[str, int] = {}
+        self._latency: Dict[str, List[int]] = {}  # pipeline → per-bucket counts (+Inf last)
+        self._latency_sum: Dict[str, float] = {}
+        self._recent = collections.deque()  # completion times within the throughput window
+        self._lock = threading.Lock()
+
+    def begin(self, total: int) -> None:
+        """Start the clock for a run of `total` tests."""
+        with self._lock:
+            self.start = time.monotonic()
+            self.total = total
+
+    def request_started(self) -> int:
+        """Count a request as in flight; returns the number now in flight."""
+        with self._lock:
+            self.in_flight += 1
+            return self.in_flight
+
+    def request_finished(self) -> int:
+        with self._lock:
+            self.in_flight -= 1
+            return self.in_flight
+
+    def record_retry(self) -> None:
+        with self._lock:
+            self.retries += 1
+
+    def record_test(self, pipeline: str, success: bool, duration: Optional[float]) -> None:
+        """Count a finished test; `duration` is None if it shouldn't be in the latency histogram."""
+        now = time.monotonic()
+        with self._lock:
+            self.completed[pipeline] = self.completed.get(pipeline, 0) + 1
+            outcome = self.succeeded if success else self.failed
+            outcome[pipeline] = outcome.get(pipeline, 0) + 1
+            self._recent.append(now)
+            while self._recent and self._recent[0] < now - THROUGHPUT_WINDOW_SECONDS:
+                self._recent.popleft()
+            if duration is None:
+                return
+            counts = self._latency.get(pipeline)
+            if counts is None:
+                counts = self._latency[pipeline] = [0] * (len(self.buckets) + 1)
+                self._latency_sum[pipeline] = 0.0
+            index = next((i for i, bound in enumerate(self.buckets) if duration <= bound), len(self.buckets))
+            counts[index] += 1
+            self._latency_sum[pipeline] += duration
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Totals for the progress line: completed, succeeded, failed, in flight and throughput."""
+        now = time.monotonic()
+        with self._lock:
+            elapsed = now - self.start
+            completed = sum(self.completed.values())
+            recent = sum(1 for at in self._recent if at >= now - THROUGHPUT_WINDOW_SECONDS)
+            return {
+                "total": self.total,
+                "completed": completed,
+                "succeeded": sum(self.succeeded.values()),
+                "failed": sum(self.failed.values()),
+                "in_flight": self.in_flight,
+                "retries": self.retries,
+                "elapsed": elapsed,
+                "throughput": completed / elapsed if elapsed > 0 else 0.0,
+                "recent_throughput": recent / min(elapsed, THROUGHPUT_WINDOW_SECONDS) if elapsed > 0 else 0.0,
+            }
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text format (version 0.0.4)."""
+        snapshot = self.snapshot()
+        lines = []
+
+        def metric(name: str, kind: str, help_text: str, samples: List[Tuple[str, Any]]) -> None:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            lines.extend(f"{name}{labels} {value}" for labels, value in samples)
+
+        with self._lock:
+            by_pipeline = {name: sorted(values.items()) for name, values in
+                           (("completed", self.completed), ("succeeded", self.succeeded), ("failed", self.failed))}
+            latency = {pipeline: (list(counts), self._latency_sum[pipeline])
+                       for pipeline, counts in sorted(self._latency.items())}
+
+        metric("aigc_runner_tests_total", "gauge", "Test combinations in this run.", [("", snapshot["total"])])
+        metric("aigc_runner_requests_in_flight", "gauge", "API requests currently waiting for a response.",
+               [("", snapshot["in_flight"])])
+        for name, help_text in (("completed", "Tests finished, by pipeline config."),
+                                ("succeeded", "Tests that succeeded, by pipeline config."),
+                                ("failed", "Tests that failed, by pipeline config.")):
+            metric(f"aigc_runner_tests_{name}_total", "counter", help_text,
+                   [(f'{{pipeline="{_escape(pipeline)}"}}', count) for pipeline, count in by_pipeline[name]])
+        metric("aigc_runner_retries_total", "counter", "Retried API attempts.", [("", snapshot["retries"])])
+
+        lines.append("# HELP aigc_runner_test_duration_seconds Duration of successful live API calls, by pipeline config.")
+        lines.append("# TYPE aigc_runner_test_duration_seconds histogram")
+        for pipeline, (counts, total) in latency.items():
+            label = _escape(pipeline)
+            cumulative = 0
+            for bound, count in zip([f"{bound:g}" for bound in self.buckets] + ["+Inf"], counts):
+                cumulative += count
+                lines.append(f'aigc_runner_test_duration_seconds_bucket{{pipeline="{label}",le="{bound}"}} {cumulative}')
+            lines.append(f'aigc_runner_test_duration_seconds_sum{{pipeline="{label}"}} {total:.3f}')
+            lines.append(f'aigc_runner_test_duration_seconds_count{{pipeline="{label}"}} {cumulative}')
+
+        metric("aigc_runner_throughput_tests_per_second", "gauge", "Tests completed per second since the start.",
+               [("", f"{snapshot['throughput']:.4f}")])
+        metric("aigc_runner_recent_throughput_tests_per_second", "gauge",
+               f"Tests completed per second over the last {THROUGHPUT_WINDOW_SECONDS}s.",
+               [("", f"{snapshot['recent_throughput']:.4f}")])
+        metric("aigc_runner_elapsed_seconds", "gauge", "Seconds since the run started.",
+               [("", f"{snapshot['elapsed']:.1f}")])
+        return "\n".join(lines) + "\n"
+
+
+class _MetricsRequestHandler(http.server.BaseHTTPRequestHandler):
+    """`GET /metrics` only."""
+
+    def do_GET(self) -> None:
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = self.server.metrics.render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass  # scrapes would interleave with the run's console output
+
+
+class MetricsServer(http.server.ThreadingHTTPServer):
+    """Serves a RunMetrics on `/metrics` from a background thread."""
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, address: Tuple[str, int], metrics: RunMetrics):
+        try:
+            super().__init__(address, _MetricsRequestHandler)
+        except OSError as e:
+            raise MetricsError(f"Cannot serve metrics on {address[0]}:{address[1]}: {e}") from e
+        self.metrics = metrics
+
+    def start(self) -> threading.Thread:
+        thread = threading.Thread(target=self.serve_forever, name="aigc-metrics", daemon=True)
+        thread.start()
+        return thread
+
+    def close(self) -> None:
+        self.shutdown()
+        self.server_close()
+
+
+class ProgressLine:
+    """Single console line showing the run's progress, redrawn at most every `interval` seconds."""
+
+    def __init__(self, metrics: RunMetrics, interval: float = 0.2, stream: TextIO = sys.stdout):
+        self.metrics = metrics
+        self.interval = interval
+        self.stream = stream
+        self._last_draw = 0.0
+        self._drawn = False
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def enabled(stream: TextIO = sys.stdout) -> bool:
+        """Only terminals get the progress line; redirected output keeps the per-test lines."""
+        try:
+            return stream.isatty()
+        except (AttributeError, ValueError):
+            return False
+
+    def format(self) -> str:
+        s = self.metrics.snapshot()
+        percent = s["completed"] / s["total"] * 100 if s["total"] else 0.0
+        remaining = (s["total"] - s["completed"]) / s["recent_throughput"] if s["recent_throughput"] > 0 else None
+        eta = f" | ETA {remaining / 60:.0f}m" if remaining is not None and s["completed"] < s["total"] else ""
+        return (f"📊 {percent:5.1f}% ({s['completed']}/{s['total']}) | ✅ {s['succeeded']} ❌ {s['failed']} | "
+                f"⚡ {s['in_flight']} in flight | 🔁 {s['retries']} retries | "
+                f"{s['recent_throughput'] * 60:.1f} tests/min | {s['elapsed'] / 60:.1f}m{eta}")
+
+    def update(self, force: bool = False) -> None:
+        """Redraw the line unless it was drawn less than `interval` seconds ago."""
+        now = time.monotonic()
+        if not force and now - self._last_draw < self.interval:
+            return
+        with self._lock:
+            self._last_draw = now
+            self._draw(self.format())
+
+    def log(self, message: str) -> None:
+        """Print a message above the progress line."""
+        with self._lock:
+            self._clear()
+            self.stream.write(message + "\n")
+            self._draw(self.format())
+
+    def finish(self) -> None:
+        """Draw the final state and move to the next line."""
+        with self._lock:
+            self._draw(self.format())
+            self.stream.write("\n")
+            self.stream.flush()
+            self._drawn = False
+
+    def _clear(self) -> None:
+        if self._drawn:
+            self.stream.write(CLEAR_LINE)
+
+    def _draw(self, line: str) -> None:
+        # Erase to the end of the line: emoji are two columns wide, so padding with spaces can't be measured
+        self.stream.write(CLEAR_LINE + line)
+        self._drawn = True
+        self.stream.flush()
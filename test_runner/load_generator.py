@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Open-loop load generation for the AIGC Preview API Test Suite Runner
+
+Requests are issued at a target arrival rate regardless of how fast the
+server answers, so a slowing service shows up as growing backlog and
+latency instead of silently reducing the offered load. Latency is measured
+from each request's *intended* send time, which corrects for coordinated
+omission: time a request spent waiting behind a slow one still counts.
+
+Schedules:
+- `constant:RATE`            fixed rate (requests per second)
+- `step:R1,R2,...@SECONDS`   hold each rate for SECONDS
+- `ramp:FROM-TO`             linear ramp over the whole duration
+- `poisson:RATE`             shorthand for `constant:RATE` with Poisson arrivals
+Any schedule can use Poisson (exponential inter-arrival) or uniform arrivals.
+"""
+
+import math
+import random
+from typing import Dict, List, Tuple, Any, Optional, Iterator
+
+from latency_stats import LatencyHistogram
+
+
+class LoadScheduleError(ValueError):
+    """The load schedule specification could not be parsed."""
+
+
+class ArrivalSchedule:
+    """Target arrival rate over time and the intended send times it produces."""
+
+    def __init__(self, shape: str, rates: List[float], duration: float, step_seconds: float = 0,
+                 poisson: bool = False, seed: int = 0):
+        self.shape = shape
+        self.rates = rates
+        self.duration = duration
+        self.step_seconds = step_seconds
+        self.poisson = poisson
+        self.seed = seed
+
+    def rate_at(self, t: float) -> float:
+        """Target requests per second at `t` seconds into the run."""
+        if self.shape == "constant":
+            return self.rates[0]
+        if self.shape == "step":
+            index = min(int(t // self.step_seconds), len(self.rates) - 1)
+            return self.rates[index]
+        # ramp
+        fraction = min(max(t / self.duration, 0.0), 1.0) if self.duration else 1.0
+        return self.rates[0] + (self.rates[1] - self.rates[0]) * fraction
+
+    def intended_times(self) -> Iterator[float]:
+        """Yield intended send offsets (seconds from start) until the duration ends."""
+        rng = random.Random(self.seed)
+        t = 0.0
+        while t < self.duration:
+            rate = self.rate_at(t)
+            if rate <= 0:
+                t = self._next_rate_change(t)
+                continue
+            gap = rng.expovariate(rate) if self.poisson else 1.0 / rate
+            if self.shape == "step" and t + gap > self._next_rate_change(t):
+                # Don't let a long gap from a low step swallow the start of the next step
+                t = self._next_rate_change(t)
+                continue
+            t += gap
+            if t < self.duration:
+                yield t
+
+    def _next_rate_change(self, t: float) -> float:
+        if self.shape == "step":
+            return (math.floor(t / self.step_seconds) + 1) * self.step_seconds
+        if self.shape == "ramp" and self.rates[1] > 0:
+            return t + min(1.0, self.duration / 100)
+        return self.duration
+
+    def expected_requests(self) -> float:
+        """Integral of the target rate over the duration."""
+        if self.shape == "constant":
+            return self.rates[0] * self.duration
+        if self.shape == "ramp":
+            return (self.rates[0] + self.rates[1]) / 2 * self.duration
+        total, t = 0.0, 0.0
+        while t < self.duration:
+            span = min(self.step_seconds, self.duration - t)
+            total += self.rate_at(t) * span
+            t += span
+        return total
+
+    def describe(self) -> str:
+        arrivals = "Poisson" if self.poisson else "uniform"
+        if self.shape == "constant":
+            shape = f"constant {self.rates[0]:g} req/s"
+        elif self.shape == "step":
+            shape = "steps " + " → ".join(f"{r:g}" for r in self.rates) + f" req/s every {self.step_seconds:g}s"
+        else:
+            shape = f"ramp {self.rates[0]:g} → {self.rates[1]:g} req/s"
+        return f"{shape}, {arrivals} arrivals, {self.duration:g}s"
+
+
+def parse_load_schedule(spec: str, duration: float, poisson: bool = False, seed: int = 0) -> ArrivalSchedule:
+    """Parse a `--load` specification (see module docstring)."""
+    shape, _, params = spec.strip().lower().partition(":")
+    if duration <= 0:
+        raise LoadScheduleError("load duration must be positive")
+    try:
+        if shape in ("constant", "poisson"):
+            rates = [float(params)]
+            if shape == "poisson":
+                shape, poisson = "constant", True
+            return ArrivalSchedule("constant", rates, duration, poisson=poisson, seed=seed)
+        if shape == "step":
+            rates_part, _, step_part = params.partition("@")
+            rates = [float(rate) for rate in rates_part.split(",") if rate]
+            step_seconds = float(step_part) if step_part else duration / max(len(rates), 1)
+            if not rates or step_seconds <= 0:
+                raise ValueError
+            return ArrivalSchedule("step", rates, duration, step_seconds=step_seconds, poisson=poisson, seed=seed)
+        if shape == "ramp":
+            start, _, end = params.partition("-")
+            return ArrivalSchedule("ramp", [float(start), float(end)], duration, poisson=poisson, seed=seed)
+    except ValueError:
+        pass
+    raise LoadScheduleError(
+        f"Invalid load schedule '{spec}' (expected constant:RATE, poisson:RATE, step:R1,R2@SECONDS or ramp:FROM-TO)"
+    )
+
+
+class LoadWindow:
+    """Counters for one reporting window of an open-loop run."""
+
+    def __init__(self, index: int, start: float, length: float):
+        self.index = index
+        self.start = start
+        self.length = length
+        self.scheduled = 0
+        self.sent = 0
+        self.completed = 0
+        self.failed = 0
+        self.backlog = 0
+        self.latency = LatencyHistogram()
+
+
+class LoadWindowStats:
+    """Per-window target vs achieved rate, backlog and corrected latency."""
+
+    def __init__(self, window_seconds: float, duration: Optional[float] = None):
+        self.window_seconds = window_seconds
+        self.duration = duration
+        self.windows: Dict[int, LoadWindow] = {}
+
+    def window(self, t: float) -> LoadWindow:
+        index = max(0, int(t // self.window_seconds))
+        if index not in self.windows:
+            start = index * self.window_seconds
+            length = self.window_seconds
+            if self.duration and start < self.duration:
+                # The schedule may end part-way through its last window
+                length = min(length, self.duration - start)
+            self.windows[index] = LoadWindow(index, start, length)
+        return self.windows[index]
+
+    def record_scheduled(self, intended: float) -> None:
+        self.window(intended).scheduled += 1
+
+    def record_sent(self, actual: float) -> None:
+        self.window(actual).sent += 1
+
+    def record_completed(self, completed_at: float, corrected_latency: float, success: bool) -> None:
+        window = self.window(completed_at)
+        window.completed += 1
+        if not success:
+            window.failed += 1
+        window.latency.record(corrected_latency)
+
+    def close_window(self, index: int, backlog: int) -> Dict[str, Any]:
+        """Record the backlog at the end of window `index` and return its report row."""
+        window = self.window(index * self.window_seconds)
+        window.backlog = backlog
+        return self.row(index)
+
+    def row(self, index: int) -> Dict[str, Any]:
+        window = self.window(index * self.window_seconds)
+        return {
+            "window_start_seconds": round(window.start, 1),
+            "target_rate": round(window.scheduled / window.length, 3),
+            "scheduled": window.scheduled,
+            "sent": window.sent,
+            "achieved_rate": round(window.sent / window.length, 3),
+            "completed": window.completed,
+            "failed": window.failed,
+            "backlog": window.backlog,
+            "latency_p50_seconds": round(window.latency.percentile(50), 2),
+            "latency_p95_seconds": round(window.latency.percentile(95), 2),
+            "latency_p99_seconds": round(window.latency.percentile(99), 2),
+            "latency_max_seconds": round(window.latency.max or 0.0, 2),
+        }
+
+    def rows(self) -> List[Dict[str, Any]]:
+        return [self.row(index) for index in sorted(self.windows)]
+
+
+def format_window_row(row: Dict[str, Any]) -> str:
+    return (f"   {row['window_start_seconds']:>7.0f}s  target {row['target_rate']:>6.2f}/s  "
+            f"achieved {row['achieved_rate']:>6.2f}/s  done {row['completed']:>4} ({row['failed']} failed)  "
+            f"backlog {row['backlog']:>4}  p50 {row['latency_p50_seconds']:>6.1f}s  "
+            f"p95 {row['latency_p95_seconds']:>6.1f}s  p99 {row['latency_p99_seconds']:>6.1f}s")
@@ -0,0 +1,499 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the AIGC Preview API and the Main Video API
+
+Benchmarking the runner itself shouldn't need a live AIGC deployment. This
+server answers the endpoints the runner uses with the response shapes of
+`aigc-api.md` and `main-api.md`:
+
+- `GET /health`, `GET /`
+- `POST /create-slideshow-urls`
+- `POST <video_prefix>/ae_new_video_from_preset` and `POST <video_prefix>/ae_get_video`,
+  including `callback_url` delivery when a render finishes
+- `GET /images/<name>.png` - placeholder output images, so `--verify-outputs` works offline
+
+Processing time is drawn from a configurable distribution per pipeline config
+and image count, and only `max_concurrency` requests are processed at once:
+the rest queue (up to `max_queue`, then `503`), like a real GPU-bound
+deployment. `429`/`5xx` responses and hung requests can be injected at set
+rates. Everything runs on one asyncio event loop, so thousands of open
+connections and outstanding renders are cheap.
+
+Run it with `python mock_server.py [config_file] [--host <addr>] [--port <n>] [--time-scale <x>] [--seed <n>]`;
+settings come from the `mock_server` section of the test suite config. It
+listens on localhost by default: it POSTs to whatever `callback_url` a
+client sends, so it shouldn't be reachable from other hosts unless needed.
+"""
+
+import asyncio
+import gzip
+import json
+import math
+import random
+import struct
+import sys
+import time
+import uuid
+import zlib
+from typing import Dict, Any, Optional, Tuple
+from urllib.parse import urlsplit
+
+AIGC_ENDPOINT = "/create-slideshow-urls"
+MAX_IMAGES = 50
+MAX_BODY_BYTES = 256 * 1024 * 1024  # base64 images make large requests
+DISTRIBUTIONS = ("constant", "uniform", "normal", "lognormal", "exponential")
+FAULTS = ("429", "500", "502", "503", "timeout")
+REASONS = {200: "OK", 400: "Bad Request", 401: "Unauthorized", 404: "Not Found", 405: "Method Not Allowed",
+           411: "Length Required", 413: "Payload Too Large", 429: "Too Many Requests", 500: "Internal Server Error",
+           502: "Bad Gateway", 503: "Service Unavailable"}
+
+
+def check_distribution(spec: Dict[str, Any], name: str) -> None:
+    """Raise ValueError if a latency distribution spec is unusable."""
+    distribution = spec.get("distribution", "constant")
+    required = {"constant": ("value",), "uniform": ("min", "max"), "normal": ("mean", "stddev"),
+                "lognormal": ("median", "sigma"), "exponential": ("mean",)}.get(distribution)
+    if required is None:
+        raise ValueError(f"{name}: unknown distribution '{distribution}' (expected {', '.join(DISTRIBUTIONS)})")
+    missing = [key for key in required if not isinstance(spec.get(key), (int, float))]
+    if missing:
+        raise ValueError(f"{name}: {distribution} distribution needs {', '.join(missing)}")
+
+
+def sample_seconds(spec: Dict[str, Any], rng: random.Random) -> float:
+    """One draw from a latency distribution spec, never negative."""
+    distribution = spec.get("distribution", "constant")
+    if distribution == "uniform":
+        value = rng.uniform(spec["min"], spec["max"])
+    elif distribution == "normal":
+        value = rng.gauss(spec["mean"], spec["stddev"])
+    elif distribution == "lognormal":
+        value = spec["median"] * math.exp(rng.gauss(0, spec["sigma"]))
+    elif distribution == "exponential":
+        value = rng.expovariate(1 / spec["mean"]) if spec["mean"] > 0 else 0.0
+    else:
+        value = spec["value"]
+    return max(0.0, value)
+
+
+def placeholder_png(width: int = 256, height: int = 256) -> bytes:
+    """A valid RGB gradient PNG (not blank, so it passes output verification)."""
+    rows = b"".join(b"\x00" + b"".join(bytes((x * 255 // width, y * 255 // height, 128)) for x in range(width))
+                    for y in range(height))  # filter byte 0, then RGB pixels
+
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+    return (b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))
+            + chunk(b"IDAT", zlib.compress(rows, 6)) + chunk(b"IEND", b""))
+
+
+class MockVideo:
+    """A render in progress."""
+
+    def __init__(self, video_id: str, ready_at: float, failed: bool, callback_url: str, body: Dict[str, Any]):
+        self.video_id = video_id
+        self.ready_at = ready_at
+        self.failed = failed
+        self.callback_url = callback_url
+        self.preset_video_id = body.get("preset_video_id", "")
+        self.video_name = body.get("video_name", "")
+        self.created_at = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+
+    @property
+    def status(self) -> str:
+        if time.monotonic() < self.ready_at:
+            return "Processing"
+        return "Failed" if self.failed else "Completed"
+
+    def response(self) -> Dict[str, Any]:
+        response = {"video_id": self.video_id, "status": self.status}
+        if response["status"] == "Completed":
+            response["video_url"] = f"https://storage.googleapis.com/aeon-ptv-bucket/{self.video_id}.mp4"
+        return response
+
+
+class MockServer:
+    """Both APIs on one asyncio HTTP/1.1 server, with simulated processing time, queueing and faults."""
+
+    def __init__(self, settings: Dict[str, Any], pipelines: Optional[Dict[str, str]] = None,
+                 host: Optional[str] = None, port: Optional[int] = None, time_scale: Optional[float] = None,
+                 seed: Optional[int] = None):
+        self.host = settings.get("host", "127.0.0.1") if host is None else host
+        self.port = settings.get("port", 8080) if port is None else port
+        self.video_prefix = "/" + settings.get("video_prefix", "/api/1.1/wf").strip("/")
+        self.time_scale = settings.get("time_scale", 1.0) if time_scale is None else time_scale
+        self.max_concurrency = max(1, settings.get("max_concurrency", 8))
+        self.max_queue = settings.get("max_queue", 256)
+        self.api_token = settings.get("api_token", "")
+        self.latency = settings.get("latency", {})
+        self.render = settings.get("render", {})
+        self.video_latency = settings.get("video_latency", {"distribution": "constant", "value": 0.2})
+        self.faults = settings.get("faults", {})
+        # Pipeline overrides may be keyed by pipeline config key or by filename
+        self.pipeline_keys = {filename: key for key, filename in (pipelines or {}).items()}
+        self.rng = random.Random(settings.get("seed") if seed is None else seed)
+        self.videos: Dict[str, MockVideo] = {}
+        self.slots: Optional[asyncio.Semaphore] = None
+        self.queued = 0
+        self.processing = 0
+        self.stats: Dict[str, Any] = {"requests": 0, "by_status": {}, "faults": {}, "max_queued": 0,
+                                      "connections": 0, "callbacks": 0, "callback_failures": 0}
+        self._png = placeholder_png()
+        self.check()
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any], **overrides) -> "MockServer":
+        pipelines = {key: data.get("filename", "") for key, data in config.get("pipeline_configs", {}).items()}
+        return cls(config.get("mock_server", {}), pipelines, **overrides)
+
+    def check(self) -> None:
+        """Raise ValueError on an invalid latency, render or fault setting."""
+        check_distribution(self.latency.get("default", {"distribution": "constant", "value": 1}), "latency.default")
+        for section in ("pipelines", "image_counts"):
+            for key, spec in self.latency.get(section, {}).items():
+                check_distribution({**self.latency.get("default", {}), **spec}, f"latency.{section}.{key}")
+        check_distribution(self.render or {"distribution": "constant", "value": 60}, "render")
+        check_distribution(self.video_latency, "video_latency")
+        for endpoint, rates in self.faults.items():
+            total = sum(rates.get(f"rate_{fault}", 0) for fault in FAULTS)
+            if not 0 <= total <= 1:
+                raise ValueError(f"faults.{endpoint}: fault rates add up to {total}, must be between 0 and 1")
+
+    def processing_seconds(self, pipeline_file: str, image_count: int) -> float:
+        """Simulated AIGC time: default spec, overridden per pipeline and then per image count."""
+        spec = dict(self.latency.get("default", {"distribution": "constant", "value": 1}))
+        pipelines = self.latency.get("pipelines", {})
+        spec.update(pipelines.get(pipeline_file) or pipelines.get(self.pipeline_keys.get(pipeline_file, ""), {}))
+        spec.update(self.latency.get("image_counts", {}).get(str(image_count), {}))
+        seconds = sample_seconds(spec, self.rng) + spec.get("per_image_seconds", 0) * image_count
+        return seconds * self.time_scale
+
+    def draw_fault(self, endpoint: str) -> Optional[str]:
+        rates = self.faults.get(endpoint, {})
+        draw = self.rng.random()
+        for fault in FAULTS:
+            draw -= rates.get(f"rate_{fault}", 0)
+            if draw < 0:
+                self.stats["faults"][fault] = self.stats["faults"].get(fault, 0) + 1
+                return fault
+        return None
+
+    async def inject_fault(self, endpoint: str) -> Optional[Tuple[int, Dict[str, Any], Dict[str, str]]]:
+        """A fault response to send instead of the real one, or None. A `timeout` hangs, then drops the connection."""
+        fault = self.draw_fault(endpoint)
+        if fault is None:
+            return None
+        settings = self.faults.get(endpoint, {})
+        if fault == "timeout":
+            await asyncio.sleep(settings.get("timeout_seconds", 330))  # longer than the client waits; not time-scaled
+            raise ConnectionAbortedError()
+        status = int(fault)
+        headers = {"Retry-After": str(settings.get("retry_after_seconds", 5))} if status in (429, 503) else {}
+        if endpoint == "video":
+            return status, {"status": "error", "message": f"Injected {status}", "error_code": "INJECTED_FAULT"}, headers
+        return status, {"detail": f"Injected {status}"}, headers
+
+    # Endpoints
+
+    async def create_slideshow(self, body: Dict[str, Any], host: str) -> Tuple[int, Dict[str, Any], Dict[str, str]]:
+        image_urls = body.get("image_urls") or []
+        base64_images = body.get("base64_images") or []
+        image_count = len(image_urls) + len(base64_images)
+        if not image_count:
+            return 400, {"detail": "No image URLs or base64 images provided"}, {}
+        if image_count > MAX_IMAGES:
+            return 400, {"detail": f"Too many images. Maximum {MAX_IMAGES} images allowed (URLs + base64 combined)"}, {}
+        if any(not isinstance(image, dict) or not image.get("data") for image in base64_images):
+            return 400, {"detail": "Invalid base64 image: missing data field"}, {}
+        if self.queued >= self.max_queue:
+            return 503, {"detail": "Server busy, too many queued requests"}, {
+                "Retry-After": str(self.faults.get("aigc", {}).get("retry_after_seconds", 5))}
+
+        # Only max_concurrency requests are processed at once; the rest wait their turn
+        self.queued += 1
+        self.stats["max_queued"] = max(self.stats["max_queued"], self.queued)
+        try:
+            await self.slots.acquire()
+        finally:
+            self.queued -= 1
+        self.processing += 1
+        try:
+            fault = await self.inject_fault("aigc")
+            if fault:
+                return fault
+            await asyncio.sleep(self.processing_seconds(body.get("pipeline_config_file") or "", image_count))
+        finally:
+            self.processing -= 1
+            self.slots.release()
+
+        models = (body.get("model_urls") or body.get("model_b64") or [])[:1]
+        if body.get("do_not_alter"):
+            return 200, {
+                "status": "success",
+                "message": "Images described successfully (description-only mode)!",
+                "images_requested": image_count,
+                "result": {
+                    "images": [{"original_url": url, "final_url": self.image_url(host),
+                                "description": "A product photo on a plain background", "person_present": False,
+                                "person_full_body": False, "person_description": "", "garment_description": "",
+                                "view": "front", "location_description": ""}
+                               for url in image_urls + ["base64"] * len(base64_images)],
+                    "processing_mode": "description_only",
+                    "do_not_alter": True,
+                },
+            }, {}
+        return 200, {
+            "status": "success",
+            "message": "Images processed successfully!",
+            "images_requested": image_count,
+            "models_requested": len(models),
+            "result": {
+                "processed_images": [self.image_url(host) for _ in range(image_count)],
+                "saved_state_blob": f"aigc_saved_state_{uuid.uuid4()}.json",
+                "model_images": [self.image_url(host) for _ in models],
+                "total_model_images": len(models),
+            },
+        }, {}
+
+    def image_url(self, host: str) -> str:
+        return f"http://{host}/images/{uuid.uuid4().hex}.png"
+
+    def authorized(self, headers: Dict[str, str]) -> bool:
+        return not self.api_token or headers.get("authorization") == f"Bearer {self.api_token}"
+
+    async def new_video(self, body: Dict[str, Any], headers: Dict[str, str]) -> Tuple[int, Dict[str, Any], Dict[str, str]]:
+        if not self.authorized(headers):
+            return 401, {"status": "error", "message": "Invalid API token", "error_code": "UNAUTHORIZED"}, {}
+        fault = await self.inject_fault("video")
+        if fault:
+            return fault
+        missing = [key for key in ("preset_video_id", "video_name", "user_key") if not body.get(key)]
+        if not body.get("save_state") and not body.get("source_url"):
+            missing.append("save_state or source_url")
+        if missing:
+            return 400, {"status": "error", "message": f"Missing required fields: {', '.join(missing)}",
+                         "error_code": "MISSING_PARAMETER"}, {}
+        await asyncio.sleep(sample_seconds(self.video_latency, self.rng) * self.time_scale)
+        video_id = f"{int(time.time() * 1000)}x{self.rng.randrange(10 ** 17):017d}"
+        render_seconds = sample_seconds(self.render or {"distribution": "constant", "value": 60}, self.rng) * self.time_scale
+        video = MockVideo(video_id, time.monotonic() + render_seconds, self.rng.random() < self.render.get("failure_rate", 0),
+                          body.get("callback_url") or "", body)
+        self.videos[video_id] = video
+        if video.callback_url and self.rng.random() >= self.render.get("callback_loss_rate", 0):
+            asyncio.get_running_loop().call_later(render_seconds, lambda: asyncio.ensure_future(self.deliver_callback(video)))
+        return 200, {"status": "success", "response": {"video_id": video_id, "expires": 31536000}}, {}
+
+    async def get_video(self, body: Dict[str, Any], headers: Dict[str, str]) -> Tuple[int, Dict[str, Any], Dict[str, str]]:
+        if not self.authorized(headers):
+            return 401, {"status": "error", "message": "Invalid API token", "error_code": "UNAUTHORIZED"}, {}
+        fault = await self.inject_fault("video")
+        if fault:
+            return fault
+        video = self.videos.get(str(body.get("video_id", "")))
+        if video is None:
+            return 404, {"status": "error", "message": "Video not found", "error_code": "VIDEO_NOT_FOUND"}, {}
+        await asyncio.sleep(sample_seconds(self.video_latency, self.rng) * self.time_scale)
+        return 200, {"status": "success", "response": video.response()}, {}
+
+    async def deliver_callback(self, video: MockVideo) -> None:
+        """POST the webhook payload; like the real API, retry 3 times with exponential backoff."""
+        payload = {"video_id": video.video_id, "status": "Failed" if video.failed else "Completed",
+                   "preset_video_id": video.preset_video_id, "video_name": video.video_name,
+                   "created_at": video.created_at}
+        if not video.failed:
+            payload["video_url"] = video.response().get("video_url", "")
+        for attempt in range(3):
+            try:
+                if 200 <= await post_json(video.callback_url, payload) < 300:
+                    self.stats["callbacks"] += 1
+                    return
+            except (OSError, asyncio.TimeoutError, ValueError):
+                pass
+            await asyncio.sleep(2 ** attempt * self.time_scale)
+        self.stats["callback_failures"] += 1
+
+    # HTTP
+
+    async def route(self, method: str, path: str, headers: Dict[str, str],
+                    body: bytes) -> Tuple[int, Any, Dict[str, str]]:
+        if method == "GET":
+            if path == "/health":
+                return 200, {"status": "healthy", "processing": self.processing, "queued": self.queued}, {}
+            if path == "/":
+                return 200, {"message": "AIGC Preview API (local stand-in)",
+                             "endpoints": ["/health", AIGC_ENDPOINT, f"{self.video_prefix}/ae_new_video_from_preset",
+                                           f"{self.video_prefix}/ae_get_video"]}, {}
+            if path.startswith("/images/") and path.endswith(".png"):
+                return 200, self._png, {"Content-Type": "image/png"}
+            return 404, {"detail": "Not Found"}, {}
+        if method != "POST":
+            return 405, {"detail": "Method Not Allowed"}, {}
+        try:
+            if headers.get("content-encoding") == "gzip":
+                body = gzip.decompress(body)
+            data = json.loads(body or b"{}")
+            if not isinstance(data, dict):
+                raise ValueError("not an object")
+        except (ValueError, OSError, EOFError):
+            if path.startswith(self.video_prefix):
+                return 400, {"status": "error", "message": "Malformed JSON", "error_code": "INVALID_JSON"}, {}
+            return 400, {"detail": "Malformed JSON body"}, {}
+        if path == AIGC_ENDPOINT:
+            return await self.create_slideshow(data, headers.get("host", f"localhost:{self.port}"))
+        if path == f"{self.video_prefix}/ae_new_video_from_preset":
+            return await self.new_video(data, headers)
+        if path == f"{self.video_prefix}/ae_get_video":
+            return await self.get_video(data, headers)
+        return 404, {"detail": "Not Found"}, {}
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Serve keep-alive HTTP/1.1 requests on one connection."""
+        self.stats["connections"] += 1
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except asyncio.LimitOverrunError:
+                    return
+                lines = head.decode("latin-1").split("\r\n")
+                method, target, version = (lines[0].split(" ") + ["", "", ""])[:3]
+                headers = {}
+                for line in lines[1:]:
+                    name, _, value = line.partition(":")
+                    if name:
+                        headers[name.strip().lower()] = value.strip()
+                keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+                if "chunked" in headers.get("transfer-encoding", "").lower():
+                    await self.respond(writer, 411, {"detail": "Content-Length required"}, {}, close=True)
+                    return
+                length = int(headers.get("content-length", "0") or 0)
+                if length > MAX_BODY_BYTES:
+                    await self.respond(writer, 413, {"detail": "Request body too large"}, {}, close=True)
+                    return
+                body = await reader.readexactly(length) if length else b""
+                self.stats["requests"] += 1
+                status, payload, extra_headers = await self.route(method, target.split("?")[0], headers, body)
+                self.stats["by_status"][status] = self.stats["by_status"].get(status, 0) + 1
+                await self.respond(writer, status, payload, extra_headers, close=not keep_alive)
+                if not keep_alive:
+                    return
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def respond(writer: asyncio.StreamWriter, status: int, payload: Any, headers: Dict[str, str],
+                      close: bool = False) -> None:
+        body = payload if isinstance(payload, bytes) else json.dumps(payload).encode()
+        lines = [f"HTTP/1.1 {status} {REASONS.get(status, 'Error')}",
+                 f"Content-Type: {headers.pop('Content-Type', 'application/json')}",
+                 f"Content-Length: {len(body)}", f"Connection: {'close' if close else 'keep-alive'}"]
+        lines.extend(f"{name}: {value}" for name, value in headers.items())
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode() + body)
+        await writer.drain()
+
+    async def serve(self) -> None:
+        self.slots = asyncio.Semaphore(self.max_concurrency)
+        server = await asyncio.start_server(self.handle, self.host, self.port, backlog=4096, limit=64 * 1024)
+        async with server:
+            await server.serve_forever()
+
+    def print_stats(self) -> None:
+        statuses = ", ".join(f"{count}× {status}" for status, count in sorted(self.stats["by_status"].items()))
+        faults = ", ".join(f"{count}× {fault}" for fault, count in sorted(self.stats["faults"].items())) or "none"
+        print(f"📊 {self.stats['requests']} requests on {self.stats['connections']} connections ({statuses or 'none'})")
+        print(f"💥 Injected faults: {faults}; peak queue {self.stats['max_queued']}")
+        if self.videos:
+            print(f"🎬 {len(self.videos)} videos, {self.stats['callbacks']} callbacks delivered, "
+                  f"{self.stats['callback_failures']} undeliverable")
+
+
+async def post_json(url: str, payload: Dict[str, Any], timeout: float = 30) -> int:
+    """Minimal asyncio HTTP client for webhook delivery; returns the response status."""
+    parts = urlsplit(url)
+    if parts.scheme not in ("http", "https"):
+        raise ValueError(f"unsupported callback URL {url}")
+    port = parts.port or (443 if parts.scheme == "https" else 80)
+    body = json.dumps(payload).encode()
+    reader, writer = await asyncio.wait_for(
+        asyncio.open_connection(parts.hostname, port, ssl=parts.scheme == "https"), timeout)
+    try:
+        path = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+        writer.write(f"POST {path} HTTP/1.1\r\nHost: {parts.netloc}\r\nContent-Type: application/json\r\n"
+                     f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode() + body)
+        await writer.drain()
+        status_line = await asyncio.wait_for(reader.readline(), timeout)
+        return int(status_line.split()[1])
+    finally:
+        writer.close()
+
+
+def main():
+    """Run the stand-in server until interrupted."""
+    config_file = "test_suite_config.json"
+    overrides: Dict[str, Any] = {}
+    args = sys.argv[1:]
+    i = 0
+    while i < len(args):
+        arg = args[i]
+        if arg in ("--port", "--time-scale", "--seed"):
+            try:
+                value = args[i + 1]
+                overrides[arg[2:].replace("-", "_")] = float(value) if arg == "--time-scale" else int(value)
+                i += 1  # Skip the next argument as it's the value
+            except (IndexError, ValueError):
+                print(f"❌ {arg} requires a number!")
+                sys.exit(1)
+        elif arg == "--host":
+            if i + 1 < len(args):
+                overrides["host"] = args[i + 1]
+                i += 1  # Skip the next argument as it's the value
+            else:
+                print("❌ --host requires an address (e.g. 0.0.0.0)!")
+                sys.exit(1)
+        elif arg == "--help":
+            print("Usage: python mock_server.py [config_file] [options]")
+            print("\nOptions:")
+            print("  --host <addr>       Listen address (default: mock_server.host, 127.0.0.1; 0.0.0.0 for other hosts)")
+            print("  --port <n>          Listen port (default: mock_server.port, 8080)")
+            print("  --time-scale <x>    Multiply every simulated processing and render time (e.g. 0.01)")
+            print("  --seed <n>          Seed latency and fault draws for reproducible runs")
+            print("  --help              Show this help message")
+            sys.exit(0)
+        elif not arg.startswith("-"):
+            config_file = arg
+        i += 1
+
+    try:
+        with open(config_file) as f:
+            config = json.load(f)
+    except FileNotFoundError:
+        config = {}
+        print(f"⚠️  {config_file} not found - using default mock settings")
+    except json.JSONDecodeError as e:
+        print(f"❌ Invalid JSON in {config_file}: {e}")
+        sys.exit(1)
+    try:
+        server = MockServer.from_config(config, **overrides)
+    except ValueError as e:
+        print(f"❌ Invalid mock_server settings: {e}")
+        sys.exit(1)
+
+    print("🧪 AIGC Preview API / Main Video API stand-in")
+    print(f"🌐 Listening on http://{server.host}:{server.port} (video API under {server.video_prefix})")
+    print(f"⚙️  {server.max_concurrency} requests processed at once, up to {server.max_queue} queued, "
+          f"time scale {server.time_scale}")
+    try:
+        asyncio.run(server.serve())
+    except KeyboardInterrupt:
+        print("\n🛑 Stopped")
+    except OSError as e:
+        print(f"❌ Cannot listen on {server.host}:{server.port}: {e}")
+        sys.exit(1)
+    server.print_stats()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+Verification of processed output images for the AIGC Preview API Test Suite Runner
+
+A test that returns the right number of `processed_images` can still have
+produced blank, truncated or wrong-size images. With verification enabled,
+every output image (and model-reference output) is downloaded with a
+bounded number of concurrent streaming downloads and checked:
+
+- format and dimensions, parsed from the image header (JPEG, PNG, GIF, WebP, AVIF)
+- truncation: the byte count against `Content-Length` and the format's end marker
+- minimum dimensions
+- a 64-bit difference hash (perceptual hash) and a blank-image check,
+  when Pillow is installed
+
+Downloads are streamed in chunks; bodies are spooled to a temporary file
+(in memory only up to a small limit) so memory use doesn't grow with
+image size.
+"""
+
+import struct
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Tuple, Any, Optional
+
+import requests
+
+try:
+    from PIL import Image, ImageStat
+except ImportError:  # Pillow is optional; without it there is no perceptual hash or blank check
+    Image = None
+
+DOWNLOAD_CHUNK_BYTES = 64 * 1024
+MAX_HEADER_BYTES = 512 * 1024  # JPEG EXIF/ICC segments can push the frame header far in
+SPOOL_MEMORY_BYTES = 1024 * 1024
+TRAILER_BYTES = 64
+
+
+def parse_image_header(data: bytes) -> Optional[Tuple[str, int, int]]:
+    """(format, width, height) from the leading bytes of an image, or None if not (yet) known."""
+    if data.startswith(b"\x89PNG\r\n\x1a\n") and len(data) >= 24:
+        width, height = struct.unpack(">II", data[16:24])
+        return "png", width, height
+    if data[:6] in (b"GIF87a", b"GIF89a") and len(data) >= 10:
+        width, height = struct.unpack("<HH", data[6:10])
+        return "gif", width, height
+    if data[:4] == b"RIFF" and data[8:12] == b"WEBP" and len(data) >= 30:
+        chunk = data[12:16]
+        if chunk == b"VP8 ":
+            width, height = struct.unpack("<HH", data[26:30])
+            return "webp", width & 0x3FFF, height & 0x3FFF
+        if chunk == b"VP8L":
+            bits = int.from_bytes(data[21:25], "little")
+            return "webp", (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+        if chunk == b"VP8X":
+            return "webp", int.from_bytes(data[24:27], "little") + 1, int.from_bytes(data[27:30], "little") + 1
+        return None
+    if data[4:8] == b"ftyp" and data[8:12] in (b"avif", b"avis"):
+        index = data.find(b"ispe")
+        if index != -1 and len(data) >= index + 16:
+            width, height = struct.unpack(">II", data[index + 8:index + 16])
+            return "avif", width, height
+        return None
+    if data.startswith(b"\xff\xd8"):
+        return _parse_jpeg_header(data)
+    return None
+
+
+def _parse_jpeg_header(data: bytes) -> Optional[Tuple[str, int, int]]:
+    offset = 2
+    while offset + 9 < len(data):
+        if data[offset] != 0xFF:
+            offset += 1
+            continue
+        marker = data[offset + 1]
+        if marker == 0xFF:
+            offset += 1
+            continue
+        if marker in (0xD8, 0x01) or 0xD0 <= marker <= 0xD7:
+            offset += 2
+            continue
+        # Start-of-frame markers (except DHT, JPG and DAC) carry the dimensions
+        if 0xC0 <= marker <= 0xCF and marker not in (0xC4, 0xC8, 0xCC):
+            height, width = struct.unpack(">HH", data[offset + 5:offset + 9])
+            return "jpeg", width, height
+        length = struct.unpack(">H", data[offset + 2:offset + 4])[0]
+        offset += 2 + length
+    return None
+
+
+def has_end_marker(image_format: str, trailer: bytes, total_bytes: int, header: bytes) -> bool:
+    """Whether the image ends the way its format says it should."""
+    if image_format == "jpeg":
+        return b"\xff\xd9" in trailer
+    if image_format == "png":
+        return b"IEND" in trailer
+    if image_format == "gif":
+        return trailer.rstrip(b"\x00").endswith(b"\x3b")
+    if image_format == "webp":
+        return struct.unpack("<I", header[4:8])[0] + 8 <= total_bytes
+    return True
+
+
+def difference_hash(image) -> str:
+    """64-bit dHash as 16 hex digits: brighter-than-right-neighbour bits of a 9×8 grayscale thumbnail."""
+    small = image.convert("L").resize((9, 8))
+    pixels = list(small.getdata())
+    bits = 0
+    for row in range(8):
+        for column in range(8):
+            bits = (bits << 1) | (pixels[row * 9 + column] > pixels[row * 9 + column + 1])
+    return f"{bits:016x}"
+
+
+class ImageCheck:
+    """Verification outcome of one output image."""
+
+    def __init__(self, url: str):
+        self.url = url
+        self.format = ""
+        self.width = 0
+        self.height = 0
+        self.bytes = 0
+        self.phash = ""
+        self.issue = ""
+
+    @property
+    def dimensions(self) -> str:
+        return f"{self.width}x{self.height}" if self.width else ""
+
+
+class OutputVerifier:
+    """Downloads and checks output images with a shared, bounded pool of streaming downloads."""
+
+    def __init__(self, concurrency: int = 8, timeout: float = 60, min_width: int = 64, min_height: int = 64,
+                 blank_stddev: float = 2.0):
+        self.concurrency = max(1, concurrency)
+        self.timeout = timeout
+        self.min_width = min_width
+        self.min_height = min_height
+        self.blank_stddev = blank_stddev
+        self._executor = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="aigc-verify")
+        self._local = threading.local()
+
+    @classmethod
+    def from_config(cls, config: Dict) -> "OutputVerifier":
+        settings = config.get("output_verification", {})
+        return cls(
+            concurrency=settings.get("concurrency", 8),
+            timeout=settings.get("timeout_seconds", 60),
+            min_width=settings.get("min_width", 64),
+            min_height=settings.get("min_height", 64),
+            blank_stddev=settings.get("blank_stddev", 2.0),
+        )
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _session(self) -> requests.Session:
+        if not hasattr(self._local, "session"):
+            self._local.session = requests.Session()
+        return self._local.session
+
+    def verify(self, urls: List[str]) -> Tuple[List[ImageCheck], float]:
+        """Check all `urls` (concurrently, within the shared limit); returns the checks and wall time."""
+        start = time.perf_counter()
+        checks = list(self._executor.map(self.check, urls))
+        return checks, time.perf_counter() - start
+
+    def check(self, url: str) -> ImageCheck:
+        check = ImageCheck(url)
+        try:
+            with self._session().get(url, timeout=self.timeout, stream=True) as response:
+                if response.status_code != 200:
+                    check.issue = f"HTTP {response.status_code}"
+                    return check
+                # Content-Length counts encoded bytes; only comparable when the body isn't content-encoded
+                expected = response.headers.get("Content-Length")
+                if response.headers.get("Content-Encoding") or not (expected or "").isdigit():
+                    expected = None
+                header = bytearray()
+                trailer = b""
+                with tempfile.SpooledTemporaryFile(max_size=SPOOL_MEMORY_BYTES) as body:
+                    for chunk in response.iter_content(DOWNLOAD_CHUNK_BYTES):
+                        check.bytes += len(chunk)
+                        if len(header) < MAX_HEADER_BYTES and not check.format:
+                            header += chunk[:MAX_HEADER_BYTES - len(header)]
+                            parsed = parse_image_header(bytes(header))
+                            if parsed:
+                                check.format, check.width, check.height = parsed
+                        trailer = (trailer + chunk)[-TRAILER_BYTES:]
+                        if Image is not None:
+                            body.write(chunk)
+                    self._inspect(check, bytes(header[:32]), trailer, expected, body)
+        except requests.exceptions.Timeout:
+            check.issue = f"download timed out after {self.timeout}s"
+        except requests.exceptions.RequestException as e:
+            check.issue = f"download failed ({type(e).__name__})"
+        return check
+
+    def _inspect(self, check: ImageCheck, header: bytes, trailer: bytes, expected: Optional[str], body) -> None:
+        if check.bytes == 0:
+            check.issue = "empty body"
+        elif expected is not None and int(expected) != check.bytes:
+            check.issue = f"truncated ({check.bytes} of {expected} bytes)"
+        elif not check.format:
+            check.issue = "not a recognized image"
+        elif not has_end_marker(check.format, trailer, check.bytes, header):
+            check.issue = f"truncated {check.format} (no end marker)"
+        elif check.width < self.min_width or check.height < self.min_height:
+            check.issue = f"too small ({check.dimensions} < {self.min_width}x{self.min_height})"
+        if check.issue or Image is None:
+            return
+        try:
+            body.seek(0)
+            with Image.open(body) as image:
+                image.draft("L", (256, 256))  # JPEG: decode at reduced scale
+                check.phash = difference_hash(image)
+                if max(ImageStat.Stat(image.convert("L").resize((32, 32))).stddev) < self.blank_stddev:
+                    check.issue = "blank (uniform colour)"
+        except Exception as e:
+            check.issue = f"undecodable {check.format} ({type(e).__name__})"
+
+
+def output_image_urls(response_data: Dict[str, Any]) -> List[str]:
+    """Processed and model-reference output URLs, at the top level or under `result`."""
+    urls = []
+    for source in (response_data, response_data.get("result") or {}):
+        if isinstance(source, dict):
+            for key in ("processed_images", "model_images"):
+                urls.extend(url for url in source.get(key) or [] if isinstance(url, str))
+    return list(dict.fromkeys(urls))
+
+
+def verification_columns(checks: List[ImageCheck], seconds: float) -> Dict[str, Any]:
+    """Per-test CSV columns summarizing the checks."""
+    total_bytes = sum(check.bytes for check in checks)
+    issues = [f"{check.url}: {check.issue}" for check in checks if check.issue]
+    return {
+        "verified_images": sum(1 for check in checks if not check.issue),
+        "verification_failures": len(issues),
+        "output_formats": "; ".join(sorted({check.format for check in checks if check.format})),
+        "output_dimensions": "; ".join(check.dimensions for check in checks),
+        "output_phashes": "; ".join(check.phash for check in checks),
+        "output_bytes": total_bytes,
+        "output_download_mib_s": round(total_bytes / 1024 / 1024 / seconds, 2) if seconds > 0 and total_bytes else 0,
+        "verification_issues": "; ".join(issues),
+    }
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Pre-flight validation of source image URLs for the AIGC Preview API Test Suite Runner
+
+Before any test is dispatched, every unique image URL in the config (image
+lists and URL-valued dimensions such as `model_urls`) is checked once,
+concurrently: reachability, content type against the formats the pipeline
+accepts, and size. A dead or unsupported URL otherwise only shows up after
+the server has spent its processing timeout on it, once per combination
+that uses the list.
+
+Each URL is probed with a HEAD request; when the server doesn't answer HEAD
+usefully (405, missing or generic content type) a ranged GET of the first
+bytes is used instead and the format is sniffed from its magic number.
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Tuple, Any, Optional, Iterable
+
+import requests
+
+SUPPORTED_CONTENT_TYPES = ("image/jpeg", "image/png", "image/gif", "image/webp", "image/avif")
+GENERIC_CONTENT_TYPES = ("", "application/octet-stream", "binary/octet-stream")
+SNIFF_BYTES = 32
+# Statuses that may well succeed on the next try; like timeouts, they never prune combinations
+TRANSIENT_STATUSES = (408, 429)
+
+
+def sniff_image_type(head: bytes) -> Optional[str]:
+    """Content type from the leading bytes of an image, or None if unrecognized."""
+    if head.startswith(b"\xff\xd8\xff"):
+        return "image/jpeg"
+    if head.startswith(b"\x89PNG\r\n\x1a\n"):
+        return "image/png"
+    if head[:6] in (b"GIF87a", b"GIF89a"):
+        return "image/gif"
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "image/webp"
+    if head[4:8] == b"ftyp" and head[8:12] in (b"avif", b"avis"):
+        return "image/avif"
+    return None
+
+
+class UrlCheck:
+    """Outcome of the pre-flight check of one URL."""
+
+    def __init__(self, url: str, status: Optional[int] = None, content_type: str = "",
+                 size: Optional[int] = None, error: str = "", transient: bool = False):
+        self.url = url
+        self.status = status
+        self.content_type = content_type
+        self.size = size
+        self.error = error
+        self.transient = transient  # timeout, unreachable or 5xx: may work by the time the test runs
+
+    @property
+    def ok(self) -> bool:
+        return not self.error
+
+    @property
+    def definite(self) -> bool:
+        """A failure that will not go away by itself (4xx, unsupported type, too large)."""
+        return bool(self.error) and not self.transient
+
+
+class PreflightChecker:
+    """Checks image URLs concurrently and caches the outcome per URL for the session."""
+
+    def __init__(self, concurrency: int = 16, timeout: float = 10, max_image_mb: float = 20,
+                 supported_types: Iterable[str] = SUPPORTED_CONTENT_TYPES):
+        self.concurrency = max(1, concurrency)
+        self.timeout = timeout
+        self.max_bytes = int(max_image_mb * 1024 * 1024) if max_image_mb else None
+        self.supported_types = tuple(supported_types)
+        self.results: Dict[str, UrlCheck] = {}
+        self._local = threading.local()
+
+    @classmethod
+    def from_config(cls, config: Dict) -> "PreflightChecker":
+        settings = config.get("preflight", {})
+        return cls(
+            concurrency=settings.get("concurrency", 16),
+            timeout=settings.get("timeout_seconds", 10),
+            max_image_mb=settings.get("max_image_mb", 20),
+            supported_types=settings.get("supported_types", SUPPORTED_CONTENT_TYPES),
+        )
+
+    def _session(self) -> requests.Session:
+        # One keep-alive session per checking thread
+        if not hasattr(self._local, "session"):
+            self._local.session = requests.Session()
+        return self._local.session
+
+    def check_all(self, urls: Iterable[str]) -> Dict[str, UrlCheck]:
+        """Check every URL not checked yet in this session; returns all results so far."""
+        pending = sorted(set(urls) - set(self.results))
+        if pending:
+            with ThreadPoolExecutor(max_workers=min(self.concurrency, len(pending)),
+                                    thread_name_prefix="aigc-preflight") as executor:
+                for check in executor.map(self.check, pending):
+                    self.results[check.url] = check
+        return self.results
+
+    def check(self, url: str) -> UrlCheck:
+        try:
+            response = self._session().head(url, timeout=self.timeout, allow_redirects=True)
+            status = response.status_code
+            content_type = response.headers.get("Content-Type", "").split(";")[0].strip().lower()
+            size = self._int_header(response.headers.get("Content-Length"))
+            if status in (403, 405, 501) or content_type in GENERIC_CONTENT_TYPES or not 200 <= status < 300:
+                # HEAD not supported or not informative: look at the first bytes instead
+                status, content_type, size = self._range_get(url, content_type, size)
+        except requests.exceptions.Timeout:
+            return UrlCheck(url, error=f"timed out after {self.timeout}s", transient=True)
+        except requests.exceptions.RequestException as e:
+            return UrlCheck(url, error=f"unreachable ({type(e).__name__})", transient=True)
+
+        check = UrlCheck(url, status, content_type, size)
+        if not 200 <= status < 300:
+            check.error = f"HTTP {status}"
+            check.transient = status >= 500 or status in TRANSIENT_STATUSES
+        elif content_type not in self.supported_types:
+            check.error = f"unsupported content type '{content_type or 'unknown'}'"
+        elif self.max_bytes and size is not None and size > self.max_bytes:
+            check.error = f"too large ({size / 1024 / 1024:.1f} MiB > {self.max_bytes / 1024 / 1024:.0f} MiB)"
+        return check
+
+    def _range_get(self, url: str, content_type: str, size: Optional[int]) -> Tuple[int, str, Optional[int]]:
+        headers = {"Range": f"bytes=0-{SNIFF_BYTES - 1}"}
+        with self._session().get(url, headers=headers, timeout=self.timeout, stream=True) as response:
+            status = response.status_code
+            head = response.raw.read(SNIFF_BYTES) if 200 <= status < 300 else b""
+            header_type = response.headers.get("Content-Type", "").split(";")[0].strip().lower()
+            if status == 206:
+                # Content-Range: bytes 0-31/123456
+                total = response.headers.get("Content-Range", "").rpartition("/")[2]
+                size = self._int_header(total) or size
+            else:
+                size = self._int_header(response.headers.get("Content-Length")) or size
+        sniffed = sniff_image_type(head)
+        if sniffed:
+            content_type = sniffed
+        elif header_type not in GENERIC_CONTENT_TYPES:
+            content_type = header_type
+        return status, content_type, size
+
+    @staticmethod
+    def _int_header(value: Optional[str]) -> Optional[int]:
+        try:
+            return int(value) if value is not None else None
+        except ValueError:
+            return None
+
+    def issues(self, urls: Iterable[str], definite_only: bool = False) -> List[str]:
+        """Problems with any of `urls` (URLs that weren't checked are assumed fine)."""
+        return [f"{url}: {self.results[url].error}" for url in urls
+                if url in self.results and not self.results[url].ok
+                and (self.results[url].definite or not definite_only)]
+
+
+def collect_image_urls(config: Dict) -> List[str]:
+    """Unique image URLs referenced by image lists and URL-list dimension values (e.g. `model_urls`)."""
+    urls = []
+    for data in config.get("image_lists", {}).values():
+        urls.extend(data.get("urls", []))
+    for spec in config.get("dimensions", {}).values():
+        for value_data in spec.get("values", {}).values():
+            value = value_data.get("value")
+            if isinstance(value, list):
+                urls.extend(item for item in value if isinstance(item, str) and item.startswith(("http://", "https://")))
+    return list(dict.fromkeys(urls))
+
+
+def combination_urls(combination: Dict[str, Any]) -> List[str]:
+    """The image URLs a combination would send."""
+    urls = list(combination.get("image_urls", []))
+    for value in combination.get("request_fields", {}).values():
+        if isinstance(value, list):
+            urls.extend(item for item in value if isinstance(item, str) and item.startswith(("http://", "https://")))
+    return urls
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Adaptive client-side rate limiting for the AIGC Preview API Test Suite Runner
+
+Every API attempt passes through one shared limiter that combines:
+- a token bucket capping the request start rate (optional, `requests_per_second`)
+- an AIMD concurrency window: the number of requests allowed in flight grows
+  additively while responses are healthy and is cut multiplicatively on
+  `429`/`503` responses or when latency rises well above its baseline;
+  baselines are kept per request kind (pipeline config and image count), so
+  a matrix moving on to slower combinations isn't mistaken for overload
+- a global pause honouring `Retry-After`, so one throttled response holds
+  back every worker rather than just the one that received it
+
+A long run therefore settles at the throughput the service can sustain
+instead of spending its retries against a throttled endpoint.
+"""
+
+import email.utils
+import math
+import threading
+import time
+from typing import Dict, List, Any, Optional, Hashable
+
+THROTTLE_STATUSES = (429, 503)
+MIN_LATENCY_BASELINE = 0.1
+MIN_LATENCY_SAMPLES = 3  # responses of one request kind before its latency can trigger a back-off
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait from a `Retry-After` header (delta-seconds or HTTP-date)."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when is None:
+        return None
+    return max(0.0, when.timestamp() - time.time())
+
+
+class TokenBucket:
+    """Thread-safe token bucket; callers reserve a token and sleep until it is due."""
+
+    def __init__(self, rate: float, burst: float = 1):
+        self.rate = rate
+        self.burst = max(1.0, burst)
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """Take one token, sleeping if none is available; returns the time waited."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            # Going negative reserves a future token, so concurrent callers queue up fairly
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+
+class AdaptiveRateLimiter:
+    """Shared token bucket + AIMD in-flight window + Retry-After pause."""
+
+    def __init__(self, max_concurrency: int, min_concurrency: int = 1, initial_concurrency: Optional[float] = None,
+                 requests_per_second: Optional[float] = None, burst: float = 1, decrease_factor: float = 0.5,
+                 latency_increase_factor: float = 2.0, max_retry_after_seconds: float = 300):
+        self.max_concurrency = max(1, max_concurrency)
+        self.min_concurrency = max(1, min(min_concurrency, self.max_concurrency))
+        self.limit = float(min(max(initial_concurrency or self.max_concurrency, self.min_concurrency),
+                               self.max_concurrency))
+        self.bucket = TokenBucket(requests_per_second, burst) if requests_per_second else None
+        self.decrease_factor = decrease_factor
+        self.latency_increase_factor = latency_increase_factor
+        self.max_retry_after_seconds = max_retry_after_seconds
+
+        self.in_flight = 0
+        self.paused_until = 0.0
+        self.latency_ewma: Optional[float] = None  # over all requests; sets the decrease cooldown
+        self._latency: Dict[Hashable, List[float]] = {}  # request kind → [ewma, baseline, samples]
+        self.last_decrease = 0.0
+
+        # Reported in the summary
+        self.throttled = 0
+        self.latency_decreases = 0
+        self.waited_seconds = 0.0
+        self.lowest_limit = self.limit
+
+        self._cond = threading.Condition()
+
+    @classmethod
+    def from_config(cls, config: Dict, max_concurrency: int) -> Optional["AdaptiveRateLimiter"]:
+        """Build the limiter from the optional `rate_limit` config section (None when disabled)."""
+        settings = config.get("rate_limit", {})
+        if not settings.get("enabled", True):
+            return None
+        return cls(
+            max_concurrency=max_concurrency,
+            min_concurrency=settings.get("min_concurrency", 1),
+            initial_concurrency=settings.get("initial_concurrency"),
+            requests_per_second=settings.get("requests_per_second"),
+            burst=settings.get("burst", 1),
+            decrease_factor=settings.get("decrease_factor", 0.5),
+            latency_increase_factor=settings.get("latency_increase_factor", 2.0),
+            max_retry_after_seconds=settings.get("max_retry_after_seconds", 300),
+        )
+
+    def acquire(self) -> None:
+        """Block until the window has room, any Retry-After pause is over and a token is available."""
+        waited_from = time.monotonic()
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                if now < self.paused_until:
+                    self._cond.wait(self.paused_until - now)
+                elif self.in_flight >= math.floor(self.limit):
+                    self._cond.wait()
+                else:
+                    break
+            self.in_flight += 1
+        if self.bucket:
+            self.bucket.acquire()
+        waited = time.monotonic() - waited_from
+        if waited > 0.001:
+            with self._cond:
+                self.waited_seconds += waited
+
+    def release(self, status: Optional[int], latency: float, retry_after: Optional[float] = None,
+                kind: Hashable = None) -> None:
+        """Finish an attempt and adjust the window from its status (None = no response) and latency.
+
+        `kind` groups requests with comparable latency (e.g. pipeline config and image count).
+        """
+        with self._cond:
+            self.in_flight -= 1
+            now = time.monotonic()
+            if status in THROTTLE_STATUSES:
+                self.throttled += 1
+                if retry_after is not None:
+                    self.paused_until = max(self.paused_until, now + min(retry_after, self.max_retry_after_seconds))
+                self._decrease(now)
+            elif status is not None and status < 300:
+                if self._latency_rising(latency, kind):
+                    if self._decrease(now):
+                        self.latency_decreases += 1
+                else:
+                    # Additive increase: about +1 per window's worth of healthy responses
+                    self.limit = min(self.max_concurrency, self.limit + 1.0 / max(self.limit, 1.0))
+            self._cond.notify_all()
+
+    def _latency_rising(self, latency: float, kind: Hashable) -> bool:
+        if self.latency_ewma is None:
+            self.latency_ewma = latency
+        else:
+            self.latency_ewma += 0.2 * (latency - self.latency_ewma)
+        state = self._latency.get(kind)
+        if state is None:
+            self._latency[kind] = [latency, latency, 1]
+            return False
+        state[0] += 0.2 * (latency - state[0])
+        # Never raised after a cut, so a sustained overload keeps counting against the unloaded latency
+        state[1] = min(state[1], state[0])
+        state[2] += 1
+        # Sub-100ms baselines are mostly noise; don't back off on jitter around them
+        return (state[2] >= MIN_LATENCY_SAMPLES and
+                state[0] > max(state[1], MIN_LATENCY_BASELINE) * self.latency_increase_factor)
+
+    def _decrease(self, now: float) -> bool:
+        # One cut per round trip: a burst of 429s from the same overload counts once
+        cooldown = max(1.0, self.latency_ewma or 0.0)
+        if now - self.last_decrease < cooldown:
+            return False
+        self.last_decrease = now
+        self.limit = max(self.min_concurrency, self.limit * self.decrease_factor)
+        self.lowest_limit = min(self.lowest_limit, self.limit)
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            return {
+                "limit": self.limit,
+                "lowest_limit": self.lowest_limit,
+                "max_concurrency": self.max_concurrency,
+                "throttled": self.throttled,
+                "latency_decreases": self.latency_decreases,
+                "waited_seconds": self.waited_seconds,
+            }
@@ -0,0 +1,368 @@
+#!/usr/bin/env python3
+"""
+Cross-run performance regression detection for the AIGC Preview API Test Suite Runner
+
+Compares the durations of a baseline and a candidate run, overall and per
+dimension value (pipeline config, image list, prompt combination and any
+extra matrix dimension):
+
+- rows are aligned by `test_id`; where both runs have the same tests, the
+  paired differences are tested with the Wilcoxon signed-rank test,
+  otherwise the two samples with the Mann-Whitney U test (both
+  nonparametric, normal approximation with tie correction)
+- p-values are Holm-adjusted across all compared groups
+- medians and tail percentiles get percentile-bootstrap confidence
+  intervals of their relative change
+
+A group is a regression when its adjusted p-value is below `alpha` and
+its median or p95 got slower by more than the threshold, with the whole
+confidence interval above zero.
+"""
+
+import html
+import math
+import random
+from typing import Dict, List, Tuple, Any, Optional, Callable
+
+# (dimension label, columns whose values form the group key)
+BASE_DIMENSIONS: Tuple[Tuple[str, Tuple[str, ...]], ...] = (
+    ("pipeline", ("pipeline_config_key",)),
+    ("image_list", ("image_list_key",)),
+    ("prompts", ("location_prompt_key", "person_prompt_key")),
+)
+BASE_KEY_COLUMNS = {"image_list_key", "location_prompt_key", "person_prompt_key", "pipeline_config_key"}
+TAIL_PERCENTILE = 95
+
+
+def percentile(sorted_values: List[float], percentile_rank: float) -> float:
+    """Linearly interpolated percentile of already sorted values."""
+    if not sorted_values:
+        return 0.0
+    position = (len(sorted_values) - 1) * percentile_rank / 100
+    lower = math.floor(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+
+def median(values: List[float]) -> float:
+    return percentile(sorted(values), 50)
+
+
+def average_ranks(values: List[float]) -> Tuple[List[float], float]:
+    """1-based ranks with ties averaged, and the tie correction term sum(t³ - t)."""
+    order = sorted(range(len(values)), key=lambda index: values[index])
+    ranks = [0.0] * len(values)
+    ties = 0.0
+    start = 0
+    while start < len(order):
+        end = start
+        while end + 1 < len(order) and values[order[end + 1]] == values[order[start]]:
+            end += 1
+        for index in order[start:end + 1]:
+            ranks[index] = (start + end) / 2 + 1
+        count = end - start + 1
+        ties += count ** 3 - count
+        start = end + 1
+    return ranks, ties
+
+
+def two_sided_p(z: float) -> float:
+    return math.erfc(abs(z) / math.sqrt(2))
+
+
+def mann_whitney_u(baseline: List[float], candidate: List[float]) -> float:
+    """Two-sided p-value of the Mann-Whitney U test (normal approximation, tie and continuity corrected)."""
+    n1, n2 = len(baseline), len(candidate)
+    if not n1 or not n2:
+        return 1.0
+    ranks, ties = average_ranks(baseline + candidate)
+    u = sum(ranks[n1:]) - n2 * (n2 + 1) / 2
+    mean = n1 * n2 / 2
+    n = n1 + n2
+    variance = n1 * n2 / 12 * ((n + 1) - ties / (n * (n - 1)))
+    if variance <= 0:
+        return 1.0
+    return two_sided_p((abs(u - mean) - 0.5) / math.sqrt(variance))
+
+
+def wilcoxon_signed_rank(differences: List[float]) -> float:
+    """Two-sided p-value of the Wilcoxon signed-rank test on paired differences (zeros dropped)."""
+    nonzero = [difference for difference in differences if difference != 0]
+    n = len(nonzero)
+    if not n:
+        return 1.0
+    ranks, ties = average_ranks([abs(difference) for difference in nonzero])
+    w_plus = sum(rank for rank, difference in zip(ranks, nonzero) if difference > 0)
+    mean = n * (n + 1) / 4
+    variance = n * (n + 1) * (2 * n + 1) / 24 - ties / 48
+    if variance <= 0:
+        return 1.0
+    return two_sided_p((abs(w_plus - mean) - 0.5) / math.sqrt(variance))
+
+
+def holm_adjust(p_values: List[float]) -> List[float]:
+    """Holm-Bonferroni adjusted p-values, in the input order."""
+    order = sorted(range(len(p_values)), key=lambda index: p_values[index])
+    adjusted = [1.0] * len(p_values)
+    running = 0.0
+    for rank, index in enumerate(order):
+        running = max(running, min(1.0, (len(p_values) - rank) * p_values[index]))
+        adjusted[index] = running
+    return adjusted
+
+
+def relative_change(baseline: float, candidate: float) -> float:
+    """Change in percent of the baseline (0 when the baseline is 0)."""
+    return (candidate - baseline) / baseline * 100 if baseline else 0.0
+
+
+def bootstrap_ci(baseline: List[float], candidate: List[float], statistic: Callable[[List[float]], float],
+                 pairs: Optional[List[Tuple[float, float]]], resamples: int, confidence: float,
+                 rng: random.Random) -> Tuple[float, float]:
+    """Percentile-bootstrap CI of the relative change of `statistic`, resampling pairs when given."""
+    changes = []
+    for _ in range(resamples):
+        if pairs:
+            sample = rng.choices(pairs, k=len(pairs))
+            base, cand = [pair[0] for pair in sample], [pair[1] for pair in sample]
+        else:
+            base, cand = rng.choices(baseline, k=len(baseline)), rng.choices(candidate, k=len(candidate))
+        changes.append(relative_change(statistic(base), statistic(cand)))
+    changes.sort()
+    tail = (1 - confidence) / 2 * 100
+    return percentile(changes, tail), percentile(changes, 100 - tail)
+
+
+def is_live_success(result: Dict[str, Any]) -> bool:
+    """Only successful, actually executed tests say anything about latency."""
+    success = result.get("success")
+    if isinstance(success, str):
+        success = success.lower() == "true"
+    return bool(success) and result.get("response_source", "live") in ("live", "")
+
+
+def duration_of(result: Dict[str, Any]) -> Optional[float]:
+    try:
+        return float(result.get("duration_seconds"))
+    except (TypeError, ValueError):
+        return None
+
+
+class GroupComparison:
+    """Baseline vs. candidate durations of one group of tests."""
+
+    def __init__(self, dimension: str, key: str):
+        self.dimension = dimension
+        self.key = key
+        self.baseline: List[float] = []
+        self.candidate: List[float] = []
+        self.pairs: List[Tuple[float, float]] = []
+        self.baseline_total = 0
+        self.candidate_total = 0
+        self.test = ""
+        self.p_value = 1.0
+        self.adjusted_p = 1.0
+        self.median_change = 0.0
+        self.median_ci = (0.0, 0.0)
+        self.tail_change = 0.0
+        self.tail_ci = (0.0, 0.0)
+        self.regression = False
+        self.improvement = False
+
+    @property
+    def label(self) -> str:
+        return "all tests" if self.dimension == "overall" else f"{self.dimension}={self.key}"
+
+    @property
+    def baseline_median(self) -> float:
+        return median(self.baseline)
+
+    @property
+    def candidate_median(self) -> float:
+        return median(self.candidate)
+
+    @property
+    def baseline_tail(self) -> float:
+        return percentile(sorted(self.baseline), TAIL_PERCENTILE)
+
+    @property
+    def candidate_tail(self) -> float:
+        return percentile(sorted(self.candidate), TAIL_PERCENTILE)
+
+    @property
+    def baseline_success_rate(self) -> float:
+        return len(self.baseline) / self.baseline_total * 100 if self.baseline_total else 0.0
+
+    @property
+    def candidate_success_rate(self) -> float:
+        return len(self.candidate) / self.candidate_total * 100 if self.candidate_total else 0.0
+
+    @property
+    def severity(self) -> float:
+        return max(self.median_change, self.tail_change)
+
+
+def group_keys(result: Dict[str, Any], extra_dimensions: List[str]) -> List[Tuple[str, str]]:
+    """(dimension, key) of every group a result belongs to, including the overall group."""
+    keys = [("overall", "")]
+    for dimension, columns in BASE_DIMENSIONS:
+        if all(column in result for column in columns):
+            keys.append((dimension, " × ".join(str(result[column]) for column in columns)))
+    for dimension in extra_dimensions:
+        keys.append((dimension, str(result.get(f"{dimension}_key", ""))))
+    return keys
+
+
+def extra_dimension_names(results: List[Dict[str, Any]]) -> List[str]:
+    """Extra matrix dimensions present in the results (`<name>_key` columns with a `<name>_name`)."""
+    columns = results[0].keys() if results else []
+    return [column[:-4] for column in columns
+            if column.endswith("_key") and column not in BASE_KEY_COLUMNS and f"{column[:-4]}_name" in columns]
+
+
+def compare_runs(baseline: List[Dict[str, Any]], candidate: List[Dict[str, Any]], threshold_percent: float = 10,
+                 alpha: float = 0.05, resamples: int = 2000, confidence: float = 0.95, min_samples: int = 5,
+                 seed: Optional[int] = 0) -> List[GroupComparison]:
+    """Compare the two runs per group; returns the groups with enough samples, regressions first."""
+    extra_dimensions = [name for name in extra_dimension_names(baseline) if name in extra_dimension_names(candidate)]
+    groups: Dict[Tuple[str, str], GroupComparison] = {}
+
+    def group(dimension: str, key: str) -> GroupComparison:
+        if (dimension, key) not in groups:
+            groups[(dimension, key)] = GroupComparison(dimension, key)
+        return groups[(dimension, key)]
+
+    # Pair tests by test_id when it occurs exactly once in both runs
+    baseline_ids: Dict[str, int] = {}
+    for result in baseline:
+        baseline_ids[result.get("test_id")] = baseline_ids.get(result.get("test_id"), 0) + 1
+    candidate_by_id: Dict[str, List[Dict[str, Any]]] = {}
+    for result in candidate:
+        candidate_by_id.setdefault(result.get("test_id"), []).append(result)
+
+    for result in baseline:
+        duration = duration_of(result)
+        for dimension, key in group_keys(result, extra_dimensions):
+            entry = group(dimension, key)
+            entry.baseline_total += 1
+            if is_live_success(result) and duration is not None:
+                entry.baseline.append(duration)
+        matches = candidate_by_id.get(result.get("test_id"), [])
+        if baseline_ids[result.get("test_id")] == 1 and len(matches) == 1:
+            other = matches[0]
+            other_duration = duration_of(other)
+            if is_live_success(result) and is_live_success(other) and duration is not None \
+                    and other_duration is not None:
+                for dimension, key in group_keys(result, extra_dimensions):
+                    group(dimension, key).pairs.append((duration, other_duration))
+    for result in candidate:
+        duration = duration_of(result)
+        for dimension, key in group_keys(result, extra_dimensions):
+            entry = group(dimension, key)
+            entry.candidate_total += 1
+            if is_live_success(result) and duration is not None:
+                entry.candidate.append(duration)
+
+    rng = random.Random(seed)
+    compared = [entry for entry in groups.values()
+                if len(entry.baseline) >= min_samples and len(entry.candidate) >= min_samples]
+    tail = lambda values: percentile(sorted(values), TAIL_PERCENTILE)
+    for entry in compared:
+        # Paired test only when most of the samples could be paired
+        pairs = entry.pairs if len(entry.pairs) >= max(min_samples, len(entry.baseline) / 2) else None
+        if pairs:
+            entry.test = "wilcoxon"
+            entry.p_value = wilcoxon_signed_rank([cand - base for base, cand in pairs])
+        else:
+            entry.test = "mann-whitney"
+            entry.p_value = mann_whitney_u(entry.baseline, entry.candidate)
+        entry.median_change = relative_change(entry.baseline_median, entry.candidate_median)
+        entry.tail_change = relative_change(entry.baseline_tail, entry.candidate_tail)
+        entry.median_ci = bootstrap_ci(entry.baseline, entry.candidate, median, pairs, resamples, confidence, rng)
+        entry.tail_ci = bootstrap_ci(entry.baseline, entry.candidate, tail, pairs, resamples, confidence, rng)
+
+    for entry, adjusted in zip(compared, holm_adjust([entry.p_value for entry in compared])):
+        entry.adjusted_p = adjusted
+        significant = adjusted < alpha
+        slower = (entry.median_change > threshold_percent and entry.median_ci[0] > 0) or \
+                 (entry.tail_change > threshold_percent and entry.tail_ci[0] > 0)
+        faster = (entry.median_change < -threshold_percent and entry.median_ci[1] < 0)
+        entry.regression = significant and slower
+        entry.improvement = significant and faster and not entry.regression
+
+    compared.sort(key=lambda entry: (not entry.regression, -entry.severity))
+    return compared
+
+
+def format_change(change: float, interval: Tuple[float, float]) -> str:
+    return f"{change:+.1f}% [{interval[0]:+.1f}, {interval[1]:+.1f}]"
+
+
+def format_comparison_report(comparisons: List[GroupComparison]) -> List[str]:
+    """Ranked text report for the console."""
+    lines = [f"   {'':<2}{'group':<34}{'n (base/cand)':>14}  {'median':>17}  {'median Δ [CI]':<26}"
+             f"{f'p{TAIL_PERCENTILE} Δ [CI]':<26}{'p (Holm)':>9}  success"]
+    for entry in comparisons:
+        marker = "❌" if entry.regression else "✅" if entry.improvement else "  "
+        lines.append(
+            f"   {marker:<2}{entry.label[:34]:<34}{f'{len(entry.baseline)}/{len(entry.candidate)}':>14}  "
+            f"{f'{entry.baseline_median:.1f}s → {entry.candidate_median:.1f}s':>17}  "
+            f"{format_change(entry.median_change, entry.median_ci):<26}"
+            f"{format_change(entry.tail_change, entry.tail_ci):<26}{entry.adjusted_p:>9.4f}  "
+            f"{entry.baseline_success_rate:.0f}% → {entry.candidate_success_rate:.0f}%")
+    return lines
+
+
+def write_comparison_html(comparisons: List[GroupComparison], filename: str, settings: Dict[str, Any]) -> None:
+    """Ranked regression report as a standalone HTML page."""
+    regressions = sum(1 for entry in comparisons if entry.regression)
+    rows = []
+    for entry in comparisons:
+        status = "regression" if entry.regression else "improvement" if entry.improvement else ""
+        rows.append(f"""
+            <tr class="{status}">
+                <td>{'❌' if entry.regression else '✅' if entry.improvement else ''}</td>
+                <td>{html.escape(entry.label)}</td>
+                <td>{len(entry.baseline)} / {len(entry.candidate)}</td>
+                <td>{entry.baseline_median:.2f}s → {entry.candidate_median:.2f}s</td>
+                <td>{html.escape(format_change(entry.median_change, entry.median_ci))}</td>
+                <td>{entry.baseline_tail:.2f}s → {entry.candidate_tail:.2f}s</td>
+                <td>{html.escape(format_change(entry.tail_change, entry.tail_ci))}</td>
+                <td>{entry.test}</td>
+                <td>{entry.adjusted_p:.4f}</td>
+                <td>{entry.baseline_success_rate:.0f}% → {entry.candidate_success_rate:.0f}%</td>
+            </tr>""")
+    with open(filename, "w", encoding="utf-8") as f:
+        f.write(f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <title>AIGC Preview API Regression Report</title>
+    <style>
+        body {{ font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif; margin: 20px; background: #f5f5f5; }}
+        .header {{ background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); color: white; padding: 20px 30px; border-radius: 10px; margin-bottom: 20px; }}
+        table {{ width: 100%; border-collapse: collapse; background: white; border-radius: 10px; overflow: hidden; box-shadow: 0 2px 10px rgba(0,0,0,0.1); }}
+        th {{ background: #f8f9fa; text-align: left; padding: 10px; }}
+        td {{ padding: 8px 10px; border-bottom: 1px solid #eee; font-variant-numeric: tabular-nums; }}
+        tr.regression {{ background: #f8d7da; }}
+        tr.improvement {{ background: #d4edda; }}
+    </style>
+</head>
+<body>
+    <div class="header">
+        <h1>📉 Regression Report</h1>
+        <p>Baseline: <strong>{html.escape(settings['baseline'])}</strong> → Candidate: <strong>{html.escape(settings['candidate'])}</strong></p>
+        <p>{regressions} significant slowdowns beyond +{settings['threshold_percent']}%
+           (α = {settings['alpha']}, Holm-adjusted; {settings['confidence'] * 100:.0f}% bootstrap CIs from {settings['resamples']} resamples)</p>
+    </div>
+    <table>
+        <thead>
+            <tr><th></th><th>Group</th><th>n (base / cand)</th><th>Median</th><th>Median Δ [CI]</th>
+                <th>p{TAIL_PERCENTILE}</th><th>p{TAIL_PERCENTILE} Δ [CI]</th><th>Test</th><th>p (Holm)</th><th>Success</th></tr>
+        </thead>
+        <tbody>{''.join(rows)}
+        </tbody>
+    </table>
+</body>
+</html>
+""")
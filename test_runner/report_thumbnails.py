@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Thumbnails for the HTML report of the AIGC Preview API Test Suite Runner
+
+The report used to embed every input and processed image at full
+resolution, so a report with a few hundred tests made the browser pull
+gigabytes of AI output. Instead, each distinct image URL is fetched once,
+downsized to a small WebP (or JPEG) thumbnail in a process pool, and stored
+next to the report; the gallery shows the thumbnail and links to the
+full-size original. Originals are streamed to temporary files and handed to
+the renderers by path, with a bounded number of downloads in flight, so
+memory doesn't grow with the number or size of the images.
+
+Thumbnails are content-addressed (named after the SHA-256 of the original
+image), so the same image behind different URLs or rows is rendered once.
+`index.json` in the thumbnail directory maps URLs to content digests, so
+re-generating a report reuses existing thumbnails without fetching again.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, wait, FIRST_COMPLETED
+from typing import Dict, List, Any, Optional, Iterable, Tuple
+
+import requests
+
+try:
+    from PIL import Image, ImageOps, features
+except ImportError:  # Pillow is optional; without it the report links the original images
+    Image = None
+
+THUMBNAIL_FORMATS = ("webp", "jpeg")
+INDEX_FILE = "index.json"
+
+
+def render_thumbnail(source_path: str, path: str, size: int, image_format: str, quality: int) -> int:
+    """Downsize the image file at `source_path` to fit in `size`×`size` and write it to `path`; returns the thumbnail size.
+
+    Runs in a worker process, so it only takes picklable arguments (a path, not the image bytes).
+    """
+    with Image.open(source_path) as source:
+        source.draft("RGB", (size, size))  # JPEG: decode at reduced scale
+        image = ImageOps.exif_transpose(source)
+        image.thumbnail((size, size))
+        if image_format == "jpeg" or image.mode not in ("RGB", "RGBA"):
+            image = image.convert("RGBA" if image_format == "webp" and "A" in image.getbands() else "RGB")
+        temporary = f"{path}.{os.getpid()}.tmp"
+        image.save(temporary, format=image_format.upper(), quality=quality)
+    os.replace(temporary, path)
+    return os.path.getsize(path)
+
+
+class ThumbnailStore:
+    """Content-addressed thumbnail directory shared by every report generated next to it."""
+
+    def __init__(self, directory: str, size: int = 160, image_format: str = "webp", quality: int = 80,
+                 workers: Optional[int] = None, fetch_concurrency: int = 16, timeout: float = 30,
+                 max_image_mb: float = 50):
+        if image_format not in THUMBNAIL_FORMATS:
+            raise ValueError(f"Unknown thumbnail format '{image_format}' (expected {', '.join(THUMBNAIL_FORMATS)})")
+        if image_format == "webp" and Image is not None and not features.check("webp"):
+            image_format = "jpeg"  # Pillow built without libwebp
+        self.directory = directory
+        self.size = size
+        self.image_format = image_format
+        self.quality = quality
+        self.workers = workers
+        self.fetch_concurrency = max(1, fetch_concurrency)
+        self.timeout = timeout
+        self.max_bytes = int(max_image_mb * 1024 * 1024)
+        self.index: Dict[str, str] = {}
+        self.stats = {"images": 0, "reused": 0, "created": 0, "failed": 0, "fetched_bytes": 0}
+        self._local = threading.local()
+
+    @classmethod
+    def from_config(cls, config: Dict, report_dir: str) -> "ThumbnailStore":
+        """Build the store from the optional `html_report` config section; the directory is relative to the report."""
+        settings = config.get("html_report", {})
+        return cls(
+            os.path.join(report_dir, settings.get("thumbnail_dir", "report_thumbnails")),
+            size=settings.get("thumbnail_size", 160),
+            image_format=settings.get("thumbnail_format", "webp"),
+            quality=settings.get("thumbnail_quality", 80),
+            workers=settings.get("workers"),
+            fetch_concurrency=settings.get("fetch_concurrency", 16),
+            timeout=settings.get("timeout_seconds", 30),
+            max_image_mb=settings.get("max_image_mb", 50),
+        )
+
+    @property
+    def available(self) -> bool:
+        return Image is not None
+
+    def thumbnail_path(self, digest: str) -> str:
+        extension = "jpg" if self.image_format == "jpeg" else self.image_format
+        return os.path.join(self.directory, digest[:2], f"{digest}-{self.size}.{extension}")
+
+    def _session(self) -> requests.Session:
+        if not hasattr(self._local, "session"):
+            self._local.session = requests.Session()
+        return self._local.session
+
+    def _load_index(self) -> None:
+        try:
+            with open(os.path.join(self.directory, INDEX_FILE), encoding="utf-8") as f:
+                self.index = json.load(f)
+        except (OSError, ValueError):
+            self.index = {}
+
+    def _save_index(self) -> None:
+        path = os.path.join(self.directory, INDEX_FILE)
+        with open(f"{path}.tmp", "w", encoding="utf-8") as f:
+            json.dump(self.index, f, indent=0, sort_keys=True)
+        os.replace(f"{path}.tmp", path)
+
+    def fetch(self, url: str) -> Optional[Tuple[str, str, int]]:
+        """Stream the original image to a temporary file, hashing it on the way.
+
+        Returns (SHA-256 digest, temporary path, size), or None if it can't be downloaded (or is over `max_image_mb`).
+        """
+        fd, temporary = tempfile.mkstemp(prefix="fetch-", suffix=".tmp", dir=self.directory)
+        try:
+            with os.fdopen(fd, "wb") as f, self._session().get(url, timeout=self.timeout, stream=True) as response:
+                if response.status_code == 200:
+                    digest, size = hashlib.sha256(), 0
+                    for chunk in response.iter_content(64 * 1024):
+                        size += len(chunk)
+                        if size > self.max_bytes:
+                            break
+                        digest.update(chunk)
+                        f.write(chunk)
+                    else:
+                        return digest.hexdigest(), temporary, size
+        except (requests.exceptions.RequestException, OSError):
+            pass
+        os.remove(temporary)
+        return None
+
+    def build(self, urls: Iterable[str]) -> Dict[str, str]:
+        """Make sure every URL has a thumbnail; returns URL → thumbnail path for those that do."""
+        urls = list(dict.fromkeys(url for url in urls if url.startswith(("http://", "https://"))))
+        self.stats["images"] = len(urls)
+        if not urls or not self.available:
+            return {}
+        os.makedirs(self.directory, exist_ok=True)
+        self._load_index()
+
+        pending = []
+        for url in urls:
+            digest = self.index.get(url)
+            if digest and os.path.exists(self.thumbnail_path(digest)):
+                self.stats["reused"] += 1
+            else:
+                pending.append(url)
+
+        if pending:
+            # Fetching is I/O bound (threads); decoding and resizing is CPU bound (processes)
+            rendering: Dict[str, Tuple[Any, str]] = {}  # digest → (render future, temporary original)
+            remaining = iter(pending)
+            with ThreadPoolExecutor(max_workers=min(self.fetch_concurrency, len(pending)),
+                                    thread_name_prefix="aigc-thumbs") as fetchers, \
+                    ProcessPoolExecutor(max_workers=self.workers) as renderers:
+                # Only a window of downloads is submitted at a time, refilled as they finish
+                fetching = {}
+                for url in remaining:
+                    fetching[fetchers.submit(self.fetch, url)] = url
+                    if len(fetching) >= self.fetch_concurrency * 2:
+                        break
+                while fetching:
+                    done, _ = wait(fetching, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        url = fetching.pop(future)
+                        next_url = next(remaining, None)
+                        if next_url is not None:
+                            fetching[fetchers.submit(self.fetch, next_url)] = next_url
+                        self._render(url, future.result(), rendering, renderers)
+                for digest, (future, temporary) in rendering.items():
+                    try:
+                        future.result()
+                        self.stats["created"] += 1
+                    except Exception:
+                        # Not an image Pillow can read: forget it, the report links the original
+                        for url in [url for url, d in self.index.items() if d == digest]:
+                            del self.index[url]
+                            self.stats["failed"] += 1
+                    finally:
+                        os.remove(temporary)
+            self._save_index()
+
+        return {url: self.thumbnail_path(self.index[url]) for url in urls if url in self.index}
+
+
+    def _render(self, url: str, fetched: Optional[Tuple[str, str, int]], rendering: Dict[str, Tuple[Any, str]],
+                renderers: ProcessPoolExecutor) -> None:
+        """Queue the thumbnail of one downloaded original, unless its content was already seen."""
+        if fetched is None:
+            self.stats["failed"] += 1
+            return
+        digest, temporary, size = fetched
+        self.stats["fetched_bytes"] += size
+        path = self.thumbnail_path(digest)
+        if os.path.exists(path) or digest in rendering:
+            os.remove(temporary)
+            if os.path.exists(path):
+                self.stats["reused"] += 1  # same image as one rendered for another URL
+        else:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            rendering[digest] = (renderers.submit(render_thumbnail, temporary, path, self.size, self.image_format,
+                                                  self.quality), temporary)
+        self.index[url] = digest
+
+
+def result_image_urls(result: Dict) -> List[str]:
+    """The input and processed image URLs a report row shows."""
+    urls = []
+    for column in ("image_urls", "processed_image_urls"):
+        urls.extend(url.strip() for url in (result.get(column) or "").split("; ") if url.strip())
+    return urls
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Content-addressed response cache for the AIGC Preview API Test Suite Runner
+
+Successful API responses are stored in a SQLite file keyed by a SHA-256 of
+the request URL and the canonical JSON of the request body, so re-running a
+suite (report tweaks, description-only runs, CI re-runs) doesn't spend GPU
+time on requests whose answer is already known. Entries expire after a TTL
+and the least recently used ones are evicted once the cache grows past its
+size limit.
+
+Modes (`--cache`):
+- `read`   serve cached responses, call the API on a miss and store the result
+- `write`  always call the API and store (refresh) every successful response
+- `off`    no caching (default)
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Any, Optional, Iterator
+
+CACHE_MODES = ("read", "write", "off")
+
+
+def cache_key(url: str, body: Dict) -> str:
+    """SHA-256 over the URL and the body with sorted keys and no insignificant whitespace."""
+    canonical = json.dumps(body, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(f"POST {url}\n{canonical}".encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """SQLite-backed response store with TTL expiry and size-bounded LRU eviction."""
+
+    def __init__(self, path: str, mode: str = "read", ttl_seconds: Optional[float] = 7 * 24 * 3600,
+                 max_size_mb: float = 256):
+        if mode not in CACHE_MODES:
+            raise ValueError(f"Unknown cache mode '{mode}' (expected {', '.join(CACHE_MODES)})")
+        self.path = path
+        self.mode = mode
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = int(max_size_mb * 1024 * 1024)
+        self.hits = 0
+        self.misses = 0
+        self.stored = 0
+        self.evicted = 0
+        self._lock = threading.Lock()
+        if self.mode != "off":
+            with self._connect() as db:
+                db.execute("PRAGMA journal_mode=WAL")
+                db.execute("""
+                    CREATE TABLE IF NOT EXISTS responses (
+                        key TEXT PRIMARY KEY,
+                        url TEXT NOT NULL,
+                        response TEXT NOT NULL,
+                        size INTEGER NOT NULL,
+                        created_at REAL NOT NULL,
+                        last_used REAL NOT NULL
+                    )
+                """)
+                db.execute("CREATE INDEX IF NOT EXISTS responses_last_used ON responses (last_used)")
+
+    @classmethod
+    def from_config(cls, config: Dict, mode: Optional[str] = None) -> Optional["ResponseCache"]:
+        """Build the cache from the optional `response_cache` config section (None when off)."""
+        settings = config.get("response_cache", {})
+        mode = mode or settings.get("mode", "off")
+        if mode == "off":
+            return None
+        ttl_hours = settings.get("ttl_hours", 168)
+        return cls(
+            settings.get("path", "response_cache.db"),
+            mode=mode,
+            ttl_seconds=ttl_hours * 3600 if ttl_hours else None,
+            max_size_mb=settings.get("max_size_mb", 256),
+        )
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        db = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        try:
+            yield db
+        finally:
+            db.close()
+
+    @property
+    def readable(self) -> bool:
+        return self.mode == "read"
+
+    @property
+    def writable(self) -> bool:
+        return self.mode in ("read", "write")
+
+    def get(self, url: str, body: Dict) -> Optional[Dict[str, Any]]:
+        """Cached response data for this request, or None on a miss or an expired entry."""
+        if not self.readable:
+            return None
+        key = cache_key(url, body)
+        now = time.time()
+        with self._connect() as db:
+            row = db.execute("SELECT response, created_at FROM responses WHERE key = ?", (key,)).fetchone()
+            if row and self.ttl_seconds and now - row[1] > self.ttl_seconds:
+                db.execute("DELETE FROM responses WHERE key = ?", (key,))
+                row = None
+            if row:
+                db.execute("UPDATE responses SET last_used = ? WHERE key = ?", (now, key))
+        with self._lock:
+            if row is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return json.loads(row[0]) if row else None
+
+    def put(self, url: str, body: Dict, response_data: Dict) -> None:
+        """Store a successful response, evicting the least recently used entries if over the size limit."""
+        if not self.writable:
+            return
+        payload = json.dumps(response_data, ensure_ascii=False)
+        now = time.time()
+        with self._connect() as db:
+            db.execute(
+                "INSERT OR REPLACE INTO responses (key, url, response, size, created_at, last_used) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (cache_key(url, body), url, payload, len(payload), now, now),
+            )
+            evicted = self._evict(db, now)
+        with self._lock:
+            self.stored += 1
+            self.evicted += evicted
+
+    def _evict(self, db: sqlite3.Connection, now: float) -> int:
+        evicted = 0
+        if self.ttl_seconds:
+            evicted += db.execute("DELETE FROM responses WHERE created_at < ?", (now - self.ttl_seconds,)).rowcount
+        total = db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return evicted
+        db.execute("BEGIN IMMEDIATE")
+        for key, size in db.execute("SELECT key, size FROM responses ORDER BY last_used").fetchall():
+            if total <= self.max_bytes:
+                break
+            db.execute("DELETE FROM responses WHERE key = ?", (key,))
+            total -= size
+            evicted += 1
+        db.execute("COMMIT")
+        return evicted
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "stored": self.stored, "evicted": self.evicted}
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Crash-safe result journal for the AIGC Preview API Test Suite Runner
+
+Every finished test result is appended to a JSON Lines file and fsync'd
+before the runner moves on, so a killed process, OOM or node preemption
+loses at most the tests that were still in flight. A journal can be passed
+back with `--resume` to skip every test that is already recorded.
+"""
+
+import json
+import os
+from typing import Dict, List
+
+
+class ResultJournal:
+    """Append-only, fsync'd JSON Lines log of test results."""
+
+    def __init__(self, path: str):
+        self.path = path
+        # A crash can leave a partially written last line; start on a fresh line
+        needs_newline = False
+        if os.path.exists(path) and os.path.getsize(path) > 0:
+            with open(path, "rb") as f:
+                f.seek(-1, os.SEEK_END)
+                needs_newline = f.read(1) != b"\n"
+        self._file = open(path, "a", encoding="utf-8")
+        if needs_newline:
+            self._file.write("\n")
+            self._sync()
+
+    def append(self, result: Dict) -> None:
+        """Durably record one result before returning."""
+        self._file.write(json.dumps(result, ensure_ascii=False) + "\n")
+        self._sync()
+
+    def close(self) -> None:
+        if not self._file.closed:
+            self._file.close()
+
+    def _sync(self) -> None:
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    @staticmethod
+    def load(path: str) -> List[Dict]:
+        """Read all complete records, ignoring a torn or corrupt line left by a crash."""
+        records = []
+        # Binary, decoded per line: a torn last line can end inside a multibyte character
+        with open(path, "rb") as f:
+            for line_number, line in enumerate(f, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line.decode("utf-8"))
+                except (UnicodeDecodeError, json.JSONDecodeError):
+                    print(f"⚠️  Skipping unreadable journal line {line_number} in {path}")
+                    continue
+                if isinstance(record, dict) and record.get("test_id"):
+                    records.append(record)
+        return records
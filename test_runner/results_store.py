@@ -0,0 +1,360 @@
+#!/usr/bin/env python3
+"""
+Typed results store for the AIGC Preview API Test Suite Runner
+
+CSV files stringify every field and keep each run in its own file, so
+comparing runs means re-parsing dozens of CSVs. The results store keeps
+every run under its own run id with typed columns:
+
+- SQLite (default): one `results` table, indexed on `test_id`,
+  `pipeline_config_key`, `image_list_key` and `timestamp`, so cross-run
+  queries ("p95 duration of the 360 pipeline over the last 30 runs") read
+  only the rows and columns they need
+- Parquet (when pyarrow is installed): one file per run in a directory,
+  written in row groups of `batch_size` rows
+
+The columns most queries need (identifiers, keys, outcome, timings,
+counters) are stored typed; everything else in a result (names, URLs,
+extra dimensions, ...) is kept as a JSON object per row, so a stored run
+reproduces the original results exactly.
+"""
+
+import itertools
+import json
+import os
+import sqlite3
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, List, Tuple, Any, Optional, Iterable, Iterator
+
+from latency_stats import GroupedHistograms
+
+try:
+    import pyarrow
+    import pyarrow.parquet as parquet
+except ImportError:  # pyarrow is optional; without it only the SQLite store is available
+    pyarrow = None
+
+STORE_FORMATS = ("sqlite", "parquet")
+
+# Typed columns: (name, type); the type is one of TEXT, INTEGER, REAL, BOOLEAN
+STORE_COLUMNS: Tuple[Tuple[str, str], ...] = (
+    ("test_id", "TEXT"),
+    ("test_number", "INTEGER"),
+    ("timestamp", "TEXT"),
+    ("image_list_key", "TEXT"),
+    ("location_prompt_key", "TEXT"),
+    ("person_prompt_key", "TEXT"),
+    ("pipeline_config_key", "TEXT"),
+    ("image_count", "INTEGER"),
+    ("success", "BOOLEAN"),
+    ("duration_seconds", "REAL"),
+    ("error_class", "TEXT"),
+    ("attempts", "INTEGER"),
+    ("response_source", "TEXT"),
+    ("response_status", "TEXT"),
+    ("images_requested", "INTEGER"),
+    ("processed_images_count", "INTEGER"),
+    ("connections_opened", "INTEGER"),
+    ("connections_reused", "INTEGER"),
+    ("bytes_sent", "INTEGER"),
+    ("bytes_received", "INTEGER"),
+    ("payload_bytes", "INTEGER"),
+    ("dns_ms", "REAL"),
+    ("connect_ms", "REAL"),
+    ("tls_ms", "REAL"),
+    ("upload_ms", "REAL"),
+    ("ttfb_ms", "REAL"),
+    ("download_ms", "REAL"),
+    ("json_decode_ms", "REAL"),
+)
+TYPED_COLUMNS = dict(STORE_COLUMNS)
+SUCCESS_INDEX = list(TYPED_COLUMNS).index("success")
+
+
+class ResultsStoreError(Exception):
+    """The store can't be opened, written or read."""
+
+
+def typed_value(value: Any, column_type: str) -> Tuple[Any, bool]:
+    """`value` converted to the column type, and whether converting it back gives the same value."""
+    if value is None:
+        return None, False
+    if value == "":
+        return ("", True) if column_type == "TEXT" else (None, False)
+    try:
+        if column_type == "BOOLEAN":
+            if isinstance(value, str):
+                return value.lower() == "true", value.lower() in ("true", "false")
+            return bool(value), isinstance(value, bool)
+        if column_type == "INTEGER":
+            return int(value), isinstance(value, int) or str(int(value)) == str(value)
+        if column_type == "REAL":
+            return float(value), True
+    except (TypeError, ValueError):
+        return None, False
+    return str(value), isinstance(value, str)
+
+
+def split_result(result: Dict[str, Any]) -> Tuple[List[Any], Dict[str, Any]]:
+    """Typed column values, and the fields that go into the JSON `extra` object."""
+    values = []
+    extra = {}
+    for name, column_type in STORE_COLUMNS:
+        if name not in result:
+            values.append(None)
+            continue
+        value, lossless = typed_value(result[name], column_type)
+        values.append(value)
+        if not lossless:
+            extra[name] = result[name]  # e.g. "" for a phase that was never reached
+    extra.update((key, value) for key, value in result.items() if key not in TYPED_COLUMNS)
+    return values, extra
+
+
+def join_result(values: Iterable[Any], extra: Dict[str, Any], columns: List[str]) -> Dict[str, Any]:
+    """Rebuild a result from its typed values and `extra`, in the run's original column order."""
+    fields = {name: value for (name, _), value in zip(STORE_COLUMNS, values) if value is not None}
+    fields.update(extra)
+    return {name: fields[name] for name in columns if name in fields}
+
+
+def new_run_id(existing: Iterable[str]) -> str:
+    """Timestamp run id, made unique among `existing`."""
+    base = datetime.now().strftime("%Y%m%d_%H%M%S")
+    existing = set(existing)
+    run_id = base
+    for suffix in itertools.count(2):
+        if run_id not in existing:
+            return run_id
+        run_id = f"{base}_{suffix}"
+
+
+def batches(results: Iterable[Dict], batch_size: int) -> Iterator[List[Dict]]:
+    iterator = iter(results)
+    while True:
+        batch = list(itertools.islice(iterator, batch_size))
+        if not batch:
+            return
+        yield batch
+
+
+class SqliteResultsStore:
+    """All runs in one SQLite file, with typed, indexed columns."""
+
+    format = "sqlite"
+
+    def __init__(self, path: str, batch_size: int = 500):
+        self.path = path
+        self.batch_size = max(1, batch_size)
+        columns = ",\n".join(f"    {name} {column_type}" for name, column_type in STORE_COLUMNS)
+        try:
+            with self._connect() as db:
+                db.execute("PRAGMA journal_mode=WAL")
+                db.execute("""
+                    CREATE TABLE IF NOT EXISTS runs (
+                        run_id TEXT PRIMARY KEY,
+                        started_at TEXT NOT NULL,
+                        info TEXT NOT NULL,
+                        columns TEXT NOT NULL,
+                        test_count INTEGER NOT NULL DEFAULT 0,
+                        successful INTEGER NOT NULL DEFAULT 0
+                    )
+                """)
+                db.execute(f"""
+                    CREATE TABLE IF NOT EXISTS results (
+                        run_id TEXT NOT NULL,
+                        position INTEGER NOT NULL,
+{columns},
+                        extra TEXT NOT NULL,
+                        PRIMARY KEY (run_id, position)
+                    )
+                """)
+                for column in ("test_id", "pipeline_config_key", "image_list_key", "timestamp"):
+                    db.execute(f"CREATE INDEX IF NOT EXISTS results_{column} ON results ({column}, run_id)")
+        except sqlite3.Error as e:
+            raise ResultsStoreError(f"Can't open results store {path}: {e}")
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        db = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        try:
+            yield db
+        finally:
+            db.close()
+
+    def write_run(self, results: Iterable[Dict], info: Optional[Dict] = None) -> str:
+        """Store `results` under a new run id, one transaction per batch; returns the run id."""
+        results = iter(results)
+        first = next(results, None)
+        columns = list(first.keys()) if first else []
+        placeholders = ", ".join("?" for _ in range(len(STORE_COLUMNS) + 3))
+        try:
+            with self._connect() as db:
+                db.execute("BEGIN IMMEDIATE")
+                run_id = new_run_id(row[0] for row in db.execute("SELECT run_id FROM runs"))
+                db.execute("INSERT INTO runs (run_id, started_at, info, columns) VALUES (?, ?, ?, ?)",
+                           (run_id, datetime.now().isoformat(), json.dumps(info or {}), json.dumps(columns)))
+                db.execute("COMMIT")
+                position = 0
+                successful = 0
+                for batch in batches(itertools.chain([first] if first else [], results), self.batch_size):
+                    rows = []
+                    for result in batch:
+                        values, extra = split_result(result)
+                        rows.append([run_id, position] + values + [json.dumps(extra, ensure_ascii=False)])
+                        successful += bool(values[SUCCESS_INDEX])
+                        position += 1
+                    db.execute("BEGIN")
+                    db.executemany(f"INSERT INTO results (run_id, position, {', '.join(TYPED_COLUMNS)}, extra) "
+                                   f"VALUES ({placeholders})", rows)
+                    db.execute("UPDATE runs SET test_count = ?, successful = ? WHERE run_id = ?",
+                               (position, successful, run_id))
+                    db.execute("COMMIT")
+        except sqlite3.Error as e:
+            raise ResultsStoreError(f"Can't write to results store {self.path}: {e}")
+        return run_id
+
+    def runs(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Stored runs, newest first."""
+        query = "SELECT run_id, started_at, info, test_count, successful FROM runs ORDER BY started_at DESC, run_id DESC"
+        with self._connect() as db:
+            rows = db.execute(query + (" LIMIT ?" if limit else ""), (limit,) if limit else ()).fetchall()
+        return [{"run_id": run_id, "started_at": started_at, "info": json.loads(info),
+                 "test_count": test_count, "successful": successful}
+                for run_id, started_at, info, test_count, successful in rows]
+
+    def iter_results(self, run_id: str) -> Iterator[Dict[str, Any]]:
+        """The results of a run in their original order and column layout, streamed."""
+        with self._connect() as db:
+            row = db.execute("SELECT columns FROM runs WHERE run_id = ?", (run_id,)).fetchone()
+            if row is None:
+                raise ResultsStoreError(f"No run '{run_id}' in {self.path}")
+            columns = json.loads(row[0])
+            cursor = db.execute(f"SELECT {', '.join(TYPED_COLUMNS)}, extra FROM results "
+                                f"WHERE run_id = ? ORDER BY position", (run_id,))
+            for row in cursor:
+                values = list(row[:-1])
+                if values[SUCCESS_INDEX] is not None:
+                    values[SUCCESS_INDEX] = bool(values[SUCCESS_INDEX])  # stored as 0/1
+                yield join_result(values, json.loads(row[-1]), columns)
+
+    def duration_histograms(self, last_runs: int = 30, pipeline: Optional[str] = None,
+                            successful_only: bool = True) -> GroupedHistograms:
+        """Duration histograms per pipeline over the newest `last_runs` runs."""
+        run_ids = [run["run_id"] for run in self.runs(last_runs)]
+        groups = GroupedHistograms()
+        if not run_ids:
+            return groups
+        query = (f"SELECT pipeline_config_key, duration_seconds FROM results "
+                 f"WHERE run_id IN ({', '.join('?' for _ in run_ids)}) AND duration_seconds IS NOT NULL "
+                 f"AND response_source IS NOT 'cache'")
+        parameters = list(run_ids)
+        if successful_only:
+            query += " AND success = 1"
+        if pipeline:
+            query += " AND pipeline_config_key = ?"
+            parameters.append(pipeline)
+        with self._connect() as db:
+            for key, duration in db.execute(query, parameters):
+                groups.record(key, duration)
+        return groups
+
+
+class ParquetResultsStore:
+    """One Parquet file per run in a directory (requires pyarrow)."""
+
+    format = "parquet"
+
+    def __init__(self, path: str, batch_size: int = 500):
+        if pyarrow is None:
+            raise ResultsStoreError("The Parquet results store needs pyarrow (pip install pyarrow)")
+        self.path = path
+        self.batch_size = max(1, batch_size)
+        self.schema = pyarrow.schema(
+            [(name, {"TEXT": pyarrow.string(), "INTEGER": pyarrow.int64(), "REAL": pyarrow.float64(),
+                     "BOOLEAN": pyarrow.bool_()}[column_type]) for name, column_type in STORE_COLUMNS]
+            + [("extra", pyarrow.string())]
+        )
+        os.makedirs(path, exist_ok=True)
+
+    def _file(self, run_id: str) -> str:
+        return os.path.join(self.path, f"{run_id}.parquet")
+
+    def write_run(self, results: Iterable[Dict], info: Optional[Dict] = None) -> str:
+        """Store `results` as a new run file, one row group per batch; returns the run id."""
+        results = iter(results)
+        first = next(results, None)
+        run_id = new_run_id(run["run_id"] for run in self.runs())
+        metadata = {"run_id": run_id, "started_at": datetime.now().isoformat(), "info": info or {},
+                    "columns": list(first.keys()) if first else []}
+        schema = self.schema.with_metadata({"aigc_run": json.dumps(metadata)})
+        temporary = self._file(run_id) + ".tmp"
+        try:
+            with parquet.ParquetWriter(temporary, schema) as writer:
+                for batch in batches(itertools.chain([first] if first else [], results), self.batch_size):
+                    columns = [[] for _ in range(len(STORE_COLUMNS) + 1)]
+                    for result in batch:
+                        values, extra = split_result(result)
+                        for column, value in zip(columns, values + [json.dumps(extra, ensure_ascii=False)]):
+                            column.append(value)
+                    writer.write_table(pyarrow.Table.from_arrays(
+                        [pyarrow.array(column, type=field.type) for column, field in zip(columns, schema)],
+                        schema=schema))
+            os.replace(temporary, self._file(run_id))
+        except (OSError, pyarrow.ArrowException) as e:
+            raise ResultsStoreError(f"Can't write to results store {self.path}: {e}")
+        return run_id
+
+    def _metadata(self, filename: str) -> Dict[str, Any]:
+        schema = parquet.read_schema(os.path.join(self.path, filename))
+        return json.loads(schema.metadata[b"aigc_run"])
+
+    def runs(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Stored runs, newest first."""
+        runs = []
+        for filename in os.listdir(self.path):
+            if filename.endswith(".parquet"):
+                metadata = self._metadata(filename)
+                file = parquet.ParquetFile(os.path.join(self.path, filename))
+                successful = file.read(columns=["success"]).column("success").to_pylist().count(True)
+                runs.append({"run_id": metadata["run_id"], "started_at": metadata["started_at"],
+                             "info": metadata["info"], "test_count": file.metadata.num_rows,
+                             "successful": successful})
+        runs.sort(key=lambda run: (run["started_at"], run["run_id"]), reverse=True)
+        return runs[:limit] if limit else runs
+
+    def iter_results(self, run_id: str) -> Iterator[Dict[str, Any]]:
+        """The results of a run in their original order and column layout, streamed one row group at a time."""
+        if not os.path.exists(self._file(run_id)):
+            raise ResultsStoreError(f"No run '{run_id}' in {self.path}")
+        columns = self._metadata(f"{run_id}.parquet")["columns"]
+        for batch in parquet.ParquetFile(self._file(run_id)).iter_batches(batch_size=self.batch_size):
+            for row in batch.to_pylist():
+                extra = json.loads(row.pop("extra"))
+                yield join_result(row.values(), extra, columns)
+
+    def duration_histograms(self, last_runs: int = 30, pipeline: Optional[str] = None,
+                            successful_only: bool = True) -> GroupedHistograms:
+        """Duration histograms per pipeline over the newest `last_runs` runs."""
+        groups = GroupedHistograms()
+        for run in self.runs(last_runs):
+            table = parquet.read_table(
+                self._file(run["run_id"]),
+                columns=["pipeline_config_key", "duration_seconds", "success", "response_source"])
+            for key, duration, success, source in zip(*(column.to_pylist() for column in table.columns)):
+                if duration is None or source == "cache" or (successful_only and not success):
+                    continue
+                if pipeline is None or key == pipeline:
+                    groups.record(key, duration)
+        return groups
+
+
+def open_results_store(path: str, store_format: Optional[str] = None, batch_size: int = 500):
+    """Open the store at `path`; the format defaults to Parquet for `.parquet` paths and SQLite otherwise."""
+    store_format = store_format or ("parquet" if path.endswith(".parquet") else "sqlite")
+    if store_format not in STORE_FORMATS:
+        raise ResultsStoreError(f"Unknown results store format '{store_format}' (expected {', '.join(STORE_FORMATS)})")
+    if store_format == "parquet":
+        return ParquetResultsStore(path, batch_size)
+    return SqliteResultsStore(path, batch_size)
@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Retry policy for the AIGC Preview API Test Suite Runner
+
+Decides whether and when a failed API attempt is retried:
+- failures are classified from the status code and the error shapes in
+  `errors.md`; deterministic client errors (4xx other than 429, e.g.
+  "No image URLs or base64 images provided") are never retried
+- retries wait with exponential backoff and full jitter
+- a global retry budget caps retries at a percentage of all requests, so a
+  failing service doesn't get hit with (max_retries + 1) × the load
+- a per-host circuit breaker fails tests fast once the API is clearly down,
+  instead of waiting out a full timeout on every remaining test
+"""
+
+import json
+import random
+import threading
+import time
+from typing import Dict, Any, Optional
+from urllib.parse import urlsplit
+
+
+class FailureClass:
+    """A kind of failed attempt and how the retry policy treats it."""
+
+    def __init__(self, name: str, retryable: bool, trips_breaker: bool):
+        self.name = name
+        self.retryable = retryable
+        self.trips_breaker = trips_breaker
+
+    def __repr__(self) -> str:
+        return f"FailureClass({self.name!r})"
+
+
+# Server didn't answer in time / couldn't be reached
+TIMEOUT = FailureClass("timeout", retryable=True, trips_breaker=True)
+CONNECTION = FailureClass("connection", retryable=True, trips_breaker=True)
+# 5xx responses
+SERVER_ERROR = FailureClass("server_error", retryable=True, trips_breaker=True)
+PROCESSING_TIMEOUT = FailureClass("processing_timeout", retryable=True, trips_breaker=True)
+UNAVAILABLE = FailureClass("unavailable", retryable=True, trips_breaker=True)
+# 429: retried after Retry-After / backoff; the rate limiter deals with the load
+THROTTLED = FailureClass("throttled", retryable=True, trips_breaker=False)
+# 4xx: the same request will fail the same way again
+VALIDATION = FailureClass("validation", retryable=False, trips_breaker=False)
+AUTH = FailureClass("auth", retryable=False, trips_breaker=False)
+NOT_FOUND = FailureClass("not_found", retryable=False, trips_breaker=False)
+CLIENT_ERROR = FailureClass("client_error", retryable=False, trips_breaker=False)
+# Anything raised by the runner itself (e.g. an unparseable 200 body)
+UNEXPECTED = FailureClass("unexpected", retryable=True, trips_breaker=False)
+
+# `detail` messages of the AIGC Preview API that describe a bad request
+VALIDATION_DETAILS = ("no image urls", "too many images", "invalid base64", "must be", "missing required")
+
+
+def error_detail(body: str) -> str:
+    """The `detail` (AIGC API) or `message` (Main API) of an error body, or the raw body."""
+    try:
+        data = json.loads(body)
+    except ValueError:
+        return body
+    if isinstance(data, dict):
+        for key in ("detail", "message"):
+            if isinstance(data.get(key), str):
+                return data[key]
+    return body
+
+
+def classify_response(status: int, body: str) -> FailureClass:
+    """Classify a non-200 response."""
+    if status == 429:
+        return THROTTLED
+    if status in (401, 403):
+        return AUTH
+    if status == 404:
+        return NOT_FOUND
+    if 400 <= status < 500:
+        detail = error_detail(body).lower()
+        if status in (400, 422) or any(marker in detail for marker in VALIDATION_DETAILS):
+            return VALIDATION
+        return CLIENT_ERROR
+    if status in (502, 503, 504):
+        return UNAVAILABLE
+    if "timeout" in error_detail(body).lower():
+        return PROCESSING_TIMEOUT
+    return SERVER_ERROR
+
+
+class CircuitBreaker:
+    """Closed → open after consecutive failures → half-open probe after `reset_seconds`."""
+
+    def __init__(self, failure_threshold: int = 5, reset_seconds: float = 60):
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_seconds = reset_seconds
+        self.state = "closed"
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self.times_opened = 0
+        self.rejected = 0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow(self, count_rejection: bool = True) -> bool:
+        """Whether an attempt may be sent now; in half-open state only one probe at a time.
+
+        With `count_rejection` False a refusal isn't counted as a failed-fast attempt (it is sent elsewhere).
+        """
+        with self._lock:
+            if self.state == "open" and time.monotonic() - self.opened_at >= self.reset_seconds:
+                self.state = "half-open"
+                self._probe_in_flight = False
+            if self.state == "closed":
+                return True
+            if self.state == "half-open" and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            if count_rejection:
+                self.rejected += 1
+            return False
+
+    def record(self, failure: Optional[FailureClass]) -> None:
+        """Record the outcome of an allowed attempt (None = the server answered fine)."""
+        with self._lock:
+            if failure is None or not failure.trips_breaker:
+                self.state = "closed"
+                self.consecutive_failures = 0
+                self._probe_in_flight = False
+                return
+            self.consecutive_failures += 1
+            if self.state == "half-open" or self.consecutive_failures >= self.failure_threshold:
+                if self.state != "open":
+                    self.times_opened += 1
+                self.state = "open"
+                self.opened_at = time.monotonic()
+                self._probe_in_flight = False
+
+    def retry_in(self) -> float:
+        """Seconds until the next probe is allowed."""
+        with self._lock:
+            return max(0.0, self.opened_at + self.reset_seconds - time.monotonic())
+
+
+class RetryPolicy:
+    """Backoff, retry budget and per-host circuit breakers shared by all workers."""
+
+    def __init__(self, base_delay: float = 5, max_delay: float = 60, budget_percent: float = 20,
+                 min_budget: int = 3, failure_threshold: int = 5, reset_seconds: float = 60,
+                 circuit_breaker: bool = True, seed: Optional[int] = None):
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.budget_percent = budget_percent
+        self.min_budget = min_budget
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.circuit_breaker = circuit_breaker
+        self.requests = 0
+        self.retries = 0
+        self.budget_denied = 0
+        self.breakers: Dict[str, CircuitBreaker] = {}
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config: Dict, circuit_breaker: bool = True) -> "RetryPolicy":
+        """Build the policy from `test_settings.retry_delay_seconds` and the optional `retry_policy` section."""
+        settings = config.get("retry_policy", {})
+        breaker = settings.get("circuit_breaker", {})
+        return cls(
+            base_delay=config.get("test_settings", {}).get("retry_delay_seconds", 5),
+            max_delay=settings.get("max_delay_seconds", 60),
+            budget_percent=settings.get("budget_percent", 20),
+            min_budget=settings.get("min_budget", 3),
+            failure_threshold=breaker.get("failure_threshold", 5),
+            reset_seconds=breaker.get("reset_seconds", 60),
+            circuit_breaker=circuit_breaker and breaker.get("enabled", True),
+        )
+
+    def breaker(self, url: str) -> Optional[CircuitBreaker]:
+        if not self.circuit_breaker:
+            return None
+        host = urlsplit(url).netloc
+        with self._lock:
+            if host not in self.breakers:
+                self.breakers[host] = CircuitBreaker(self.failure_threshold, self.reset_seconds)
+            return self.breakers[host]
+
+    def record_request(self) -> None:
+        """Count a first attempt towards the retry budget."""
+        with self._lock:
+            self.requests += 1
+
+    def acquire_retry(self) -> bool:
+        """Spend one retry from the budget; False when the budget is used up."""
+        with self._lock:
+            if self.retries + 1 > self.min_budget + self.requests * self.budget_percent / 100:
+                self.budget_denied += 1
+                return False
+            self.retries += 1
+            return True
+
+    def backoff(self, retry_number: int) -> float:
+        """Full-jitter exponential backoff before retry `retry_number` (1-based)."""
+        ceiling = min(self.max_delay, self.base_delay * 2 ** (retry_number - 1))
+        with self._lock:
+            return self._random.uniform(0, ceiling)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            breakers = list(self.breakers.values())
+            return {
+                "requests": self.requests,
+                "retries": self.retries,
+                "budget_denied": self.budget_denied,
+                "times_opened": sum(breaker.times_opened for breaker in breakers),
+                "rejected": sum(breaker.rejected for breaker in breakers),
+            }
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+History-aware dispatch order for the AIGC Preview API Test Suite Runner
+
+The test matrix is generated in config order, so with several requests in
+flight the slowest combinations (e.g. the 360 pipeline on multi-image
+lists) often start last and stretch the run's tail. `DurationModel`
+estimates every combination's duration from earlier result files, keyed on
+`pipeline_config_key`, `image_count` and which prompts are set, falling
+back to coarser keys (pipeline and image count, then pipeline alone, then
+all tests) and finally to `default_seconds` for combinations never seen.
+Only rows timed against the hosts under test count, so result files of
+other deployments or of the stand-in server don't skew the estimates.
+
+Orders:
+- `lpt`: longest processing time first, the classic makespan heuristic
+  for parallel machines
+- `smoke`: first the fastest combination of every pipeline config, so a
+  broken pipeline fails within minutes, then the rest longest first
+- `matrix`: config order (the default)
+"""
+
+import csv
+import glob
+import heapq
+import os
+from typing import Dict, List, Tuple, Any, Optional, Iterable
+
+from host_pool import normalize_url
+from latency_stats import LatencyHistogram
+
+SCHEDULE_MODES = ("lpt", "smoke", "matrix")
+
+
+def duration_keys(pipeline: str, image_count: Any, location: Any, person: Any) -> List[Tuple]:
+    """Lookup keys of one test, most specific first."""
+    image_count = str(image_count)
+    return [("exact", pipeline, image_count, bool(location), bool(person)),
+            ("images", pipeline, image_count),
+            ("pipeline", pipeline),
+            ("all",)]
+
+
+class DurationModel:
+    """Median duration of successful live tests per key, from earlier result CSVs."""
+
+    def __init__(self, default_seconds: float = 60.0, hosts: Optional[Iterable[str]] = None):
+        self.default_seconds = default_seconds
+        # Rows of other hosts, and rows that don't say which host they ran against, are skipped
+        self.hosts = {normalize_url(host) for host in hosts} if hosts is not None else None
+        self.histograms: Dict[Tuple, LatencyHistogram] = {}
+        self.samples = 0
+        self.files: List[str] = []
+
+    @classmethod
+    def from_config(cls, config: Dict, history: Optional[List[str]] = None,
+                    hosts: Optional[Iterable[str]] = None) -> "DurationModel":
+        """Model from `history` (files or glob patterns), default `scheduling.history` (newest files first)."""
+        settings = config.get("scheduling", {})
+        model = cls(settings.get("default_seconds", 60.0), hosts)
+        patterns = history if history is not None else [settings.get("history", "test_results_*.csv")]
+        files = sorted({path for pattern in patterns for path in glob.glob(pattern)},
+                       key=os.path.getmtime, reverse=True)
+        for path in files[:settings.get("max_history_files", 10)]:
+            model.load_csv(path)
+        return model
+
+    def load_csv(self, path: str) -> None:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                before = self.samples
+                for row in csv.DictReader(f):
+                    if row.get("success", "").lower() != "true" or row.get("response_source", "live") != "live":
+                        continue
+                    if self.hosts is not None and normalize_url(row.get("host") or "") not in self.hosts:
+                        continue
+                    try:
+                        duration = float(row["duration_seconds"])
+                    except (KeyError, ValueError):
+                        continue
+                    self.record(row.get("pipeline_config_key", ""), row.get("image_count", ""),
+                                row.get("location_prompt_value"), row.get("person_prompt_value"), duration)
+                if self.samples > before:
+                    self.files.append(path)
+        except (OSError, csv.Error):
+            pass  # an unreadable history file only makes the estimates coarser
+
+    def record(self, pipeline: str, image_count: Any, location: Any, person: Any, duration: float) -> None:
+        self.samples += 1
+        for key in duration_keys(pipeline, image_count, location, person):
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = LatencyHistogram()
+            histogram.record(duration)
+
+    def estimate(self, combination: Dict) -> float:
+        """Estimated seconds for a combination: the median of the most specific key with history."""
+        for key in duration_keys(combination["pipeline_config_key"], combination["image_count"],
+                                 combination["location_prompt_value"], combination["person_prompt_value"]):
+            histogram = self.histograms.get(key)
+            if histogram is not None and histogram.count:
+                return histogram.percentile(50)
+        return self.default_seconds
+
+
+def order_combinations(numbered: Iterable[Tuple[int, Dict]], model: DurationModel,
+                       mode: str) -> List[Tuple[int, Dict, float]]:
+    """(test number, combination, estimated seconds) in dispatch order; test numbers stay those of the matrix."""
+    items = [(number, combination, model.estimate(combination)) for number, combination in numbered]
+    if mode == "matrix":
+        return items
+    longest_first = sorted(items, key=lambda item: (-item[2], item[0]))
+    if mode == "lpt":
+        return longest_first
+    fastest = {}
+    for item in sorted(items, key=lambda item: (item[2], item[0])):
+        fastest.setdefault(item[1]["pipeline_config_key"], item)
+    smoke = sorted(fastest.values(), key=lambda item: (item[2], item[0]))
+    first = {item[0] for item in smoke}
+    return smoke + [item for item in longest_first if item[0] not in first]
+
+
+def estimated_makespan(durations: Iterable[float], workers: int) -> float:
+    """Wall time of dispatching `durations` in order to `workers` parallel slots (list scheduling)."""
+    slots = [0.0] * max(1, workers)
+    for duration in durations:
+        heapq.heappush(slots, heapq.heappop(slots) + duration)
+    return max(slots)
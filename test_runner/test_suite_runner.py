@@ -13,13 +13,50 @@ import time
 import itertools
 import sys
 import os
+from collections import defaultdict
 from datetime import datetime
-from typing import Dict, List, Tuple, Any, Optional
+from typing import Dict, List, Tuple, Any, Optional, Iterable, Iterator, Callable
 import traceback
 import html
+import asyncio
+import secrets
+import socket
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor, Future
+from urllib.parse import urlsplit
+
+from transport import HttpTransport, TransportResponse, TransportTimeout, TransportConnectionError, TIMING_PHASES
+from latency_stats import GroupedHistograms, LatencyHistogram, format_percentile_table
+from live_metrics import RunMetrics, MetricsServer, MetricsError, ProgressLine
+from rate_control import AdaptiveRateLimiter, THROTTLE_STATUSES, parse_retry_after
+from result_journal import ResultJournal
+from image_payloads import Base64PayloadCache, encode_request_body, cache_key_body, payload_stats
+from output_verification import OutputVerifier, output_image_urls, verification_columns
+from preflight import PreflightChecker, collect_image_urls, combination_urls
+from report_thumbnails import ThumbnailStore, result_image_urls
+from host_pool import HostPool, HostPoolError, PooledHost, parse_host_list
+from html_report import ReportSummary, PAGE_FILE_PATTERN, pages_directory, row_filter_values
+from regression_compare import compare_runs, format_comparison_report, write_comparison_html
+from response_cache import ResponseCache, CACHE_MODES
+from results_store import ResultsStoreError, open_results_store
+from retry_policy import RetryPolicy, classify_response, TIMEOUT, CONNECTION, UNEXPECTED
+from schedule_order import DurationModel, SCHEDULE_MODES, order_combinations, estimated_makespan
+from combination_matrix import TestMatrix
+from trace_events import TraceRecorder
+from video_pipeline import VideoPipeline, VideoRender, VideoApiError, COMPLETED, video_columns
+from webhook_receiver import WebhookReceiver, WebhookError
+from load_generator import ArrivalSchedule, LoadWindowStats, LoadScheduleError, parse_load_schedule, format_window_row
+from work_queue import (SqliteWorkQueue, WorkQueueServer, WorkQueueError, QUEUE_TOKEN_ENV,
+                        open_work_queue, parse_listen_address)
 
 class TestSuiteRunner:
-    def __init__(self, config_file: str = "test_suite_config.json", pause_after_tests: bool = False, generate_html: bool = False, host_url: str = None):
+    def __init__(self, config_file: str = "test_suite_config.json", pause_after_tests: bool = False, generate_html: bool = False, host_url: str = None,
+                 concurrency: int = 1, journal_file: str = None, resume_journal: str = None,
+                 matrix_mode: str = None, cache_mode: str = None, preflight_mode: str = None,
+                 verify_outputs: bool = False, thumbnails: bool = True, store_path: str = None, video: bool = False,
+                 video_host: str = None, webhooks: bool = False, metrics_address: str = None, verbose: bool = False,
+                 trace_file: str = None, schedule_mode: str = None, history: List[str] = None):
         """Initialize the test suite runner with configuration."""
         self.config_file = config_file
         self.config = None
@@ -31,7 +68,47 @@ class TestSuiteRunner:
         self.failed_tests = 0
         self.pause_after_tests = pause_after_tests
         self.generate_html = generate_html
+        self.thumbnails = thumbnails
         self.host_url = host_url
+        self.concurrency = max(1, concurrency)
+        self.transport = None
+        self.rate_limiter = None
+        self.retry_policy = None
+        self.cache_mode = cache_mode
+        self.response_cache = None
+        self.payload_cache = Base64PayloadCache()
+        self.preflight_mode = preflight_mode
+        self.preflight = None
+        self.verify_outputs = verify_outputs
+        self.output_verifier = None
+        self.fail_on_verification = True
+        self.video = video or bool(video_host) or webhooks
+        self.video_host = video_host
+        self.webhooks = webhooks
+        self.webhook_receiver = None
+        self.video_pipeline = None
+        self.fail_on_video = True
+        self.journal_file = resume_journal or journal_file
+        self.resume_journal = resume_journal
+        self.journal = None
+        self.recorded_test_ids = set()
+        self.matrix_mode = matrix_mode
+        self.store_path = store_path
+        self.matrix = None
+        self.work_queue = None
+        self.worker_id = None
+        self.queue_claims = set()
+        self.idle_poll_seconds = 1
+        self.metrics_address = metrics_address
+        self.verbose = verbose
+        self.live_metrics = RunMetrics()
+        self.metrics_server = None
+        self.progress = None
+        self.trace_file = trace_file
+        self.trace = None
+        self.host_pool = None
+        self.schedule_mode = schedule_mode
+        self.history = history
         
     def load_config(self) -> bool:
         """Load test configuration from JSON file."""
@@ -39,11 +116,17 @@ class TestSuiteRunner:
             with open(self.config_file, 'r') as f:
                 self.config = json.load(f)
             
-            # Override base_url if host_url is provided
-            if self.host_url:
-                # Ensure host_url has proper format
-                if not self.host_url.startswith(('http://', 'https://')):
-                    self.host_url = f"http://{self.host_url}"
+            # Override base_url if host_url is provided; a list of hosts (or hosts.pool) becomes a routed pool
+            pool_spec = self.host_url or self.config.get("hosts", {}).get("pool")
+            hosts = parse_host_list(pool_spec) if pool_spec else []
+            if len(hosts) > 1:
+                # The first host stands for the pool where one URL is needed (e.g. response cache keys)
+                self.config["base_url"] = hosts[0][0]
+                print(f"✅ Loaded configuration from {self.config_file}")
+                print(f"🌐 Using a pool of {len(hosts)} hosts: " +
+                      ", ".join(f"{url} (weight {weight:g})" for url, weight in hosts))
+            elif hosts:
+                self.host_url = hosts[0][0]
                 self.config["base_url"] = self.host_url
                 print(f"✅ Loaded configuration from {self.config_file}")
                 print(f"🌐 Using custom host: {self.host_url}")
@@ -51,6 +134,43 @@ class TestSuiteRunner:
                 print(f"✅ Loaded configuration from {self.config_file}")
                 print(f"🌐 Using default host: {self.config.get('base_url', 'http://localhost:8080')}")
             
+            # One pooled keep-alive transport is shared by every test and retry
+            self.transport = HttpTransport.from_config(self.config, min_pool_size=self.concurrency)
+            # ... and one rate limiter paces every attempt across all workers
+            self.rate_limiter = AdaptiveRateLimiter.from_config(self.config, max_concurrency=self.concurrency)
+            self.retry_policy = RetryPolicy.from_config(self.config)
+            if len(hosts) > 1:
+                self.host_pool = HostPool.from_config(self.config, hosts, log=self.log)
+                self.host_pool.start()
+                print(f"🔀 Routing: {self.host_pool.describe()}, health checks every "
+                      f"{self.host_pool.health_interval_seconds:g}s on {self.host_pool.health_path}")
+            self.response_cache = ResponseCache.from_config(self.config, self.cache_mode)
+            if self.response_cache:
+                print(f"💾 Response cache: {self.response_cache.path} ({self.response_cache.mode})")
+            verification = self.config.get("output_verification", {})
+            if self.verify_outputs or verification.get("enabled", False):
+                self.output_verifier = OutputVerifier.from_config(self.config)
+                self.fail_on_verification = verification.get("fail_tests", True)
+                print(f"🔍 Verifying output images ({self.output_verifier.concurrency} concurrent downloads)")
+            video = self.config.setdefault("video_pipeline", {})
+            if self.video_host:
+                if not self.video_host.startswith(('http://', 'https://')):
+                    self.video_host = f"http://{self.video_host}"
+                video["base_url"] = self.video_host
+            if self.video or video.get("enabled", False):
+                self.video_pipeline = VideoPipeline.from_config(self.config)
+                self.fail_on_video = video.get("fail_tests", True)
+                print(f"🎬 Video pipeline: {self.video_pipeline.base_url} (preset {self.video_pipeline.preset_video_id}, "
+                      f"{self.video_pipeline.max_concurrent_polls} concurrent polls)")
+                webhooks = self.config.get("webhooks", {})
+                if self.webhooks or webhooks.get("enabled", False):
+                    self.webhook_receiver = WebhookReceiver.from_config(self.config)
+                    self.webhook_receiver.start()
+                    self.video_pipeline.receiver = self.webhook_receiver
+                    self.video_pipeline.poll_with_webhooks = webhooks.get("poll", False)
+                    print(f"📨 Listening for render callbacks on {self.webhook_receiver.listen_host}:"
+                          f"{self.webhook_receiver.port} ({self.webhook_receiver.public_url}{self.webhook_receiver.path}/...)"
+                          + (", polling as well" if self.video_pipeline.poll_with_webhooks else ""))
             return True
         except FileNotFoundError:
             print(f"❌ Configuration file {self.config_file} not found!")
@@ -58,50 +178,43 @@ class TestSuiteRunner:
         except json.JSONDecodeError as e:
             print(f"❌ Invalid JSON in {self.config_file}: {e}")
             return False
+        except (ValueError, sqlite3.Error) as e:
+            print(f"❌ Cannot open the response cache: {e}")
+            return False
+        except (WebhookError, HostPoolError) as e:
+            print(f"❌ {e}")
+            return False
             
-    def generate_test_combinations(self) -> List[Dict]:
-        """Generate all possible test combinations from configuration."""
-        combinations = []
-        
-        # Get all parameter sets
-        image_lists = self.config["image_lists"]
-        location_prompts = self.config["location_prompts"] 
-        person_prompts = self.config["person_prompts"]
-        pipeline_configs = self.config["pipeline_configs"]
-        
-        # Generate all combinations
-        for img_key, img_data in image_lists.items():
-            for loc_key, loc_data in location_prompts.items():
-                for person_key, person_data in person_prompts.items():
-                    for pipe_key, pipe_data in pipeline_configs.items():
-                        combination = {
-                            "test_id": f"{img_key}_{loc_key}_{person_key}_{pipe_key}",
-                            "image_list_key": img_key,
-                            "image_list_name": img_data["name"],
-                            "image_list_description": img_data["description"],
-                            "image_urls": img_data["urls"],
-                            "image_count": len(img_data["urls"]),
-                            "location_prompt_key": loc_key,
-                            "location_prompt_name": loc_data["name"],
-                            "location_prompt_value": loc_data["value"],
-                            "person_prompt_key": person_key,
-                            "person_prompt_name": person_data["name"],
-                            "person_prompt_value": person_data["value"],
-                            "pipeline_config_key": pipe_key,
-                            "pipeline_config_name": pipe_data["name"],
-                            "pipeline_config_filename": pipe_data["filename"]
-                        }
-                        combinations.append(combination)
-        
-        self.total_combinations = len(combinations)
-        print(f"📊 Generated {self.total_combinations} test combinations")
-        return combinations
-        
-    def create_api_request_body(self, combination: Dict) -> Dict:
-        """Create API request body from test combination."""
+    def generate_test_combinations(self) -> TestMatrix:
+        """Build the (lazily generated) test matrix from configuration."""
+        try:
+            self.matrix = TestMatrix(self.config, self.matrix_mode,
+                                     base_dir=os.path.dirname(os.path.abspath(self.config_file)))
+        except (KeyError, ValueError) as e:
+            print(f"❌ Invalid test matrix configuration: {e}")
+            return []
+        
+        self.total_combinations = len(self.matrix)
+        dimension_count = len(self.matrix.dimensions)
+        if self.matrix.mode == "full":
+            print(f"📊 Generated {self.total_combinations} test combinations ({dimension_count} dimensions)")
+        else:
+            print(f"📊 Generated {self.total_combinations} test combinations "
+                  f"({self.matrix.describe()} over {dimension_count} dimensions, full matrix: {self.matrix.full_size})")
+            if self.matrix.uncoverable_tuples:
+                print(f"   ⚠️  {self.matrix.uncoverable_tuples} value tuples only occur in excluded combinations")
+        return self.matrix
+        
+    def create_api_request_body(self, combination: Dict, metrics: Optional[Dict] = None) -> Dict:
+        """Create API request body from test combination.
+        
+        Local files are sent as pre-encoded base64 lists, shared by every
+        combination with the same files; time spent encoding them for this
+        test goes into `metrics["base64_encode"]`.
+        """
         request_body = {
             "image_urls": combination["image_urls"],
-            "base64_images": [],
+            "base64_images": self.encoded_files(combination.get("image_files"), metrics),
             "pipeline_config_file": combination["pipeline_config_filename"],
             "animation_prompt": self.config["test_settings"]["animation_prompt"]
         }
@@ -113,75 +226,295 @@ class TestSuiteRunner:
         if combination["person_prompt_value"]:
             request_body["person_prompt"] = combination["person_prompt_value"]
             
+        # Fields set by extra matrix dimensions (model_urls, model_b64, do_not_alter, ...)
+        request_body.update(combination.get("request_fields", {}))
+        for field, files in combination.get("request_files", {}).items():
+            request_body[field] = self.encoded_files(files, metrics)
+            
         return request_body
         
-    def make_api_call(self, combination: Dict) -> Tuple[bool, Dict, float, Optional[str]]:
-        """Make API call with retry logic. Returns (success, response_data, duration, error)."""
+    def encoded_files(self, files: Optional[List[str]], metrics: Optional[Dict] = None):
+        """Base64 image objects for local `files` (an empty list when there are none)."""
+        if not files:
+            return []
+        encoded, seconds = self.payload_cache.get(tuple(files))
+        if metrics is not None:
+            metrics["base64_encode"] = metrics.get("base64_encode", 0.0) + seconds
+        return encoded
+        
+    def make_api_call(self, combination: Dict, metrics: Optional[Dict] = None,
+                      max_retries: Optional[int] = None) -> Tuple[bool, Dict, float, Optional[str]]:
+        """Make API call with retry logic. Returns (success, response_data, duration, error).
+        
+        Connection reuse and bytes sent/received across all attempts, the
+        phase timings of the last attempt, the number of attempts and the
+        class of the final failure are written into `metrics` when given.
+        With `--trace`, the whole call is recorded as the test's span.
+        """
+        if metrics is None:
+            metrics = {}
+        if not self.trace:
+            return self.call_api_with_retries(combination, metrics, max_retries)
+        start = self.trace.now()
+        outcome = self.call_api_with_retries(combination, metrics, max_retries)
+        self.trace.span(combination["test_id"], start, args={
+            "success": outcome[0], "attempts": metrics.get("attempts", 0),
+            "error_class": metrics.get("error_class", ""), "source": metrics.get("response_source", "live")})
+        return outcome
+        
+    def call_api_with_retries(self, combination: Dict, metrics: Dict,
+                              max_retries: Optional[int]) -> Tuple[bool, Dict, float, Optional[str]]:
+        """The attempts of `make_api_call`, each (and its backoff and decode) traced as a child span."""
         url = f"{self.config['base_url']}{self.config['endpoint']}"
-        headers = {"Content-Type": "application/json"}
-        request_body = self.create_api_request_body(combination)
+        trace = self.trace
+        try:
+            request_body = self.create_api_request_body(combination, metrics)
+        except OSError as e:
+            metrics["error_class"] = "local_file"
+            return False, {}, 0, f"Cannot read local image file: {e}"
         
-        max_retries = self.config["test_settings"]["max_retries"]
-        retry_delay = self.config["test_settings"]["retry_delay_seconds"]
+        if max_retries is None:
+            max_retries = self.config["test_settings"]["max_retries"]
         timeout = self.config["timeout_seconds"]
         
+        # Combinations using an image URL that failed pre-flight are pruned (or just flagged)
+        urls = combination_urls(combination)
+        issues = self.preflight.issues(urls) if self.preflight else []
+        if issues:
+            metrics["preflight_issue"] = "; ".join(issues)
+            # Only definite failures prune; a URL that timed out at startup may well work now
+            if self.preflight_mode == "prune" and self.preflight.issues(urls, definite_only=True):
+                metrics.update({"response_source": "preflight", "error_class": "preflight", "attempts": 0})
+                return False, {}, 0, f"Pruned by pre-flight check - {metrics['preflight_issue']}"
+                
+        # Cache hits skip the API (and the limiter, retry budget and breaker) entirely
+        metrics["response_source"] = "live"
+        cached = self.cached_response(url, cache_key_body(request_body))
+        if cached is not None:
+            metrics.update({"response_source": "cache", "error_class": "", "attempts": 0})
+            return self.verified_outcome(cached, 0.0, metrics)
+            
+        # Serialized once and reused by every retry
+        body = encode_request_body(request_body, self.transport.encode_json)
+        metrics["payload_bytes"] = len(body)
+        metrics.update(payload_stats(request_body))
+        
+        self.retry_policy.record_request()
+        
         for attempt in range(max_retries + 1):
+            # With a host pool every attempt (retries included) is routed on its own; breakers are per host, and
+            # hosts whose breaker is open are routed around. Only when every one is open does the attempt fail fast.
+            host, admitted = None, False
+            if self.host_pool:
+                host = self.host_pool.acquire(admit=self.breaker_admits)
+                admitted = host is not None
+                host = host or self.host_pool.acquire()
+                metrics["host"] = host.url
+            request_url = f"{host.url}{self.config['endpoint']}" if host else url
+            breaker = self.retry_policy.breaker(request_url)
+            if breaker and not admitted and not breaker.allow():
+                if host:
+                    self.host_pool.cancel(host)
+                metrics["error_class"] = "circuit_open"
+                return False, {}, 0, (f"Circuit breaker open after {breaker.consecutive_failures} consecutive failures - "
+                                      f"API looks down, next probe in {breaker.retry_in():.0f}s")
+            metrics["attempts"] = attempt + 1
+            response = None
+            if self.rate_limiter:
+                wait_start = time.perf_counter()
+                self.rate_limiter.acquire()
+                if trace and time.perf_counter() - wait_start > 0.001:  # skip the usual no-wait case
+                    trace.span("rate limit wait", wait_start)
+            start_time = time.perf_counter()
             try:
-                start_time = time.time()
-                response = requests.post(
-                    url, 
-                    json=request_body, 
-                    headers=headers, 
-                    timeout=timeout
-                )
-                duration = time.time() - start_time
+                in_flight = self.live_metrics.request_started()
+                if trace:
+                    trace.counter("requests in flight", in_flight)
+                try:
+                    response = self.transport.post_encoded(request_url, body, timeout, stats=metrics)
+                finally:
+                    in_flight = self.live_metrics.request_finished()
+                    if host:
+                        self.host_pool.release(host, time.perf_counter() - start_time,
+                                               response.status if response else None)
+                    if trace:
+                        trace.span(f"attempt {attempt + 1}", start_time,
+                                   args={"status": response.status if response else None, "host": metrics.get("host")})
+                        trace.counter("requests in flight", in_flight)
+                    self.release_rate_limit(response, start_time, combination)
+                duration = time.perf_counter() - start_time
                 
-                if response.status_code == 200:
-                    return True, response.json(), duration, None
-                else:
-                    error_msg = f"HTTP {response.status_code}: {response.text}"
-                    if attempt < max_retries:
-                        print(f"  ⚠️  Attempt {attempt + 1} failed: {error_msg}")
-                        print(f"     Retrying in {retry_delay} seconds...")
-                        time.sleep(retry_delay)
-                        continue
-                    else:
-                        return False, {}, duration, error_msg
-                        
-            except requests.exceptions.Timeout:
-                duration = timeout
-                error_msg = f"Request timeout after {timeout} seconds"
-                if attempt < max_retries:
-                    print(f"  ⚠️  Attempt {attempt + 1} timed out, retrying...")
-                    time.sleep(retry_delay)
-                    continue
-                else:
-                    return False, {}, duration, error_msg
+                if response.status == 200:
+                    decode_start = time.perf_counter()
+                    response_data = self.transport.decode_json(response.body)
+                    metrics["json_decode"] = time.perf_counter() - decode_start
+                    if trace:
+                        trace.span("decode", decode_start, args={"bytes": len(response.body)})
+                    if breaker:
+                        breaker.record(None)
+                    metrics["error_class"] = ""
+                    self.cache_response(url, cache_key_body(request_body), response_data)
+                    return self.verified_outcome(response_data, duration, metrics)
                     
-            except requests.exceptions.ConnectionError:
-                duration = time.time() - start_time if 'start_time' in locals() else 0
-                error_msg = "Connection error - is the API server running?"
-                if attempt < max_retries:
-                    print(f"  ⚠️  Attempt {attempt + 1} connection failed, retrying...")
-                    time.sleep(retry_delay)
-                    continue
-                else:
-                    return False, {}, duration, error_msg
+                failure = classify_response(response.status, response.text)
+                error_msg = f"HTTP {response.status}: {response.text}"
+                if response.truncated:
+                    error_msg += " ... [truncated]"
                     
+            except TransportTimeout:
+                duration = time.perf_counter() - start_time
+                failure = TIMEOUT
+                error_msg = f"Request timeout after {timeout} seconds"
+                
+            except TransportConnectionError:
+                duration = time.perf_counter() - start_time
+                failure = CONNECTION
+                error_msg = "Connection error - is the API server running?"
+                
             except Exception as e:
-                duration = time.time() - start_time if 'start_time' in locals() else 0
+                duration = time.perf_counter() - start_time
+                failure = UNEXPECTED
                 error_msg = f"Unexpected error: {str(e)}"
-                if attempt < max_retries:
-                    print(f"  ⚠️  Attempt {attempt + 1} failed: {error_msg}")
-                    time.sleep(retry_delay)
-                    continue
-                else:
-                    return False, {}, duration, error_msg
+                
+            if breaker:
+                breaker.record(failure)
+            metrics["error_class"] = failure.name
+            if not failure.retryable:
+                return False, {}, duration, error_msg
+            if attempt >= max_retries:
+                return False, {}, duration, error_msg
+            if not self.retry_policy.acquire_retry():
+                return False, {}, duration, f"{error_msg} (retry budget exhausted)"
+                
+            delay = self.retry_policy.backoff(attempt + 1)
+            if response is not None:
+                delay = self.throttle_delay(response, delay)
+            self.live_metrics.record_retry()
+            self.log(f"  ⚠️  Attempt {attempt + 1} failed ({failure.name}): {error_msg}\n"
+                     f"     Retrying in {delay:.1f} seconds...")
+            sleep_start = time.perf_counter()
+            time.sleep(delay)
+            if trace:
+                trace.span("backoff", sleep_start, args={"failure": failure.name})
                     
         return False, {}, 0, "Max retries exceeded"
         
+    def breaker_admits(self, host: PooledHost) -> bool:
+        """Whether `host`'s circuit breaker lets an attempt through now; if not, the pool tries the next host."""
+        breaker = self.retry_policy.breaker(f"{host.url}{self.config['endpoint']}")
+        return breaker is None or breaker.allow(count_rejection=False)
+        
+    def verified_outcome(self, response_data: Dict, duration: float,
+                         metrics: Dict) -> Tuple[bool, Dict, float, Optional[str]]:
+        """Outcome of a successful call, after checking its output images when verification is on."""
+        if not self.output_verifier:
+            return True, response_data, duration, None
+        checks, seconds = self.output_verifier.verify(output_image_urls(response_data))
+        metrics["verification"] = verification_columns(checks, seconds)
+        failures = [check for check in checks if check.issue]
+        if failures and self.fail_on_verification:
+            metrics["error_class"] = "verification"
+            return False, response_data, duration, (f"Output verification failed for {len(failures)}/{len(checks)} "
+                                                    f"images - {failures[0].url}: {failures[0].issue}")
+        return True, response_data, duration, None
+        
+    def start_video(self, combination: Dict, outcome: Tuple[bool, Dict, float, Optional[str]],
+                    metrics: Dict) -> Optional[Future]:
+        """Submit the video of a successful test; returns the future of its render, or None if none was started."""
+        success, response_data, duration, error = outcome
+        if not self.video_pipeline or not success:
+            return None
+        saved_state_blob = self.response_value(response_data, "saved_state_blob")
+        callbacks = self.webhook_receiver is not None
+        if not saved_state_blob:
+            metrics["video"] = video_columns(duration, status="skipped", error="no saved_state_blob in the AIGC response",
+                                             callbacks=callbacks)
+            return None
+        # The callback URL is reserved before submitting, as the callback may beat the submit response
+        token, callback_url = self.webhook_receiver.register() if callbacks else (None, "")
+        try:
+            video_id, seconds = self.video_pipeline.submit(saved_state_blob, combination["test_id"], callback_url)
+        except VideoApiError as e:
+            if callbacks:
+                self.webhook_receiver.discard(token)
+            metrics["video"] = video_columns(duration, status="submit_failed", error=str(e), callbacks=callbacks)
+            return None
+        metrics["video_submit"] = (video_id, seconds)
+        callback = self.webhook_receiver.expect(token, video_id) if callbacks else None
+        try:
+            return self.video_pipeline.track(video_id, callback)
+        except VideoApiError as e:  # run is shutting down
+            metrics.pop("video_submit")
+            metrics["video"] = video_columns(duration, video_id, "cancelled", str(e), seconds, callbacks=callbacks)
+            return None
+            
+    def video_outcome(self, outcome: Tuple[bool, Dict, float, Optional[str]], metrics: Dict,
+                      render: Optional[VideoRender]) -> Tuple[bool, Dict, float, Optional[str]]:
+        """Outcome of the whole images → AIGC → video pipeline, once the render (if any) is done."""
+        success, response_data, duration, error = outcome
+        if render is not None:
+            video_id, submit_seconds = metrics.pop("video_submit")
+            metrics["video"] = video_columns(duration, video_id, submit_seconds=submit_seconds, render=render,
+                                             callbacks=self.webhook_receiver is not None)
+        video = metrics.get("video")
+        if not video or video["video_status"] == COMPLETED or not self.fail_on_video:
+            return outcome
+        metrics["error_class"] = "video"
+        return False, response_data, duration, f"Video stage {video['video_status']} - {video['video_error']}"
+        
+    def cached_response(self, url: str, request_body: Dict) -> Optional[Dict]:
+        """Response data from the response cache, or None (cache off, miss or unreadable)."""
+        if not self.response_cache:
+            return None
+        try:
+            return self.response_cache.get(url, request_body)
+        except (sqlite3.Error, ValueError) as e:
+            print(f"  ⚠️  Response cache lookup failed: {e}")
+            return None
+            
+    def cache_response(self, url: str, request_body: Dict, response_data: Dict) -> None:
+        """Store a successful live response; a cache failure never fails the test."""
+        if not self.response_cache:
+            return
+        try:
+            self.response_cache.put(url, request_body, response_data)
+        except sqlite3.Error as e:
+            print(f"  ⚠️  Could not store response in cache: {e}")
+            
+    def release_rate_limit(self, response: Optional[TransportResponse], start_time: float,
+                           combination: Optional[Dict] = None) -> None:
+        """Report a finished attempt (response is None if none arrived) to the shared rate limiter."""
+        if not self.rate_limiter:
+            return
+        # Latency baselines are per pipeline config and image count: they take very different times
+        kind = (combination["pipeline_config_key"], combination["image_count"]) if combination else None
+        if response is None:
+            self.rate_limiter.release(None, time.perf_counter() - start_time, kind=kind)
+        else:
+            retry_after = parse_retry_after(response.headers.get("retry-after"))
+            self.rate_limiter.release(response.status, time.perf_counter() - start_time, retry_after, kind=kind)
+            
+    def throttle_delay(self, response: TransportResponse, retry_delay: float) -> float:
+        """Wait before retrying: `Retry-After` on 429/503 if present, otherwise the backoff delay."""
+        if response.status not in THROTTLE_STATUSES:
+            return retry_delay
+        retry_after = parse_retry_after(response.headers.get("retry-after"))
+        if retry_after is None:
+            return retry_delay
+        max_wait = self.rate_limiter.max_retry_after_seconds if self.rate_limiter else retry_after
+        return min(max(retry_after, retry_delay), max_wait)
+        
+    @staticmethod
+    def response_value(response_data: Dict, key: str, default: Any = None) -> Any:
+        """A response field, at the top level or nested under `result` (the shape documented in aigc-api.md)."""
+        if key in response_data:
+            return response_data[key]
+        result = response_data.get("result")
+        return result.get(key, default) if isinstance(result, dict) else default
+        
     def process_api_response(self, combination: Dict, success: bool, response_data: Dict, 
-                           duration: float, error: Optional[str]) -> Dict:
+                           duration: float, error: Optional[str], test_num: Optional[int] = None,
+                           metrics: Optional[Dict] = None) -> Dict:
         """Process API response and create result record."""
         timestamp = datetime.now().isoformat()
         
@@ -189,13 +522,14 @@ class TestSuiteRunner:
             # Test identification
             "timestamp": timestamp,
             "test_id": combination["test_id"],
-            "test_number": self.completed_tests + 1,
+            "test_number": test_num if test_num is not None else self.completed_tests + 1,
             
             # Input parameters
             "image_list_key": combination["image_list_key"],
             "image_list_name": combination["image_list_name"],
             "image_list_description": combination["image_list_description"],
             "image_urls": "; ".join(combination["image_urls"]),
+            "image_files": "; ".join(combination.get("image_files", [])),
             "image_count": combination["image_count"],
             "location_prompt_key": combination["location_prompt_key"],
             "location_prompt_name": combination["location_prompt_name"],
@@ -206,21 +540,55 @@ class TestSuiteRunner:
             "pipeline_config_key": combination["pipeline_config_key"],
             "pipeline_config_name": combination["pipeline_config_name"],
             "pipeline_config_filename": combination["pipeline_config_filename"],
+        }
+        
+        # Extra matrix dimensions
+        for name in (self.matrix.extra_dimension_names if self.matrix else []):
+            result[f"{name}_key"] = combination.get(f"{name}_key", "")
+            result[f"{name}_name"] = combination.get(f"{name}_name", "")
             
+        result.update({
             # Results
             "success": success,
             "duration_seconds": round(duration, 2),
             "error_message": error or "",
-        }
+        })
+        
+        # Retry outcome and transport counters, summed over all attempts
+        metrics = metrics or {}
+        result.update({
+            "error_class": metrics.get("error_class", "" if success else "unexpected"),
+            "attempts": metrics.get("attempts", 0),
+            "response_source": metrics.get("response_source", "live"),
+            "preflight_issue": metrics.get("preflight_issue", ""),
+            "connections_opened": metrics.get("connections_opened", 0),
+            "connections_reused": metrics.get("connections_reused", 0),
+            "bytes_sent": metrics.get("bytes_sent", 0),
+            "bytes_received": metrics.get("bytes_received", 0),
+            # Request payload: size of the JSON body and of the base64 images in it
+            "payload_bytes": metrics.get("payload_bytes", 0),
+            "base64_images_count": metrics.get("base64_images_count", 0),
+            "base64_bytes": metrics.get("base64_bytes", 0),
+            "base64_encode_ms": round(metrics.get("base64_encode", 0.0) * 1000, 1),
+        })
+        # Host of the last attempt; also lets later runs tell which deployment their history was timed on
+        result["host"] = metrics.get("host", "") if self.host_pool else self.config.get("base_url", "")
         
-        if success and response_data:
-            # Extract response details
+        # Phase breakdown of the last attempt in milliseconds ("" if the phase was never reached)
+        phases = dict(metrics.get("phases", {}))
+        if "json_decode" in metrics:
+            phases["json_decode"] = metrics["json_decode"]
+        for phase in TIMING_PHASES + ("json_decode",):
+            result[f"{phase}_ms"] = round(phases[phase] * 1000, 1) if phase in phases else ""
+        
+        if response_data:
+            # Extract response details (also kept when output verification failed the test)
             result.update({
                 "response_status": response_data.get("status", ""),
                 "images_requested": response_data.get("images_requested", 0),
-                "processed_images_count": len(response_data.get("processed_images", [])),
-                "processed_image_urls": "; ".join(response_data.get("processed_images", [])),
-                "saved_state_blob": response_data.get("saved_state_blob", ""),
+                "processed_images_count": len(self.response_value(response_data, "processed_images", [])),
+                "processed_image_urls": "; ".join(self.response_value(response_data, "processed_images", [])),
+                "saved_state_blob": self.response_value(response_data, "saved_state_blob", ""),
             })
         else:
             # Fill in empty values for failed requests
@@ -232,50 +600,334 @@ class TestSuiteRunner:
                 "saved_state_blob": "",
             })
             
+        if self.output_verifier:
+            result.update(metrics.get("verification") or verification_columns([], 0))
+        if self.video_pipeline:
+            result.update(metrics.get("video") or video_columns(duration, callbacks=self.webhook_receiver is not None))
+            
         return result
         
+    def result_columns(self) -> List[str]:
+        """CSV columns of this run's results, in order: those of a result built from a blank combination."""
+        blank = defaultdict(str, image_urls=[], image_files=[], image_count=0)
+        return list(self.process_api_response(blank, False, {}, 0.0, None, 0, {}).keys())
+        
     def run_single_test(self, combination: Dict, test_num: int) -> Dict:
         """Run a single test and return the result."""
-        print(f"\n🧪 Test {test_num}/{self.total_combinations}: {combination['test_id']}")
-        print(f"   📷 Images: {combination['image_list_name']} ({combination['image_count']} images)")
-        print(f"   📍 Location: {combination['location_prompt_name']}")
-        print(f"   👤 Person: {combination['person_prompt_name']}")
-        print(f"   ⚙️  Pipeline: {combination['pipeline_config_name']}")
+        if not self.progress:
+            print(f"\n🧪 Test {test_num}/{self.total_combinations}: {combination['test_id']}")
+            print(f"   📷 Images: {combination['image_list_name']} ({combination['image_count']} images)")
+            print(f"   📍 Location: {combination['location_prompt_name']}")
+            print(f"   👤 Person: {combination['person_prompt_name']}")
+            print(f"   ⚙️  Pipeline: {combination['pipeline_config_name']}")
         
-        success, response_data, duration, error = self.make_api_call(combination)
-        result = self.process_api_response(combination, success, response_data, duration, error)
+        metrics = {}
+        outcome = self.make_api_call(combination, metrics)
+        render = self.start_video(combination, outcome, metrics)
+        if render is not None:
+            if not self.progress:
+                print(f"   🎬 Video {metrics['video_submit'][0]} submitted, waiting for it to render...")
+            render = render.result()
+        success, response_data, duration, error = self.video_outcome(outcome, metrics, render)
+        result = self.process_api_response(combination, success, response_data, duration, error, test_num, metrics)
+        self.record_outcome(result, prefix=f"   [{test_num}/{self.total_combinations}] {combination['test_id']}:"
+                            if self.progress else "  ")
+        return result
         
-        if success:
-            print(f"   ✅ SUCCESS in {duration:.1f}s - {result['processed_images_count']} images processed")
+    def record_outcome(self, result: Dict, prefix: str = "  ", verbose: bool = True) -> None:
+        """Print the outcome of a finished test and update the counters and live metrics.
+        
+        With the progress line only failures are printed (above it).
+        """
+        live = result["success"] and result.get("response_source", "live") == "live"
+        self.live_metrics.record_test(result["pipeline_config_key"], result["success"],
+                                      result["duration_seconds"] if live else None)
+        if self.progress:
+            if not result["success"]:
+                self.progress.log(f"{prefix} ❌ FAILED in {result['duration_seconds']:.1f}s - {result['error_message']}")
+            verbose = False
+        if result["success"]:
+            if verbose and result.get("response_source") == "cache":
+                print(f"{prefix} ✅ SUCCESS (cached) - {result['processed_images_count']} images processed")
+            elif verbose:
+                video = f", video rendered after {result['total_seconds']:.1f}s in total" if result.get('video_status') == COMPLETED else ""
+                print(f"{prefix} ✅ SUCCESS in {result['duration_seconds']:.1f}s - {result['processed_images_count']} images processed{video}")
             self.successful_tests += 1
         else:
-            print(f"   ❌ FAILED in {duration:.1f}s - {error}")
+            if verbose:
+                print(f"{prefix} ❌ FAILED in {result['duration_seconds']:.1f}s - {result['error_message']}")
             self.failed_tests += 1
             
         self.completed_tests += 1
-        return result
+        if self.progress:
+            self.progress.update()
+        
+    def log(self, message: str) -> None:
+        """Print a message, above the progress line if there is one."""
+        if self.progress:
+            self.progress.log(message)
+        else:
+            print(message)
+            
+    def start_live_output(self, progress: bool = True) -> bool:
+        """Start the live metrics clock, the `/metrics` endpoint and trace if requested and, on a terminal, the progress line."""
+        settings = self.config.get("live_metrics", {})
+        self.live_metrics.begin(max(0, self.total_combinations - len(self.results)))
+        address = self.metrics_address or settings.get("listen")
+        if address:
+            try:
+                self.metrics_server = MetricsServer(parse_listen_address(address), self.live_metrics)
+            except (MetricsError, WorkQueueError) as e:
+                print(f"❌ {e}")
+                return False
+            self.metrics_server.start()
+            host, port = self.metrics_server.server_address[:2]
+            print(f"📈 Serving live metrics on http://{host}:{port}/metrics")
+        if self.trace_file:
+            self.trace = TraceRecorder.from_config(self.config)
+            print(f"🧵 Recording a trace of up to {self.trace.max_events:,} events for {self.trace_file}")
+        if progress and not self.verbose and not self.pause_after_tests and ProgressLine.enabled():
+            self.progress = ProgressLine(self.live_metrics, settings.get("progress_interval_seconds", 0.2))
+            self.progress.update(force=True)
+        return True
+        
+    def stop_live_output(self) -> None:
+        """End the progress line, stop serving metrics and write the trace."""
+        if self.progress:
+            self.progress.finish()
+            self.progress = None
+        if self.metrics_server:
+            self.metrics_server.close()
+            self.metrics_server = None
+        if self.trace:
+            trace, self.trace = self.trace, None
+            try:
+                count = trace.write(self.trace_file, {"test_suite_name": self.config.get("test_suite_name"),
+                                                      "base_url": self.config.get("base_url")})
+            except OSError as e:
+                print(f"⚠️  Could not write trace {self.trace_file}: {e}")
+                return
+            dropped = f" ({trace.dropped:,} dropped - raise trace.max_events)" if trace.dropped else ""
+            print(f"🧵 Trace with {count:,} events saved to: {self.trace_file}{dropped} - open it in ui.perfetto.dev")
+        
+    def close_clients(self) -> None:
+        """Close the connections, threads and listeners load_config() opened."""
+        if self.transport:
+            self.transport.close()
+        if self.host_pool:
+            self.host_pool.close()
+        if self.output_verifier:
+            self.output_verifier.close()
+        if self.webhook_receiver:
+            self.webhook_receiver.close()
+        if self.video_pipeline:
+            self.video_pipeline.close()
+        
+    def store_result(self, result: Dict) -> None:
+        """Keep a finished result and durably append it to the journal."""
+        self.keep_result(result)
+        self.persist_result(result)
+        
+    def keep_result(self, result: Dict) -> None:
+        """Add a finished result to this run's results."""
+        self.results.append(result)
+        self.recorded_test_ids.add(result["test_id"])
+        
+    def persist_result(self, result: Dict) -> None:
+        """Append a result to the journal and report it to the work queue; both can block (fsync, SQLite lock, TCP)."""
+        if self.journal:
+            try:
+                self.journal.append(result)
+            except OSError as e:
+                print(f"⚠️  Could not write result to journal {self.journal_file}: {e}")
+        if self.work_queue:
+            self.work_queue.complete(self.worker_id, result["test_id"], result)
+            self.queue_claims.discard(result["test_id"])
+                
+    def resume_from_journal(self, combinations: List[Dict]) -> None:
+        """Load results recorded by a previous run so their tests are skipped."""
+        if not os.path.exists(self.resume_journal):
+            print(f"⚠️  Journal {self.resume_journal} not found - starting from scratch")
+            return
+            
+        wanted = {c["test_id"] for c in combinations}
+        ignored = 0
+        for record in ResultJournal.load(self.resume_journal):
+            if record["test_id"] not in wanted:
+                ignored += 1
+                continue
+            if record["test_id"] in self.recorded_test_ids:
+                continue
+            self.results.append(record)
+            self.recorded_test_ids.add(record["test_id"])
+            if record.get("success"):
+                self.successful_tests += 1
+            else:
+                self.failed_tests += 1
+            self.completed_tests += 1
+            
+        print(f"⏭️  Resuming from {self.resume_journal}: {len(self.results)} tests already recorded, "
+              f"{self.total_combinations - len(self.results)} remaining")
+        if ignored:
+            print(f"   ⚠️  Ignored {ignored} journal records not in the current test matrix")
+        
+    def schedule_combinations(self, combinations: Iterable[Dict]) -> Iterable[Tuple[int, Dict]]:
+        """(test number, combination) pairs in dispatch order: matrix order, longest first or smoke first.
+        
+        Durations are estimated from earlier result CSVs; test numbers stay those of the matrix,
+        so the CSV and report keep the matrix order.
+        """
+        mode = self.schedule_mode or self.config.get("scheduling", {}).get("order", "matrix")
+        if mode not in SCHEDULE_MODES:
+            print(f"⚠️  Unknown scheduling.order '{mode}' (expected {', '.join(SCHEDULE_MODES)}) - using matrix order")
+            mode = "matrix"
+        if mode == "matrix":
+            return enumerate(combinations, 1)
+        if mode == "lpt" and self.concurrency <= 1:
+            print("📅 Longest first only shortens runs with several requests in flight - running in matrix order")
+            return enumerate(combinations, 1)
+            
+        hosts = [host.url for host in self.host_pool.hosts] if self.host_pool else [self.config.get("base_url", "")]
+        model = DurationModel.from_config(self.config, self.history, hosts)
+        if not model.samples and mode == "lpt":
+            print("📅 No timed tests against this host in earlier result files - running in matrix order")
+            return enumerate(combinations, 1)
+        pending = [(number, combination) for number, combination in enumerate(combinations, 1)
+                   if combination["test_id"] not in self.recorded_test_ids]
+        ordered = order_combinations(pending, model, mode)
+        
+        history = (f"{model.samples} timed tests in {len(model.files)} result files" if model.samples
+                   else f"no history, {model.default_seconds:g}s per test assumed")
+        makespan = estimated_makespan((estimate for _, _, estimate in ordered), self.concurrency)
+        print(f"📅 Schedule: {'longest first' if mode == 'lpt' else 'smoke tests first'} ({history})")
+        if self.concurrency > 1:
+            matrix_order = estimated_makespan((model.estimate(combination) for _, combination in pending),
+                                              self.concurrency)
+            print(f"   Estimated wall time {makespan / 60:.1f} min (matrix order: {matrix_order / 60:.1f} min)")
+        else:
+            print(f"   Estimated wall time {makespan / 60:.1f} min")
+        return [(number, combination) for number, combination, _ in ordered]
+        
+    def run_tests_sequential(self, numbered_combinations: Iterable[Tuple[int, Dict]]) -> None:
+        """Run (test number, combination) pairs one at a time, honouring pause mode."""
+        for item in numbered_combinations:
+            if item is None:  # work queue is waiting on other workers
+                time.sleep(self.idle_poll_seconds)
+                continue
+            i, combination = item
+            if combination["test_id"] in self.recorded_test_ids:
+                continue
+            result = self.run_single_test(combination, i)
+            self.store_result(result)
+            
+            # Print progress
+            if not self.progress:
+                progress = (self.completed_tests / self.total_combinations) * 100
+                print(f"📊 Progress: {progress:.1f}% ({self.completed_tests}/{self.total_combinations})")
+            
+            # Handle pause after adding result to ensure it's saved
+            if self.pause_after_tests:
+                print(f"   ⏸️  Test completed. Press Enter to continue to next test, 'q' to quit and save results, or 's' to skip remaining pauses...")
+                try:
+                    user_input = input("   ").strip().lower()
+                    if user_input == 'q':
+                        print(f"   🛑 User requested to quit. Will save {len(self.results)} completed test results...")
+                        raise KeyboardInterrupt()
+                    elif user_input == 's':
+                        print("   ⏭️  Skipping remaining pauses, continuing with full speed...")
+                        self.pause_after_tests = False
+                except KeyboardInterrupt:
+                    print("   🛑 User interrupted. Results will be saved...")
+                    raise
+        
+    async def run_tests_async(self, numbered_combinations: Iterable[Tuple[int, Dict]]) -> None:
+        """Run (test number, combination) pairs keeping up to `self.concurrency` API calls in flight.
+        
+        Each blocking `make_api_call` (including its retries) runs on a worker
+        thread; counters and `self.results` are only touched from the event loop.
+        With the video pipeline, a test's render is awaited in its own task, so
+        the worker moves on to the next combination while the video renders.
+        Taking the next combination (a work queue claim) and persisting a result
+        (journal fsync, queue completion) run on one thread each, so a slow
+        claim or commit doesn't stall the event loop and every test in flight.
+        """
+        loop = asyncio.get_running_loop()
+        executor = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="aigc-test")
+        claims = ThreadPoolExecutor(max_workers=1, thread_name_prefix="aigc-claim")
+        records = ThreadPoolExecutor(max_workers=1, thread_name_prefix="aigc-record")
+        pending = iter(numbered_combinations)
+        exhausted = object()
+        rendering = set()
+        
+        async def finish(test_num: int, combination: Dict, outcome: Tuple[bool, Dict, float, Optional[str]],
+                         metrics: Dict, render: Optional[Future]) -> None:
+            if render is not None:
+                render = await asyncio.wrap_future(render)
+            success, response_data, duration, error = self.video_outcome(outcome, metrics, render)
+            result = self.process_api_response(combination, success, response_data, duration, error, test_num, metrics)
+            self.record_outcome(result, prefix=f"   [{test_num}/{self.total_combinations}] {combination['test_id']}:")
+            self.keep_result(result)
+            await loop.run_in_executor(records, self.persist_result, result)
+            
+            if not self.progress:
+                progress = (self.completed_tests / self.total_combinations) * 100
+                print(f"📊 Progress: {progress:.1f}% ({self.completed_tests}/{self.total_combinations})")
+        
+        async def worker() -> None:
+            while True:
+                item = await loop.run_in_executor(claims, next, pending, exhausted)
+                if item is exhausted:
+                    return
+                if item is None:  # work queue is waiting on other workers
+                    await asyncio.sleep(self.idle_poll_seconds)
+                    continue
+                test_num, combination = item
+                if combination["test_id"] in self.recorded_test_ids:
+                    continue
+                if not self.progress:
+                    print(f"🧪 Test {test_num}/{self.total_combinations} dispatched: {combination['test_id']}")
+                metrics = {}
+                outcome = await loop.run_in_executor(executor, self.make_api_call, combination, metrics)
+                render = None
+                if self.video_pipeline:
+                    render = await loop.run_in_executor(executor, self.start_video, combination, outcome, metrics)
+                if render is None:
+                    await finish(test_num, combination, outcome, metrics, None)
+                    continue
+                if not self.progress:
+                    print(f"   [{test_num}/{self.total_combinations}] {combination['test_id']}: 🎬 video "
+                          f"{metrics['video_submit'][0]} submitted ({self.video_pipeline.outstanding} rendering)")
+                task = asyncio.create_task(finish(test_num, combination, outcome, metrics, render))
+                rendering.add(task)
+                task.add_done_callback(rendering.discard)
+        
+        try:
+            await asyncio.gather(*(worker() for _ in range(self.concurrency)))
+            if rendering:
+                self.log(f"🎬 Waiting for {len(rendering)} videos to finish rendering...")
+                await asyncio.gather(*rendering)
+        finally:
+            # Don't block on queued work if we were cancelled; in-flight calls finish on their threads
+            executor.shutdown(wait=False, cancel_futures=True)
+            claims.shutdown(wait=False, cancel_futures=True)
+            records.shutdown(wait=True)  # results already counted must still reach the journal
         
-    def save_results_to_csv(self, filename: Optional[str] = None) -> str:
-        """Save test results to CSV file."""
+    def save_results_to_csv(self, filename: Optional[str] = None, results: Optional[Iterable[Dict]] = None) -> str:
+        """Save test results (default: this run's) to CSV file, row by row."""
         if not filename:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             filename = f"test_results_{timestamp}.csv"
             
-        if not self.results:
+        rows = self.results if results is None else results
+        results = iter(rows)
+        first = next(results, None)
+        if first is None:
             print("⚠️  No results to save - no tests were completed!")
             # Create an empty CSV file with headers for consistency
             try:
                 with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
-                    # Write just the headers based on expected structure
-                    headers = [
-                        "timestamp", "test_id", "test_number", "image_list_key", "image_list_name",
-                        "image_list_description", "image_urls", "image_count", "location_prompt_key",
-                        "location_prompt_name", "location_prompt_value", "person_prompt_key",
-                        "person_prompt_name", "person_prompt_value", "pipeline_config_key",
-                        "pipeline_config_name", "pipeline_config_filename", "success",
-                        "duration_seconds", "error_message", "response_status", "images_requested",
-                        "processed_images_count", "processed_image_urls", "saved_state_blob"
-                    ]
+                    # The columns this run's results would have (extra dimensions, verification, video, ...)
+                    headers = self.result_columns()
                     writer = csv.DictWriter(csvfile, fieldnames=headers)
                     writer.writeheader()
                 print(f"📄 Empty CSV file created: {filename}")
@@ -283,69 +935,163 @@ class TestSuiteRunner:
                 print(f"❌ Error creating empty CSV: {e}")
             return filename
             
-        # Get all field names from the first result
-        fieldnames = list(self.results[0].keys())
+        # Resumed journal records and worker results can differ in their columns (e.g. --verify-outputs
+        # toggled between runs): a list gets the union of all keys in first-seen order, a stream the
+        # columns of its first row, with any others left out
+        if isinstance(rows, list):
+            fieldnames = list(dict.fromkeys(key for row in rows for key in row))
+        else:
+            fieldnames = list(first.keys())
+        known = set(fieldnames)
+        dropped = set()
         
         try:
             with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
-                writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+                writer = csv.DictWriter(csvfile, fieldnames=fieldnames, extrasaction="ignore")
                 writer.writeheader()
-                writer.writerows(self.results)
+                writer.writerow(first)
+                for result in results:
+                    if not known.issuperset(result):
+                        dropped.update(key for key in result if key not in known)
+                    writer.writerow(result)
                 
             print(f"📊 Results saved to: {filename}")
+            if dropped:
+                print(f"⚠️  Columns missing from the first result were left out: {', '.join(sorted(dropped))}")
             return filename
             
         except Exception as e:
             print(f"❌ Error saving CSV: {e}")
             return filename
             
-    def generate_html_report(self, csv_filename: str = None, results: List[Dict] = None) -> str:
-        """Generate HTML report from results or CSV file."""
-        if results is None:
-            if csv_filename and os.path.exists(csv_filename):
-                results = self.load_results_from_csv(csv_filename)
+    def generate_html_report(self, csv_filename: str = None, results: List[Dict] = None,
+                             source: Optional[Callable[[], Iterable[Dict]]] = None) -> str:
+        """Generate HTML report from results, a CSV file or a re-readable `source` (e.g. the results store),
+        streamed to disk page by page."""
+        if source is None:
+            if results is not None:
+                source = lambda: iter(results)
+            elif csv_filename and os.path.exists(csv_filename):
+                source = lambda: self.iter_results_from_csv(csv_filename)
             else:
-                results = self.results
-                
-        if not results:
-            print("⚠️  No results available for HTML generation!")
-            return ""
+                source = lambda: iter(self.results)
             
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         html_filename = f"test_results_{timestamp}.html"
+        page_size = (self.config or {}).get("html_report", {}).get("page_size", 500)
         
-        # Generate HTML content
-        html_content = self.create_html_content(results)
+        try:
+            # First pass: summary statistics, per-page filter counts and the image URLs to thumbnail
+            summary = ReportSummary(page_size)
+            for result in source():
+                summary.add(result, result_image_urls(result) if self.thumbnails else ())
+        except Exception as e:
+            print(f"❌ Error loading results for the HTML report: {e}")
+            return ""
+            
+        if not summary.total:
+            print("⚠️  No results available for HTML generation!")
+            return ""
+        if results is None and csv_filename and os.path.exists(csv_filename):
+            print(f"📊 Loaded {summary.total} results from {csv_filename}")
+            
+        thumbnails = self.build_thumbnails(summary.image_urls, os.path.dirname(os.path.abspath(html_filename)))
         
         try:
-            with open(html_filename, 'w', encoding='utf-8') as f:
-                f.write(html_content)
-            print(f"🌐 HTML report generated: {html_filename}")
+            # Second pass: rows are written straight to the page files
+            if summary.page_count == 1:
+                with open(html_filename, 'w', encoding='utf-8') as f:
+                    f.write(self.create_html_head("AIGC Preview API Test Results"))
+                    f.write(self.create_html_summary(summary))
+                    f.write(self.create_html_filters(summary))
+                    self.write_html_rows(f, source(), thumbnails)
+                    f.write(self.create_html_script(None))
+            else:
+                self.write_html_pages(html_filename, source(), summary, thumbnails)
+            print(f"🌐 HTML report generated: {html_filename}"
+                  + (f" ({summary.page_count} pages of {summary.page_size} tests)" if summary.page_count > 1 else ""))
             return html_filename
         except Exception as e:
             print(f"❌ Error generating HTML report: {e}")
             return ""
             
+    def write_html_pages(self, html_filename: str, results: Iterator[Dict], summary: ReportSummary,
+                         thumbnails: Dict[str, str]) -> None:
+        """Write the index page and one page file per `page_size` results."""
+        pages_dir = pages_directory(html_filename)
+        pages_name = os.path.basename(pages_dir)
+        index_name = os.path.basename(html_filename)
+        os.makedirs(pages_dir, exist_ok=True)
+        
+        with open(html_filename, 'w', encoding='utf-8') as f:
+            f.write(self.create_html_head("AIGC Preview API Test Results"))
+            f.write(self.create_html_summary(summary))
+            f.write(self.create_html_filters(summary))
+            f.write(self.create_page_index_html(summary, pages_name))
+            f.write(self.create_html_script(summary.page_manifest(pages_name)))
+            
+        for page in range(summary.page_count):
+            navigation = self.create_page_navigation_html(page, summary.page_count, index_name)
+            with open(os.path.join(pages_dir, PAGE_FILE_PATTERN.format(page + 1)), 'w', encoding='utf-8') as f:
+                f.write(self.create_html_head(f"AIGC Preview API Test Results - Page {page + 1} of {summary.page_count}"))
+                f.write(navigation)
+                f.write(self.create_html_filters(summary))
+                self.write_html_rows(f, itertools.islice(results, summary.page_size), thumbnails, "../")
+                f.write(navigation)
+                f.write(self.create_html_script(None))
+                
+    def build_thumbnails(self, image_urls: Iterable[str], report_dir: str) -> Dict[str, str]:
+        """Fetch and downsize every report image once; returns URL → thumbnail path relative to the report."""
+        if not self.thumbnails:
+            return {}
+        try:
+            store = ThumbnailStore.from_config(self.config or {}, report_dir)
+            if not store.available:
+                print("⚠️  Pillow not installed - the report links full-size images (pip install Pillow for thumbnails)")
+                return {}
+            start = time.perf_counter()
+            paths = store.build(image_urls)
+        except (OSError, ValueError) as e:
+            print(f"⚠️  Thumbnail generation failed, the report links full-size images: {e}")
+            return {}
+            
+        stats = store.stats
+        if stats['images']:
+            print(f"🖼️  Thumbnails: {len(paths)}/{stats['images']} images ({stats['created']} created, "
+                  f"{stats['reused']} reused, {stats['failed']} failed) in {time.perf_counter() - start:.1f}s "
+                  f"→ {os.path.relpath(store.directory)}")
+        return {url: os.path.relpath(path, report_dir).replace(os.sep, "/") for url, path in paths.items()}
+        
+    def iter_results_from_csv(self, csv_filename: str) -> Iterator[Dict]:
+        """Stream test results from a CSV file, one converted row at a time."""
+        with open(csv_filename, 'r', encoding='utf-8') as f:
+            for result in csv.DictReader(f):
+                yield self.convert_csv_result(result)
+                
+    def convert_csv_result(self, result: Dict) -> Dict:
+        """Convert string booleans and numbers of a CSV row back to proper types."""
+        result['success'] = result.get('success', '').lower() == 'true'
+        try:
+            result['duration_seconds'] = float(result.get('duration_seconds', 0))
+            result['image_count'] = int(result.get('image_count', 0))
+            result['images_requested'] = int(result.get('images_requested', 0))
+            result['processed_images_count'] = int(result.get('processed_images_count', 0))
+            result['test_number'] = int(result.get('test_number', 0))
+            for key in ('attempts', 'connections_opened', 'connections_reused', 'bytes_sent', 'bytes_received',
+                        'payload_bytes', 'base64_images_count', 'base64_bytes'):
+                if key in result:
+                    result[key] = int(result[key] or 0)
+            for phase in TIMING_PHASES + ('json_decode',):
+                if result.get(f'{phase}_ms'):
+                    result[f'{phase}_ms'] = float(result[f'{phase}_ms'])
+        except (ValueError, TypeError):
+            pass  # Keep as string if conversion fails
+        return result
+        
     def load_results_from_csv(self, csv_filename: str) -> List[Dict]:
         """Load test results from CSV file."""
-        results = []
         try:
-            with open(csv_filename, 'r', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                results = list(reader)
-                
-            # Convert string booleans and numbers back to proper types
-            for result in results:
-                result['success'] = result.get('success', '').lower() == 'true'
-                try:
-                    result['duration_seconds'] = float(result.get('duration_seconds', 0))
-                    result['image_count'] = int(result.get('image_count', 0))
-                    result['images_requested'] = int(result.get('images_requested', 0))
-                    result['processed_images_count'] = int(result.get('processed_images_count', 0))
-                    result['test_number'] = int(result.get('test_number', 0))
-                except (ValueError, TypeError):
-                    pass  # Keep as string if conversion fails
-                    
+            results = list(self.iter_results_from_csv(csv_filename))
             print(f"📊 Loaded {len(results)} results from {csv_filename}")
             return results
             
@@ -353,27 +1099,15 @@ class TestSuiteRunner:
             print(f"❌ Error loading CSV file {csv_filename}: {e}")
             return []
             
-    def create_html_content(self, results: List[Dict]) -> str:
-        """Create HTML content for the test results report."""
-        
-        # Calculate summary statistics
-        total_tests = len(results)
-        successful_tests = sum(1 for r in results if r.get('success', False))
-        failed_tests = total_tests - successful_tests
-        success_rate = (successful_tests / total_tests * 100) if total_tests > 0 else 0
-        
-        # Get timestamp range
-        timestamps = [r.get('timestamp', '') for r in results if r.get('timestamp')]
-        start_time = min(timestamps) if timestamps else 'Unknown'
-        end_time = max(timestamps) if timestamps else 'Unknown'
-        
-        html_content = f"""
+    def create_html_head(self, title: str) -> str:
+        """Document start of a report page: head with styles and opening body."""
+        return f"""
 <!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>AIGC Preview API Test Results</title>
+    <title>{html.escape(title)}</title>
     <style>
         body {{
             font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
@@ -533,6 +1267,41 @@ class TestSuiteRunner:
             font-style: italic;
         }}
         
+        .filters {{
+            display: flex;
+            gap: 20px;
+            align-items: center;
+            flex-wrap: wrap;
+            background: white;
+            padding: 15px 20px;
+            margin-bottom: 20px;
+            border-radius: 10px;
+            box-shadow: 0 2px 10px rgba(0,0,0,0.1);
+        }}
+        
+        .filters select {{
+            margin-left: 6px;
+            padding: 4px 8px;
+        }}
+        
+        #filter-count {{
+            color: #666;
+            margin-left: auto;
+        }}
+        
+        .page-nav {{
+            display: flex;
+            gap: 15px;
+            justify-content: center;
+            margin: 20px 0;
+        }}
+        
+        .page-nav a {{
+            color: #667eea;
+            text-decoration: none;
+            font-weight: 600;
+        }}
+        
         @media (max-width: 768px) {{
             .header h1 {{ font-size: 2em; }}
             .summary {{ grid-template-columns: 1fr 1fr; }}
@@ -543,32 +1312,101 @@ class TestSuiteRunner:
     </style>
 </head>
 <body>
+"""
+        
+    def create_html_summary(self, summary: ReportSummary) -> str:
+        """Header dashboard and summary cards, from the streaming summary."""
+        start_time = summary.start_time or 'Unknown'
+        end_time = summary.end_time or 'Unknown'
+        return f"""
     <div class="header">
         <h1>🧪 AIGC Preview API Test Results</h1>
-        <p>📊 <strong>{total_tests}</strong> total tests | ✅ <strong>{successful_tests}</strong> successful | ❌ <strong>{failed_tests}</strong> failed</p>
-        <p>📈 Success Rate: <strong>{success_rate:.1f}%</strong></p>
+        <p>📊 <strong>{summary.total}</strong> total tests | ✅ <strong>{summary.successful}</strong> successful | ❌ <strong>{summary.failed}</strong> failed</p>
+        <p>📈 Success Rate: <strong>{summary.success_rate:.1f}%</strong></p>
         <p>⏰ Test Period: {start_time} to {end_time}</p>
     </div>
     
     <div class="summary">
         <div class="summary-card">
             <h3>Total Tests</h3>
-            <div class="number">{total_tests}</div>
+            <div class="number">{summary.total}</div>
         </div>
         <div class="summary-card">
             <h3>Successful</h3>
-            <div class="number success">{successful_tests}</div>
+            <div class="number success">{summary.successful}</div>
         </div>
         <div class="summary-card">
             <h3>Failed</h3>
-            <div class="number failure">{failed_tests}</div>
+            <div class="number failure">{summary.failed}</div>
         </div>
         <div class="summary-card">
             <h3>Success Rate</h3>
-            <div class="number">{success_rate:.1f}%</div>
+            <div class="number">{summary.success_rate:.1f}%</div>
         </div>
     </div>
-    
+"""
+        
+    def create_html_filters(self, summary: ReportSummary) -> str:
+        """Filter bar (pipeline, image list, status); filters are kept in the URL fragment across pages."""
+        def options(values: Dict[str, str]) -> str:
+            return "".join(f'<option value="{html.escape(key)}">{html.escape(name)}</option>'
+                           for key, name in sorted(values.items(), key=lambda item: item[1]))
+        return f"""
+    <div class="filters">
+        <label>Pipeline <select name="pipeline"><option value="">All</option>{options(summary.pipelines)}</select></label>
+        <label>Image list <select name="list"><option value="">All</option>{options(summary.image_lists)}</select></label>
+        <label>Status <select name="status"><option value="">All</option><option value="success">✅ Success</option><option value="failed">❌ Failed</option></select></label>
+        <span id="filter-count"></span>
+    </div>
+"""
+        
+    def create_page_index_html(self, summary: ReportSummary, pages_name: str) -> str:
+        """Table of result pages for the index page of a paginated report."""
+        rows = ""
+        for page, data in enumerate(summary.page_manifest(pages_name)):
+            successful = sum(count for _, _, status, count in data['counts'] if status == 'success')
+            tests = data['last'] - data['first'] + 1
+            rows += f"""
+                <tr data-page="{page}">
+                    <td><a class="keep-filters" data-href="{html.escape(data['file'])}" href="{html.escape(data['file'])}">Page {page + 1}</a></td>
+                    <td>#{data['first']} - #{data['last']}</td>
+                    <td class="success">{successful}</td>
+                    <td class="failure">{tests - successful}</td>
+                    <td class="matching">{tests}</td>
+                </tr>"""
+        return f"""
+    <div class="table-container">
+        <table>
+            <thead>
+                <tr>
+                    <th>Page</th>
+                    <th>Tests</th>
+                    <th>Successful</th>
+                    <th>Failed</th>
+                    <th>Matching Filters</th>
+                </tr>
+            </thead>
+            <tbody>{rows}
+            </tbody>
+        </table>
+    </div>
+"""
+        
+    def create_page_navigation_html(self, page: int, page_count: int, index_name: str) -> str:
+        """Links to the index and the neighbouring pages of a paginated report."""
+        links = [f'<a class="keep-filters" data-href="../{html.escape(index_name)}" href="../{html.escape(index_name)}">📋 Index</a>']
+        if page > 0:
+            previous = PAGE_FILE_PATTERN.format(page)
+            links.append(f'<a class="keep-filters" data-href="{previous}" href="{previous}">← Page {page}</a>')
+        links.append(f'<span>Page {page + 1} of {page_count}</span>')
+        if page + 1 < page_count:
+            following = PAGE_FILE_PATTERN.format(page + 2)
+            links.append(f'<a class="keep-filters" data-href="{following}" href="{following}">Page {page + 2} →</a>')
+        return f'\n    <div class="page-nav">{" ".join(links)}</div>\n'
+        
+    def write_html_rows(self, f, results: Iterable[Dict], thumbnails: Dict[str, str], prefix: str = "") -> None:
+        """Write the results table row by row."""
+        f.write("""
     <div class="table-container">
         <table>
             <thead>
@@ -583,39 +1421,47 @@ class TestSuiteRunner:
                 </tr>
             </thead>
             <tbody>
-"""
-        
-        # Add table rows
+""")
         for result in results:
-            status_class = "status-success" if result.get('success', False) else "status-failure"
-            status_text = "✅ SUCCESS" if result.get('success', False) else "❌ FAILED"
-            
-            # Process input images
-            input_urls = result.get('image_urls', '').split('; ') if result.get('image_urls') else []
-            input_images_html = self.create_image_gallery_html(input_urls, 'Input')
-            
-            # Process output images  
-            output_urls = result.get('processed_image_urls', '').split('; ') if result.get('processed_image_urls') else []
-            output_images_html = self.create_image_gallery_html(output_urls, 'Output')
-            
-            # Configuration details
-            config_details = f"""
+            f.write(self.create_html_row(result, thumbnails, prefix))
+        f.write("""
+            </tbody>
+        </table>
+    </div>
+""")
+        
+    def create_html_row(self, result: Dict, thumbnails: Dict[str, str], prefix: str = "") -> str:
+        """Table row of one test result; `prefix` is the path from the page to the report directory."""
+        status_class = "status-success" if result.get('success', False) else "status-failure"
+        status_text = "✅ SUCCESS" if result.get('success', False) else "❌ FAILED"
+        filter_values = row_filter_values(result)
+        
+        # Process input images
+        input_urls = result.get('image_urls', '').split('; ') if result.get('image_urls') else []
+        input_images_html = self.create_image_gallery_html(input_urls, 'Input', thumbnails, prefix)
+        
+        # Process output images  
+        output_urls = result.get('processed_image_urls', '').split('; ') if result.get('processed_image_urls') else []
+        output_images_html = self.create_image_gallery_html(output_urls, 'Output', thumbnails, prefix)
+        
+        # Configuration details
+        config_details = f"""
                 <div class="test-details">
                     <strong>Pipeline:</strong> {html.escape(result.get('pipeline_config_name', 'N/A'))}<br>
                     <strong>Location:</strong> {html.escape(result.get('location_prompt_name', 'N/A'))}<br>
                     <strong>Person:</strong> {html.escape(result.get('person_prompt_name', 'N/A'))}
                 </div>
             """
-            
-            # Error message if failed
-            error_html = ""
-            if not result.get('success', False) and result.get('error_message'):
-                error_html = f'<div class="error-message">Error: {html.escape(result.get("error_message", ""))}</div>'
-            
-            duration_html = f'<span class="duration">{result.get("duration_seconds", 0):.1f}s</span>'
-            
-            html_content += f"""
-                <tr>
+        
+        # Error message if failed
+        error_html = ""
+        if not result.get('success', False) and result.get('error_message'):
+            error_html = f'<div class="error-message">Error: {html.escape(result.get("error_message", ""))}</div>'
+        
+        duration_html = f'<span class="duration">{result.get("duration_seconds", 0):.1f}s</span>'
+        
+        return f"""
+                <tr data-pipeline="{html.escape(filter_values['pipeline'])}" data-list="{html.escape(filter_values['list'])}" data-status="{filter_values['status']}">
                     <td>
                         <div class="test-id">{html.escape(result.get('test_id', 'N/A'))}</div>
                         <div class="test-details">#{result.get('test_number', 'N/A')}</div>
@@ -637,30 +1483,72 @@ class TestSuiteRunner:
                 </tr>
             """
         
-        html_content += """
-            </tbody>
-        </table>
-    </div>
-    
+    def create_html_script(self, page_manifest: Optional[List[Dict]]) -> str:
+        """Filter script and document end; with a page manifest (index page) it filters pages instead of rows."""
+        manifest = json.dumps(page_manifest).replace("</", "<\\/")
+        return """
     <script>
-        // Add click handlers for image thumbnails
-        document.addEventListener('DOMContentLoaded', function() {
-            const thumbnails = document.querySelectorAll('.image-thumbnail');
-            thumbnails.forEach(thumbnail => {
-                thumbnail.addEventListener('click', function() {
-                    window.open(this.src, '_blank');
+        // Index page: [{file, first, last, counts: [[pipeline, list, status, count], ...]}, ...]; null on result pages
+        const PAGES = __PAGES__;
+        
+        function selectedFilters() {
+            const filters = {};
+            document.querySelectorAll('.filters select').forEach(select => {
+                if (select.value) filters[select.name] = select.value;
+            });
+            return filters;
+        }
+        
+        function matches(filters, values) {
+            return Object.entries(filters).every(([key, value]) => values[key] === value);
+        }
+        
+        function applyFilters() {
+            const filters = selectedFilters();
+            const query = new URLSearchParams(filters).toString();
+            history.replaceState(null, '', query ? '#' + query : location.pathname + location.search);
+            document.querySelectorAll('a.keep-filters').forEach(link => {
+                link.href = link.dataset.href + (query ? '#' + query : '');
+            });
+            
+            let shown = 0, total = 0;
+            if (PAGES) {
+                PAGES.forEach((page, index) => {
+                    const matching = page.counts.reduce((sum, [pipeline, list, status, count]) =>
+                        sum + (matches(filters, {pipeline, list, status}) ? count : 0), 0);
+                    const row = document.querySelector(`tr[data-page="${index}"]`);
+                    row.querySelector('.matching').textContent = matching;
+                    row.style.display = matching ? '' : 'none';
+                    shown += matching;
+                    total += page.last - page.first + 1;
                 });
+            } else {
+                document.querySelectorAll('tr[data-status]').forEach(row => {
+                    const visible = matches(filters, row.dataset);
+                    row.style.display = visible ? '' : 'none';
+                    shown += visible ? 1 : 0;
+                    total += 1;
+                });
+            }
+            document.getElementById('filter-count').textContent = `${shown} of ${total} tests`;
+        }
+        
+        document.addEventListener('DOMContentLoaded', function() {
+            const params = new URLSearchParams(location.hash.slice(1));
+            document.querySelectorAll('.filters select').forEach(select => {
+                if (params.get(select.name)) select.value = params.get(select.name);
+                select.addEventListener('change', applyFilters);
             });
+            applyFilters();
         });
     </script>
 </body>
 </html>
-"""
+""".replace("__PAGES__", manifest)
         
-        return html_content
-        
-    def create_image_gallery_html(self, image_urls: List[str], gallery_type: str = "") -> str:
-        """Create HTML for image gallery with thumbnails."""
+    def create_image_gallery_html(self, image_urls: List[str], gallery_type: str = "",
+                                  thumbnails: Optional[Dict[str, str]] = None, prefix: str = "") -> str:
+        """Create HTML for image gallery with thumbnails linking to the full-size images."""
         if not image_urls or not any(url.strip() for url in image_urls):
             return '<div class="no-images">No images</div>'
             
@@ -668,12 +1556,15 @@ class TestSuiteRunner:
         for url in image_urls:
             url = url.strip()
             if url:
+                thumbnail = prefix + thumbnails[url] if thumbnails and url in thumbnails else url
                 gallery_html += f'''
-                    <img src="{html.escape(url)}" 
-                         alt="{gallery_type} Image" 
-                         class="image-thumbnail"
-                         title="Click to open full size in new tab"
-                         loading="lazy">
+                    <a href="{html.escape(url)}" target="_blank" rel="noopener">
+                        <img src="{html.escape(thumbnail)}" 
+                             alt="{gallery_type} Image" 
+                             class="image-thumbnail"
+                             title="Click to open full size in new tab"
+                             loading="lazy">
+                    </a>
                 '''
         gallery_html += '</div>'
         return gallery_html
@@ -684,7 +1575,7 @@ class TestSuiteRunner:
             print("⚠️  No test execution data available for summary.")
             return
             
-        total_duration = time.time() - self.start_time
+        total_duration = time.monotonic() - self.start_time
         success_rate = (self.successful_tests / self.completed_tests * 100) if self.completed_tests > 0 else 0
         
         print("\n" + "="*60)
@@ -696,14 +1587,267 @@ class TestSuiteRunner:
         print(f"❌ Failed: {self.failed_tests}")
         print(f"📊 Success Rate: {success_rate:.1f}%")
         
+        # Cached responses took no API time; keep them out of the timing statistics
+        live_results = [r for r in self.results if r.get('response_source', 'live') == 'live']
         if self.completed_tests > 0 and self.results:
-            avg_duration = sum(r['duration_seconds'] for r in self.results) / len(self.results)
-            print(f"⏱️  Average Test Duration: {avg_duration:.1f} seconds")
+            if live_results:
+                avg_duration = sum(r['duration_seconds'] for r in live_results) / len(live_results)
+                print(f"⏱️  Average Test Duration: {avg_duration:.1f} seconds")
+            self.print_cache_summary()
+            
+            opened = sum(r['connections_opened'] for r in self.results)
+            reused = sum(r['connections_reused'] for r in self.results)
+            sent = sum(r['bytes_sent'] for r in self.results)
+            received = sum(r['bytes_received'] for r in self.results)
+            reuse_rate = (reused / (opened + reused) * 100) if (opened + reused) > 0 else 0
+            print(f"🔌 Connections: {opened} opened, {reused} reused ({reuse_rate:.1f}% reuse)")
+            print(f"📦 Transfer: {sent / 1024:.1f} KiB sent, {received / 1024:.1f} KiB received")
+            self.print_payload_summary()
+            self.print_verification_summary()
+            self.print_video_summary()
+            self.print_rate_limit_summary()
+            self.print_retry_summary()
+            self.print_latency_breakdown()
+            self.print_host_summary()
         elif self.completed_tests == 0:
             print("⚠️  No tests were completed successfully.")
             
         print("="*60)
         
+    def print_verification_summary(self) -> None:
+        """Report output image verification across all tests."""
+        verified = [r for r in self.results if r.get('verified_images') or r.get('verification_failures')]
+        if not self.output_verifier or not verified:
+            return
+        images = sum(r['verified_images'] + r['verification_failures'] for r in verified)
+        failures = sum(r['verification_failures'] for r in verified)
+        failed_tests = sum(1 for r in verified if r['verification_failures'])
+        throughput = sorted(r['output_download_mib_s'] for r in verified if r['output_bytes'])
+        median = f", median download {throughput[len(throughput) // 2]:.2f} MiB/s" if throughput else ""
+        print(f"🔍 Output verification: {images - failures}/{images} images OK, "
+              f"{failures} problems in {failed_tests} tests{median}")
+        
+    def print_video_summary(self) -> None:
+        """Report the video stages: render outcomes, polling cost and per-stage latency of completed videos."""
+        if not self.video_pipeline:
+            return
+        submitted = [r for r in self.results if r.get('video_id')]
+        if not submitted:
+            return
+        outcomes = {}
+        for result in submitted:
+            outcomes[result['video_status']] = outcomes.get(result['video_status'], 0) + 1
+        polls = sum(r['video_polls'] for r in submitted)
+        stats = self.video_pipeline.stats
+        print(f"🎬 Videos: {outcomes.get(COMPLETED, 0)}/{len(submitted)} completed"
+              + "".join(f", {count} {status}" for status, count in sorted(outcomes.items()) if status != COMPLETED)
+              + f" - {polls / len(submitted):.1f} polls per video, up to {stats['max_outstanding']} rendering at once")
+        if self.webhook_receiver:
+            received = sum(1 for r in submitted if r['callback_status'] == 'received')
+            webhook_stats = self.webhook_receiver.stats
+            print(f"📨 Callbacks: {received}/{len(submitted)} received, "
+                  f"{sum(1 for r in submitted if r['callback_status'] == 'timeout')} timed out"
+                  + "".join(f", {webhook_stats[key]} {key}" for key in ("unmatched", "duplicates", "late", "rejected")
+                            if webhook_stats[key]))
+        
+        by_stage = GroupedHistograms()
+        for result in submitted:
+            if result['video_status'] != COMPLETED or result.get('response_source', 'live') != 'live':
+                continue
+            for index, (stage, column) in enumerate((("aigc", "aigc_seconds"), ("video submit", "video_submit_seconds"),
+                                                     ("video render", "video_render_seconds"),
+                                                     ("total", "total_seconds"))):
+                by_stage.record(f"{index + 1}. {stage}", result[column])
+            if result.get('callback_status') == 'received':
+                by_stage.record("5. callback arrival", result['callback_seconds'])
+        if not by_stage.groups:
+            return
+        for line in format_percentile_table("⏱️  Images → video stages (completed videos):", by_stage.items()):
+            print(line)
+        
+    def print_payload_summary(self) -> None:
+        """Report local-file base64 payloads: encoded once, reused by every test sharing them."""
+        base64_tests = [r for r in self.results if r.get('base64_images_count')]
+        if not base64_tests:
+            return
+        encode_ms = sum(float(r.get('base64_encode_ms') or 0) for r in base64_tests)
+        average_payload = sum(r['payload_bytes'] for r in base64_tests) / len(base64_tests)
+        print(f"🖼️  Base64 inputs: {self.payload_cache.total_bytes / 1024 / 1024:.1f} MiB encoded in "
+              f"{encode_ms / 1000:.1f}s, shared by {len(base64_tests)} tests "
+              f"(avg request {average_payload / 1024 / 1024:.1f} MiB)")
+        
+    def print_cache_summary(self) -> None:
+        """Report how many results came from the response cache."""
+        cached = sum(1 for r in self.results if r.get('response_source') == 'cache')
+        if not self.response_cache and not cached:
+            return
+        line = f"💾 Response cache: {cached} of {len(self.results)} results served from cache"
+        if self.response_cache:
+            stats = self.response_cache.stats()
+            line += f", {stats['stored']} responses stored, {stats['evicted']} evicted"
+        print(line)
+        
+    def print_retry_summary(self) -> None:
+        """Report retries, the retry budget and circuit breaker activity."""
+        failure_classes = {}
+        for result in self.results:
+            if not result["success"] and result.get("error_class"):
+                failure_classes[result["error_class"]] = failure_classes.get(result["error_class"], 0) + 1
+        if failure_classes:
+            print("🧯 Failures by class: " + ", ".join(
+                f"{name} {count}" for name, count in sorted(failure_classes.items(), key=lambda item: -item[1])))
+        if not self.retry_policy:
+            return
+        stats = self.retry_policy.stats()
+        if stats["retries"] or stats["budget_denied"]:
+            print(f"🔁 Retries: {stats['retries']} for {stats['requests']} requests "
+                  f"({self.retry_policy.budget_percent:g}% budget), {stats['budget_denied']} denied by the budget")
+        if stats["times_opened"]:
+            print(f"⛔ Circuit breaker opened {stats['times_opened']} time(s), "
+                  f"{stats['rejected']} attempts failed fast")
+            
+    def print_rate_limit_summary(self) -> None:
+        """Report how much the adaptive rate limiter had to hold back."""
+        if not self.rate_limiter:
+            return
+        stats = self.rate_limiter.stats()
+        if not (stats["throttled"] or stats["latency_decreases"] or stats["waited_seconds"] >= 1):
+            return
+        print(f"🚦 Rate limiting: {stats['throttled']} throttled responses (429/503), "
+              f"{stats['latency_decreases']} latency back-offs, {stats['waited_seconds']:.0f}s spent waiting")
+        print(f"   In-flight window: {stats['limit']:.1f} at the end "
+              f"(lowest {stats['lowest_limit']:.1f}, max {stats['max_concurrency']})")
+        
+    def print_latency_breakdown(self) -> None:
+        """Print duration percentiles per pipeline and image count, and where the time went."""
+        by_pipeline = GroupedHistograms()
+        by_image_count = GroupedHistograms()
+        by_phase = GroupedHistograms()
+        
+        # One streaming pass; only successful live calls, so failures and cache hits don't skew the latency picture
+        for result in self.results:
+            if not result.get('success') or result.get('response_source', 'live') != 'live':
+                continue
+            by_pipeline.record(result['pipeline_config_key'], result['duration_seconds'])
+            by_image_count.record(result['image_count'], result['duration_seconds'])
+            for index, phase in enumerate(TIMING_PHASES + ("json_decode",)):
+                value = result.get(f"{phase}_ms")
+                if value != "" and value is not None:
+                    by_phase.record(f"{index + 1}. {phase}", float(value) / 1000)
+                    
+        if not by_pipeline.groups:
+            return
+        print("-"*60)
+        for line in format_percentile_table("⏱️  Duration by pipeline config:", by_pipeline.items()):
+            print(line)
+        image_count_groups = [(f"{count} images", histogram) for count, histogram in by_image_count.items()]
+        for line in format_percentile_table("⏱️  Duration by image count:", image_count_groups):
+            print(line)
+        for line in format_percentile_table("🔬 Request phases (last attempt):", by_phase.items(), 1000, "ms"):
+            print(line)
+        
+    def print_host_summary(self) -> None:
+        """Print duration percentiles, attempts, errors and ejections per host of the pool."""
+        if not self.host_pool:
+            return
+        by_host = GroupedHistograms()
+        for result in self.results:
+            if result.get('success') and result.get('response_source', 'live') == 'live' and result.get('host'):
+                by_host.record(urlsplit(result['host']).netloc, result['duration_seconds'])
+        print("-"*60)
+        if by_host.groups:
+            for line in format_percentile_table("🔀 Duration by host:", by_host.items()):
+                print(line)
+        print(f"🔀 Hosts ({self.host_pool.routing.replace('_', ' ')} routing):")
+        print(f"   {'':<22}{'weight':>8}{'attempts':>10}{'errors':>8}{'error %':>9}{'ejected':>9}  state")
+        for host in self.host_pool.stats():
+            error_rate = host['errors'] / host['requests'] * 100 if host['requests'] else 0.0
+            print(f"   {urlsplit(host['url']).netloc[:22]:<22}{host['weight']:>8g}{host['requests']:>10}"
+                  f"{host['errors']:>8}{error_rate:>8.1f}%{host['ejections']:>9}  "
+                  f"{'healthy' if host['healthy'] else 'ejected'}")
+        
+    def save_results_to_store(self, interrupted: bool) -> Optional[str]:
+        """Write this run's results to the results store in batches; returns the run id."""
+        settings = (self.config or {}).get("results_store", {})
+        path = self.store_path if self.store_path is not None else (
+            settings.get("path", "test_results.db") if settings.get("enabled", False) else None)
+        if not path or not self.results:
+            return None
+        info = {
+            "config_file": self.config_file,
+            "base_url": (",".join(host.url for host in self.host_pool.hosts) if self.host_pool
+                         else (self.config or {}).get("base_url", "")),
+            "matrix_mode": self.matrix.mode if self.matrix else "",
+            "interrupted": interrupted,
+        }
+        try:
+            store = open_results_store(path, settings.get("format"), settings.get("batch_size", 500))
+            run_id = store.write_run(self.results, info)
+        except ResultsStoreError as e:
+            print(f"⚠️  {e}")
+            return None
+        print(f"🗄️  Results stored as run {run_id} in {path}")
+        return run_id
+        
+    def save_and_report(self, interrupted: bool) -> None:
+        """Save results to CSV and the results store, print the summary and generate the HTML report if requested."""
+        print(f"\n📋 Saving results...")
+        csv_filename = self.save_results_to_csv()
+        self.save_results_to_store(interrupted)
+        self.print_summary()
+        
+        if self.results:
+            if interrupted:
+                print(f"\n📁 Partial results saved to: {csv_filename}")
+                print(f"✅ {len(self.results)} test results preserved despite interruption")
+            else:
+                print(f"\n📁 Complete results saved to: {csv_filename}")
+                
+            # Generate HTML report if requested
+            if self.generate_html:
+                html_filename = self.generate_html_report()
+                if html_filename:
+                    print(f"🌐 HTML report saved to: {html_filename}")
+        else:
+            print(f"\n📄 Results file created: {csv_filename} (no tests completed)")
+        
+    def target_description(self) -> str:
+        """The API endpoint under test, with the host pool's routing when there is one."""
+        if self.host_pool:
+            return f"{self.config['endpoint']} on {self.host_pool.describe()}"
+        return f"{self.config['base_url']}{self.config['endpoint']}"
+        
+    def run_preflight(self) -> None:
+        """Check every unique image URL in the config once before any test is dispatched."""
+        settings = self.config.get("preflight", {})
+        self.preflight_mode = self.preflight_mode or settings.get("mode", "flag")
+        if self.preflight_mode == "off":
+            return
+        urls = collect_image_urls(self.config)
+        if not urls:
+            return
+            
+        self.preflight = PreflightChecker.from_config(self.config)
+        print(f"\n🔎 Pre-flight: checking {len(urls)} unique image URLs ({self.preflight.concurrency} at a time)...")
+        start = time.perf_counter()
+        results = self.preflight.check_all(urls)
+        failed = [results[url] for url in urls if not results[url].ok]
+        print(f"   {len(urls) - len(failed)}/{len(urls)} URLs OK in {time.perf_counter() - start:.1f}s")
+        if not failed:
+            return
+        for check in failed:
+            print(f"   {'⚠️ ' if check.transient else '❌'} {check.url}: {check.error}")
+        affected = [key for key, data in self.config["image_lists"].items()
+                    if any(url in data.get("urls", []) for url in (check.url for check in failed))]
+        if affected:
+            print(f"   📷 Affected image lists: {', '.join(affected)}")
+        if self.preflight_mode == "prune":
+            print(f"   ✂️  Combinations using a ❌ URL will be skipped and reported as failed (--preflight flag to send them anyway)")
+            if any(check.transient for check in failed):
+                print(f"   ⚠️  URLs that timed out, were unreachable or returned 5xx/408/429 may recover: their combinations are sent and flagged")
+        else:
+            print(f"   🚩 Combinations using these URLs will be sent anyway and flagged in preflight_issue")
+            
     def run_all_tests(self) -> bool:
         """Run all test combinations."""
         if not self.load_config():
@@ -714,41 +1858,42 @@ class TestSuiteRunner:
             print("❌ No test combinations generated!")
             return False
             
+        self.run_preflight()
+        
         print(f"\n🚀 Starting test execution...")
         print(f"📋 Configuration: {self.config['test_suite_name']}")
-        print(f"🎯 Target: {self.config['base_url']}{self.config['endpoint']}")
+        print(f"🎯 Target: {self.target_description()}")
+        if self.concurrency > 1:
+            print(f"⚡ Concurrency: {self.concurrency} requests in flight")
+        
+        if self.resume_journal:
+            self.resume_from_journal(combinations)
+        numbered_combinations = self.schedule_combinations(combinations)
+        if not self.start_live_output():
+            self.close_clients()
+            return False
+        if not self.journal_file:
+            self.journal_file = f"test_results_{datetime.now().strftime('%Y%m%d_%H%M%S')}.jsonl"
+        try:
+            self.journal = ResultJournal(self.journal_file)
+            print(f"📓 Journaling results to: {self.journal_file} (resume with --resume {self.journal_file})")
+        except OSError as e:
+            print(f"⚠️  Could not open result journal {self.journal_file}: {e} - continuing without it")
         
-        self.start_time = time.time()
+        self.start_time = time.monotonic()
         
         csv_filename = None
         interrupted = False
         
         try:
-            for i, combination in enumerate(combinations, 1):
-                result = self.run_single_test(combination, i)
-                self.results.append(result)
-                
-                # Print progress
-                progress = (i / self.total_combinations) * 100
-                print(f"📊 Progress: {progress:.1f}% ({i}/{self.total_combinations})")
-                
-                # Handle pause after adding result to ensure it's saved
-                if self.pause_after_tests:
-                    print(f"   ⏸️  Test completed. Press Enter to continue to next test, 'q' to quit and save results, or 's' to skip remaining pauses...")
-                    try:
-                        user_input = input("   ").strip().lower()
-                        if user_input == 'q':
-                            print(f"   🛑 User requested to quit. Will save {len(self.results)} completed test results...")
-                            raise KeyboardInterrupt()
-                        elif user_input == 's':
-                            print("   ⏭️  Skipping remaining pauses, continuing with full speed...")
-                            self.pause_after_tests = False
-                    except KeyboardInterrupt:
-                        print("   🛑 User interrupted. Results will be saved...")
-                        raise
+            if self.concurrency > 1:
+                asyncio.run(self.run_tests_async(numbered_combinations))
+            else:
+                self.run_tests_sequential(numbered_combinations)
                 
         except KeyboardInterrupt:
             interrupted = True
+            self.stop_live_output()
             print(f"\n⚠️  Test execution interrupted by user!")
             if self.results:
                 print(f"💾 Saving partial results from {len(self.results)} completed tests...")
@@ -757,43 +1902,383 @@ class TestSuiteRunner:
             
         except Exception as e:
             interrupted = True
+            self.stop_live_output()
             print(f"\n❌ Unexpected error during test execution: {e}")
             traceback.print_exc()
             if self.results:
                 print(f"💾 Saving partial results from {len(self.results)} completed tests...")
             
         finally:
+            self.stop_live_output()
+            # Concurrent runs complete out of order; keep the CSV in combination order
+            self.results.sort(key=lambda r: r["test_number"])
+            self.close_clients()
+            if self.journal:
+                self.journal.close()
+            
             # Always save results and print summary
-            print(f"\n📋 Saving results...")
-            csv_filename = self.save_results_to_csv()
+            self.save_and_report(interrupted)
+                
+        return not interrupted
+        
+    def run_load_test(self, schedule: ArrivalSchedule) -> bool:
+        """Issue requests open-loop at the schedule's arrival rate, cycling through the combinations."""
+        if not self.load_config():
+            return False
+            
+        combinations = self.generate_test_combinations()
+        if not combinations:
+            print("❌ No test combinations generated!")
+            return False
+            
+        settings = self.config.get("load_test", {})
+        window_seconds = settings.get("window_seconds", 10)
+        max_in_flight = settings.get("max_in_flight", 256)
+        max_retries = settings.get("max_retries", 0)
+        self.transport = HttpTransport.from_config(self.config, min_pool_size=max_in_flight)
+        # The schedule sets the offered load; throttling it would hide the overload we want to see
+        self.rate_limiter = None
+        self.retry_policy = RetryPolicy.from_config(self.config, circuit_breaker=False)
+        self.response_cache = None
+        self.output_verifier = None
+        if self.webhook_receiver:
+            self.webhook_receiver.close()
+            self.webhook_receiver = None
+        if self.video_pipeline:
+            self.video_pipeline.close()  # load tests measure the AIGC API alone
+            self.video_pipeline = None
+        self.total_combinations = int(round(schedule.expected_requests()))
+        windows = LoadWindowStats(window_seconds, schedule.duration)
+        
+        print(f"\n🚦 Starting open-loop load test: {schedule.describe()}")
+        print(f"🎯 Target: {self.target_description()}")
+        print(f"📋 ~{self.total_combinations} requests drawn from {len(combinations)} combinations, "
+              f"up to {max_in_flight} in flight, {max_retries} retries")
+        print(f"   {'window':>8}  latency is measured from the intended send time (coordinated-omission corrected)")
+        # The per-window rows are the load test's progress output
+        if not self.start_live_output(progress=False):
+            self.close_clients()
+            return False
+        
+        self.start_time = time.monotonic()
+        interrupted = False
+        try:
+            asyncio.run(self.run_load_async(schedule, combinations, windows, max_in_flight, max_retries))
+        except KeyboardInterrupt:
+            interrupted = True
+            print(f"\n⚠️  Load test interrupted by user!")
+        finally:
+            self.stop_live_output()
+            self.results.sort(key=lambda r: r["test_number"])
+            self.close_clients()
+            self.save_load_windows(windows, schedule)
+            self.save_and_report(interrupted)
+            
+        return not interrupted
+        
+    async def run_load_async(self, schedule: ArrivalSchedule, combinations: Iterable[Dict], windows: LoadWindowStats,
+                             max_in_flight: int, max_retries: int) -> None:
+        """Dispatch each request at its intended time without waiting for earlier ones."""
+        loop = asyncio.get_running_loop()
+        executor = ThreadPoolExecutor(max_workers=max_in_flight, thread_name_prefix="aigc-load")
+        combination_cycle = itertools.cycle(combinations)
+        counters = {"dispatched": 0, "completed": 0}
+        tasks = set()
+        start = time.perf_counter()
+        
+        def send(combination: Dict, metrics: Dict) -> Tuple[bool, Dict, float, Optional[str]]:
+            # Runs on a worker thread; may start late if every worker is busy
+            metrics["sent_at"] = time.perf_counter() - start
+            loop.call_soon_threadsafe(windows.record_sent, metrics["sent_at"])
+            return self.make_api_call(combination, metrics, max_retries=max_retries)
+            
+        async def issue(sequence: int, intended: float, combination: Dict) -> None:
+            metrics = {}
+            success, response_data, duration, error = await loop.run_in_executor(executor, send, combination, metrics)
+            completed_at = time.perf_counter() - start
+            corrected_latency = completed_at - intended
+            counters["completed"] += 1
+            windows.record_completed(completed_at, corrected_latency, success)
+            
+            result = self.process_api_response(combination, success, response_data, duration, error, sequence, metrics)
+            result.update({
+                "intended_offset_seconds": round(intended, 3),
+                "send_lag_seconds": round(metrics.get("sent_at", intended) - intended, 3),
+                "corrected_latency_seconds": round(corrected_latency, 2),
+            })
+            self.record_outcome(result, verbose=False)
+            self.store_result(result)
+            
+        async def report_windows() -> None:
+            index = 0
+            while True:
+                await asyncio.sleep(max(0.0, start + (index + 1) * windows.window_seconds - time.perf_counter()))
+                row = windows.close_window(index, counters["dispatched"] - counters["completed"])
+                print(format_window_row(row))
+                index += 1
+                
+        reporter = asyncio.create_task(report_windows())
+        try:
+            for sequence, intended in enumerate(schedule.intended_times(), 1):
+                delay = start + intended - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                windows.record_scheduled(intended)
+                counters["dispatched"] += 1
+                task = asyncio.create_task(issue(sequence, intended, next(combination_cycle)))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+                
+            if tasks:
+                print(f"⏳ Schedule finished - waiting for {len(tasks)} outstanding requests...")
+                await asyncio.gather(*tasks)
+        finally:
+            reporter.cancel()
+            executor.shutdown(wait=False, cancel_futures=True)
+            
+        # Report the final, partial window
+        last_index = int((time.perf_counter() - start) // windows.window_seconds)
+        print(format_window_row(windows.close_window(last_index, 0)))
+        
+    def save_load_windows(self, windows: LoadWindowStats, schedule: ArrivalSchedule) -> None:
+        """Print the load summary and save the per-window table next to the results."""
+        rows = windows.rows()
+        if not rows:
+            return
+        scheduled = sum(row["scheduled"] for row in rows)
+        sent = sum(row["sent"] for row in rows)
+        latency = LatencyHistogram()
+        for window in windows.windows.values():
+            latency.merge(window.latency)
+        
+        print("\n" + "="*60)
+        print("🚦 LOAD TEST SUMMARY")
+        print("="*60)
+        print(f"🎯 Offered: {scheduled} requests ({scheduled / schedule.duration:.2f} req/s target)")
+        print(f"📤 Sent: {sent} requests ({sent / schedule.duration:.2f} req/s achieved)")
+        print(f"⏱️  Corrected latency: p50 {latency.percentile(50):.1f}s | p95 {latency.percentile(95):.1f}s | "
+              f"p99 {latency.percentile(99):.1f}s | max {latency.max or 0:.1f}s")
+        
+        filename = f"load_windows_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
+        try:
+            with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
+                writer = csv.DictWriter(csvfile, fieldnames=list(rows[0].keys()))
+                writer.writeheader()
+                writer.writerows(rows)
+            print(f"📊 Per-window load statistics saved to: {filename}")
+        except OSError as e:
+            print(f"❌ Error saving load windows CSV: {e}")
+        
+    def queue_settings(self) -> Dict:
+        """Work queue settings from the optional `work_queue` config section."""
+        settings = self.config.get("work_queue", {})
+        return {
+            "lease_seconds": settings.get("lease_seconds", 60),
+            "poll_interval_seconds": settings.get("poll_interval_seconds", 2),
+            "max_claims": settings.get("max_claims", 3),
+            "token": os.environ.get(QUEUE_TOKEN_ENV) or settings.get("token"),
+        }
+        
+    def claim_from_queue(self) -> Iterator[Optional[Tuple[int, Dict]]]:
+        """Yield combinations leased from the work queue until it is drained.
+        
+        Yields None while other workers still hold leases that could expire
+        and be requeued, so callers can wait and ask again. Every step is a
+        blocking queue call: run_tests_async advances this on its own thread.
+        """
+        settings = self.queue_settings()
+        while True:
+            try:
+                item = self.work_queue.claim(self.worker_id, settings["lease_seconds"], settings["max_claims"])
+                stats = None if item else self.work_queue.stats()
+            except WorkQueueError:
+                if self.queue_claims:
+                    raise
+                # A TCP coordinator stops serving once every combination is done
+                print("📭 Coordinator is no longer serving and this worker has nothing outstanding")
+                return
+            if item:
+                self.queue_claims.add(item[1]["test_id"])
+                yield item
+                continue
+            if stats["pending"] == 0 and stats["claimed"] <= len(self.queue_claims):
+                return
+            yield None
+            
+    def renew_queue_leases(self, stop: threading.Event) -> None:
+        """Heartbeat that keeps this worker's leases alive while its tests run."""
+        lease_seconds = self.queue_settings()["lease_seconds"]
+        while not stop.wait(lease_seconds / 3):
+            try:
+                self.work_queue.renew(self.worker_id, lease_seconds)
+            except (WorkQueueError, sqlite3.Error) as e:
+                print(f"⚠️  Could not renew leases: {e}")
+                
+    def run_worker(self, queue_location: str) -> bool:
+        """Claim combinations from a shared work queue, run them and report results back."""
+        if not self.load_config():
+            return False
+        try:
+            settings = self.queue_settings()
+            self.work_queue = open_work_queue(queue_location, settings["token"])
+            self.worker_id = f"{socket.gethostname()}-{os.getpid()}"
+            poll_interval = settings["poll_interval_seconds"]
+            self.idle_poll_seconds = poll_interval
+            
+            if not self.work_queue.is_published():
+                print(f"⏳ Waiting for the coordinator to publish combinations to {queue_location}...")
+                while not self.work_queue.is_published():
+                    time.sleep(poll_interval)
+            self.total_combinations = self.work_queue.stats()["total"]
+        except (WorkQueueError, sqlite3.Error) as e:
+            print(f"❌ Cannot open work queue {queue_location}: {e}")
+            return False
+        except KeyboardInterrupt:
+            return False
+            
+        self.run_preflight()
+        print(f"\n👷 Worker {self.worker_id} joined {queue_location} ({self.total_combinations} combinations in queue)")
+        print(f"🎯 Target: {self.target_description()}")
+        
+        if not self.start_live_output():
+            self.close_clients()
+            return False
+        
+        stop_heartbeat = threading.Event()
+        heartbeat = threading.Thread(target=self.renew_queue_leases, args=(stop_heartbeat,), daemon=True)
+        heartbeat.start()
+        self.start_time = time.monotonic()
+        interrupted = False
+        
+        try:
+            if self.concurrency > 1:
+                asyncio.run(self.run_tests_async(self.claim_from_queue()))
+            else:
+                self.run_tests_sequential(self.claim_from_queue())
+        except KeyboardInterrupt:
+            interrupted = True
+            self.stop_live_output()
+            print(f"\n⚠️  Worker interrupted! Unfinished leases will be requeued after they expire.")
+        except (WorkQueueError, sqlite3.Error) as e:
+            interrupted = True
+            self.stop_live_output()
+            print(f"\n❌ Lost the work queue: {e}")
+        finally:
+            self.stop_live_output()
+            stop_heartbeat.set()
+            self.close_clients()
+            print(f"\n📤 Reported {len(self.results)} results to {queue_location}")
             self.print_summary()
             
-            if self.results:
-                if interrupted:
-                    print(f"\n📁 Partial results saved to: {csv_filename}")
-                    print(f"✅ {len(self.results)} test results preserved despite interruption")
-                else:
-                    print(f"\n📁 Complete results saved to: {csv_filename}")
-                    
-                # Generate HTML report if requested
-                if self.generate_html:
-                    html_filename = self.generate_html_report()
-                    if html_filename:
-                        print(f"🌐 HTML report saved to: {html_filename}")
+        return not interrupted
+        
+    def run_coordinator(self, queue_location: str, serve_address: Optional[str] = None) -> bool:
+        """Publish the test matrix to a work queue, wait for workers and merge their results."""
+        if not self.load_config():
+            return False
+        if queue_location.startswith("tcp://"):
+            print("❌ The coordinator needs a local SQLite queue file; use --serve to expose it over TCP")
+            return False
+            
+        combinations = self.generate_test_combinations()
+        if not combinations:
+            print("❌ No test combinations generated!")
+            return False
+            
+        settings = self.queue_settings()
+        try:
+            queue = SqliteWorkQueue(queue_location)
+            added = queue.publish(enumerate(combinations, 1))
+            requeued = queue.requeue_abandoned()
+            stats = queue.stats()
+        except sqlite3.Error as e:
+            print(f"❌ Cannot publish to work queue {queue_location}: {e}")
+            return False
+            
+        print(f"\n📤 Published {added} new combinations to {queue_location} ({stats['total']} in queue, {stats['done']} already done)")
+        if requeued:
+            print(f"   🔁 Requeued {requeued} previously abandoned combinations")
+            
+        server = None
+        if serve_address:
+            # Without a configured token, a fresh one is generated for this run and shown to pass to the workers
+            token = settings["token"] or secrets.token_urlsafe(24)
+            try:
+                server = WorkQueueServer(parse_listen_address(serve_address), queue, token)
+            except (WorkQueueError, OSError) as e:
+                print(f"❌ Cannot serve work queue on {serve_address}: {e}")
+                return False
+            server.start()
+            host, port = server.server_address[:2]
+            print(f"📡 Serving work queue on {host}:{port} - start workers with:")
+            if settings["token"]:
+                print(f"   python test_suite_runner.py --worker tcp://<this-host>:{port}  (with the same work_queue.token)")
             else:
-                print(f"\n📄 Results file created: {csv_filename} (no tests completed)")
+                print(f"   {QUEUE_TOKEN_ENV}={token} python test_suite_runner.py --worker tcp://<this-host>:{port}")
+        else:
+            print(f"💡 Start workers with: python test_suite_runner.py --worker {queue_location}")
+            
+        self.start_time = time.monotonic()
+        interrupted = False
+        last_done = None
+        
+        try:
+            while True:
+                queue.expire_leases(settings["max_claims"])
+                stats = queue.stats()
+                if stats["done"] != last_done:
+                    progress = (stats["done"] / stats["total"]) * 100 if stats["total"] else 100
+                    print(f"📊 Progress: {progress:.1f}% ({stats['done']}/{stats['total']}) - "
+                          f"{stats['claimed']} running, {stats['pending']} pending")
+                    last_done = stats["done"]
+                if stats["pending"] == 0 and stats["claimed"] == 0:
+                    break
+                time.sleep(settings["poll_interval_seconds"])
+        except KeyboardInterrupt:
+            interrupted = True
+            print(f"\n⚠️  Coordinator interrupted! Workers keep their leases; rerun the coordinator to collect them.")
+        finally:
+            if server:
+                server.shutdown()
+                server.server_close()
                 
+            self.results = queue.results()
+            for test_number, combination, claims in queue.abandoned():
+                error = f"Abandoned after {claims} expired leases - worker crashed or was killed"
+                metrics = {"error_class": "abandoned", "attempts": claims}
+                self.results.append(self.process_api_response(combination, False, {}, 0, error, test_number, metrics))
+            self.results.sort(key=lambda r: r["test_number"])
+            
+            self.total_combinations = stats["total"]
+            self.completed_tests = len(self.results)
+            self.successful_tests = sum(1 for r in self.results if r.get("success"))
+            self.failed_tests = self.completed_tests - self.successful_tests
+            self.save_and_report(interrupted)
+            
         return not interrupted
 
 
-def generate_html_from_csv(csv_filename: str) -> None:
+def report_runner(config_file: str, thumbnails: bool) -> TestSuiteRunner:
+    """Runner for report generation only: the config (if present) just provides the html_report settings."""
+    runner = TestSuiteRunner(config_file, thumbnails=thumbnails)
+    if os.path.exists(config_file):
+        try:
+            with open(config_file, 'r', encoding='utf-8') as f:
+                runner.config = json.load(f)
+        except (OSError, ValueError):
+            pass
+    return runner
+
+
+def generate_html_from_csv(csv_filename: str, config_file: str = "test_suite_config.json",
+                           thumbnails: bool = True) -> None:
     """Generate HTML report from existing CSV file."""
     if not os.path.exists(csv_filename):
         print(f"❌ CSV file '{csv_filename}' not found!")
         return
         
     print(f"🌐 Generating HTML report from {csv_filename}...")
-    runner = TestSuiteRunner()
+    runner = report_runner(config_file, thumbnails)
     html_filename = runner.generate_html_report(csv_filename=csv_filename)
     
     if html_filename:
@@ -803,6 +2288,123 @@ def generate_html_from_csv(csv_filename: str) -> None:
         print("❌ Failed to generate HTML report")
 
 
+def open_store_run(store_path: str, run_id: Optional[str] = None):
+    """Open the results store and pick a run (default: the newest); (None, None) with a message if impossible."""
+    if not os.path.exists(store_path):
+        print(f"❌ Results store '{store_path}' not found!")
+        return None, None
+    try:
+        store = open_results_store(store_path)
+        runs = store.runs()
+    except ResultsStoreError as e:
+        print(f"❌ {e}")
+        return None, None
+    if not runs:
+        print(f"⚠️  No runs in {store_path}")
+        return None, None
+    if run_id is None:
+        run_id = runs[0]["run_id"]
+    elif run_id not in {run["run_id"] for run in runs}:
+        print(f"❌ No run '{run_id}' in {store_path} (newest: {', '.join(run['run_id'] for run in runs[:5])})")
+        return None, None
+    return store, run_id
+
+
+def generate_reports_from_store(store_path: str, run_id: Optional[str] = None, html_report: bool = True,
+                                csv_export: bool = False, config_file: str = "test_suite_config.json",
+                                thumbnails: bool = True) -> None:
+    """Generate the HTML report and/or a CSV file of a run in the results store."""
+    store, run_id = open_store_run(store_path, run_id)
+    if store is None:
+        return
+        
+    runner = report_runner(config_file, thumbnails)
+    if csv_export:
+        print(f"📄 Exporting run {run_id} from {store_path}...")
+        runner.save_results_to_csv(f"test_results_{run_id}_from_store.csv", store.iter_results(run_id))
+    if html_report:
+        print(f"🌐 Generating HTML report for run {run_id} from {store_path}...")
+        html_filename = runner.generate_html_report(source=lambda: store.iter_results(run_id))
+        if html_filename:
+            print(f"✅ HTML report generated successfully!")
+            print(f"📁 Open in browser: {html_filename}")
+        else:
+            print("❌ Failed to generate HTML report")
+
+
+def print_store_stats(store_path: str, last_runs: int = 30, pipeline: Optional[str] = None) -> None:
+    """Recent runs and duration percentiles per pipeline across them, from the results store."""
+    store, _ = open_store_run(store_path)
+    if store is None:
+        return
+        
+    start = time.perf_counter()
+    runs = store.runs(last_runs)
+    histograms = store.duration_histograms(last_runs, pipeline)
+    elapsed = time.perf_counter() - start
+    
+    print(f"🗄️  {store_path} ({store.format}): last {len(runs)} runs")
+    for run in runs[:10]:
+        rate = run['successful'] / run['test_count'] * 100 if run['test_count'] else 0
+        host = run['info'].get('base_url', '')
+        interrupted = " (interrupted)" if run['info'].get('interrupted') else ""
+        print(f"   {run['run_id']:<20} {run['test_count']:>6} tests {rate:>6.1f}% OK  {host}{interrupted}")
+    if len(runs) > 10:
+        print(f"   ... {len(runs) - 10} more")
+    title = f"\n⏱️  Duration of successful live tests over the last {len(runs)} runs" + (
+        f" ({pipeline})" if pipeline else "") + ":"
+    for line in format_percentile_table(title, histograms.items()):
+        print(line)
+    print(f"\n   Queried in {elapsed * 1000:.0f} ms")
+
+
+def compare_result_files(baseline_csv: str, candidate_csv: str, config_file: str = "test_suite_config.json",
+                         threshold_percent: Optional[float] = None) -> bool:
+    """Compare two result CSVs and write the regression report; True when a significant slowdown was found."""
+    for filename in (baseline_csv, candidate_csv):
+        if not os.path.exists(filename):
+            print(f"❌ CSV file '{filename}' not found!")
+            sys.exit(2)
+            
+    runner = report_runner(config_file, thumbnails=False)
+    settings = {
+        "threshold_percent": 10, "alpha": 0.05, "resamples": 2000, "confidence": 0.95, "min_samples": 5, "seed": 0,
+        **(runner.config or {}).get("compare", {}),
+    }
+    if threshold_percent is not None:
+        settings["threshold_percent"] = threshold_percent
+    baseline = runner.load_results_from_csv(baseline_csv)
+    candidate = runner.load_results_from_csv(candidate_csv)
+    
+    start = time.perf_counter()
+    comparisons = compare_runs(baseline, candidate, settings["threshold_percent"], settings["alpha"],
+                               settings["resamples"], settings["confidence"], settings["min_samples"], settings["seed"])
+    regressions = [entry for entry in comparisons if entry.regression]
+    
+    print(f"\n📉 Regression report: {baseline_csv} → {candidate_csv}")
+    print(f"   Slowdown threshold +{settings['threshold_percent']}%, α = {settings['alpha']} (Holm-adjusted), "
+          f"{settings['confidence'] * 100:.0f}% bootstrap CIs ({settings['resamples']} resamples), "
+          f"computed in {time.perf_counter() - start:.1f}s")
+    if not comparisons:
+        print(f"⚠️  No group has at least {settings['min_samples']} successful live tests in both runs")
+    for line in format_comparison_report(comparisons):
+        print(line)
+        
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    html_filename = f"regression_report_{timestamp}.html"
+    try:
+        write_comparison_html(comparisons, html_filename, {**settings, "baseline": baseline_csv, "candidate": candidate_csv})
+        print(f"\n🌐 Regression report saved to: {html_filename}")
+    except OSError as e:
+        print(f"❌ Error writing regression report: {e}")
+        
+    if regressions:
+        print(f"❌ {len(regressions)} significant slowdowns: {', '.join(entry.label for entry in regressions[:5])}")
+    else:
+        print("✅ No significant slowdown")
+    return bool(regressions)
+
+
 def main():
     """Main execution function."""
     print("🧪 AIGC Preview API Test Suite Runner")
@@ -814,6 +2416,37 @@ def main():
     generate_html = False
     html_from_csv = None
     host_url = None
+    concurrency = 1
+    journal_file = None
+    resume_journal = None
+    matrix_mode = None
+    cache_mode = None
+    preflight_mode = None
+    verify_outputs = False
+    video = False
+    video_host = None
+    webhooks = False
+    thumbnails = True
+    store_path = None
+    html_from_store = None
+    csv_from_store = None
+    store_stats = None
+    store_run = None
+    last_runs = 30
+    stats_pipeline = None
+    compare_files = None
+    compare_threshold = None
+    coordinator_queue = None
+    load_spec = None
+    load_duration = 60.0
+    poisson_arrivals = False
+    worker_queue = None
+    serve_address = None
+    metrics_address = None
+    verbose = False
+    trace_file = None
+    schedule_mode = None
+    history = None
     
     # Simple argument parsing
     args = sys.argv[1:]
@@ -838,31 +2471,249 @@ def main():
             else:
                 print("❌ --host requires a URL!")
                 sys.exit(1)
+        elif arg == "--concurrency":
+            if i + 1 < len(args) and args[i + 1].isdigit() and int(args[i + 1]) >= 1:
+                concurrency = int(args[i + 1])
+                i += 1  # Skip the next argument as it's the concurrency level
+            else:
+                print("❌ --concurrency requires a positive integer!")
+                sys.exit(1)
+        elif arg == "--matrix":
+            if i + 1 < len(args):
+                matrix_mode = args[i + 1]
+                i += 1  # Skip the next argument as it's the matrix mode
+            else:
+                print("❌ --matrix requires a mode (full, pairwise or <t>-way)!")
+                sys.exit(1)
+        elif arg == "--cache":
+            if i + 1 < len(args) and args[i + 1] in CACHE_MODES:
+                cache_mode = args[i + 1]
+                i += 1  # Skip the next argument as it's the cache mode
+            else:
+                print(f"❌ --cache requires a mode ({', '.join(CACHE_MODES)})!")
+                sys.exit(1)
+        elif arg == "--preflight":
+            if i + 1 < len(args) and args[i + 1] in ("prune", "flag", "off"):
+                preflight_mode = args[i + 1]
+                i += 1  # Skip the next argument as it's the pre-flight mode
+            else:
+                print("❌ --preflight requires a mode (prune, flag or off)!")
+                sys.exit(1)
+        elif arg == "--verify-outputs":
+            verify_outputs = True
+        elif arg == "--video":
+            video = True
+        elif arg == "--webhooks":
+            webhooks = True
+        elif arg == "--video-host":
+            if i + 1 < len(args):
+                video_host = args[i + 1]
+                i += 1  # Skip the next argument as it's the Main Video API URL
+            else:
+                print("❌ --video-host requires a URL!")
+                sys.exit(1)
+        elif arg == "--no-thumbnails":
+            thumbnails = False
+        elif arg == "--no-store":
+            store_path = ""
+        elif arg in ("--store", "--html-from-store", "--csv-from-store", "--store-stats"):
+            if i + 1 < len(args):
+                if arg == "--store":
+                    store_path = args[i + 1]
+                elif arg == "--html-from-store":
+                    html_from_store = args[i + 1]
+                elif arg == "--csv-from-store":
+                    csv_from_store = args[i + 1]
+                else:
+                    store_stats = args[i + 1]
+                i += 1  # Skip the next argument as it's the store path
+            else:
+                print(f"❌ {arg} requires a results store path!")
+                sys.exit(1)
+        elif arg == "--compare":
+            if i + 2 < len(args):
+                compare_files = (args[i + 1], args[i + 2])
+                i += 2  # Skip the baseline and candidate filenames
+            else:
+                print("❌ --compare requires a baseline and a candidate CSV file!")
+                sys.exit(2)
+        elif arg == "--threshold":
+            try:
+                compare_threshold = float(args[i + 1])
+                i += 1  # Skip the next argument as it's the threshold
+            except (IndexError, ValueError):
+                print("❌ --threshold requires a percentage!")
+                sys.exit(2)
+        elif arg == "--run":
+            if i + 1 < len(args):
+                store_run = args[i + 1]
+                i += 1  # Skip the next argument as it's the run id
+            else:
+                print("❌ --run requires a run id!")
+                sys.exit(1)
+        elif arg == "--last-runs":
+            if i + 1 < len(args) and args[i + 1].isdigit() and int(args[i + 1]) >= 1:
+                last_runs = int(args[i + 1])
+                i += 1  # Skip the next argument as it's the number of runs
+            else:
+                print("❌ --last-runs requires a positive integer!")
+                sys.exit(1)
+        elif arg == "--pipeline":
+            if i + 1 < len(args):
+                stats_pipeline = args[i + 1]
+                i += 1  # Skip the next argument as it's the pipeline key
+            else:
+                print("❌ --pipeline requires a pipeline config key!")
+                sys.exit(1)
+        elif arg == "--load":
+            if i + 1 < len(args):
+                load_spec = args[i + 1]
+                i += 1  # Skip the next argument as it's the load schedule
+            else:
+                print("❌ --load requires a schedule (e.g. constant:0.5, step:0.2,0.5,1@300, ramp:0.1-2)!")
+                sys.exit(1)
+        elif arg == "--load-duration":
+            try:
+                load_duration = float(args[i + 1])
+                i += 1  # Skip the next argument as it's the duration
+            except (IndexError, ValueError):
+                print("❌ --load-duration requires a number of seconds!")
+                sys.exit(1)
+        elif arg == "--poisson":
+            poisson_arrivals = True
+        elif arg == "--metrics":
+            if i + 1 < len(args):
+                metrics_address = args[i + 1]
+                i += 1  # Skip the next argument as it's the listen address
+            else:
+                print("❌ --metrics requires a listen address (e.g. :9464)!")
+                sys.exit(1)
+        elif arg == "--verbose" or arg == "-v":
+            verbose = True
+        elif arg == "--schedule":
+            if i + 1 < len(args) and args[i + 1] in SCHEDULE_MODES:
+                schedule_mode = args[i + 1]
+                i += 1  # Skip the next argument as it's the schedule mode
+            else:
+                print(f"❌ --schedule requires a mode ({', '.join(SCHEDULE_MODES)})!")
+                sys.exit(1)
+        elif arg == "--history":
+            if i + 1 < len(args):
+                history = [pattern for pattern in args[i + 1].split(",") if pattern]
+                i += 1  # Skip the next argument as it's the result files
+            else:
+                print("❌ --history requires result CSV files or glob patterns!")
+                sys.exit(1)
+        elif arg == "--trace":
+            if i + 1 < len(args):
+                trace_file = args[i + 1]
+                i += 1  # Skip the next argument as it's the trace filename
+            else:
+                print("❌ --trace requires an output filename (e.g. trace.json)!")
+                sys.exit(1)
+        elif arg in ("--coordinator", "--worker", "--serve"):
+            if i + 1 < len(args):
+                if arg == "--coordinator":
+                    coordinator_queue = args[i + 1]
+                elif arg == "--worker":
+                    worker_queue = args[i + 1]
+                else:
+                    serve_address = args[i + 1]
+                i += 1  # Skip the next argument as it's the queue location
+            else:
+                print(f"❌ {arg} requires a {'listen address' if arg == '--serve' else 'queue location'}!")
+                sys.exit(1)
+        elif arg in ("--journal", "--resume"):
+            if i + 1 < len(args):
+                if arg == "--journal":
+                    journal_file = args[i + 1]
+                else:
+                    resume_journal = args[i + 1]
+                i += 1  # Skip the next argument as it's the journal filename
+            else:
+                print(f"❌ {arg} requires a journal filename!")
+                sys.exit(1)
         elif arg == "--help":
             print("Usage: python test_suite_runner.py [config_file] [options]")
             print("\nOptions:")
             print("  -p, --pause              Pause after each test for manual review")
             print("  --html                   Generate HTML report after tests")
             print("  --html-from-csv <file>   Generate HTML report from existing CSV file")
+            print("  --no-thumbnails          HTML report links full-size images instead of generating thumbnails")
+            print("  --store <path>           Also store the results in this results store (.db: SQLite, .parquet: Parquet)")
+            print("  --no-store               Don't write the results store configured in results_store")
+            print("  --html-from-store <path> Generate HTML report of a stored run (newest, or --run <id>)")
+            print("  --csv-from-store <path>  Export a stored run (newest, or --run <id>) to CSV")
+            print("  --store-stats <path>     Duration percentiles per pipeline over the last runs (--last-runs <n>, --pipeline <key>)")
+            print("  --compare <base> <cand>  Regression report between two result CSVs; exit code 1 on a significant slowdown")
+            print("  --threshold <percent>    Slowdown that counts as a regression for --compare (default: 10)")
             print("  --host <url>             Specify custom host URL (default: localhost:8080)")
+            print("  --host <url,url=2,...>   Spread tests over a pool of hosts (optionally weighted), see hosts in the config")
+            print("  --concurrency <n>        Keep up to n API requests in flight (default: 1, sequential)")
+            print("  --matrix <mode>          Test matrix: full, pairwise or <t>-way covering array (default: full)")
+            print("  --cache <mode>           Response cache: read (reuse cached responses), write (refresh) or off")
+            print("  --preflight <mode>       Image URL pre-flight check: flag (default), prune or off")
+            print("  --verify-outputs         Download and check every output image (format, size, truncation, hash)")
+            print("  --video                  Turn each successful test's saved_state_blob into a video and time the render")
+            print("  --video-host <url>       Main Video API base URL for --video (e.g. a local stand-in)")
+            print("  --webhooks               With --video, take render completion from callbacks to an embedded listener")
+            print("  --journal <file>         Append each result to this journal (default: test_results_<timestamp>.jsonl)")
+            print("  --resume <file>          Resume a run from its journal, skipping recorded tests")
+            print("  --coordinator <queue.db> Publish the matrix to a work queue and merge results from workers")
+            print("  --serve <host:port>      With --coordinator, serve the queue to remote workers over TCP (:port = localhost only)")
+            print("  --worker <queue>         Run tests claimed from a work queue (queue.db or tcp://host:port)")
+            print("  --load <schedule>        Open-loop load test: constant:R, poisson:R, step:R1,R2@SECS or ramp:FROM-TO (req/s)")
+            print("  --load-duration <secs>   Length of the load test schedule (default: 60)")
+            print("  --poisson                Use Poisson (exponential) inter-arrival times for --load")
+            print("  --metrics <host:port>    Serve live Prometheus metrics on http://<host:port>/metrics during the run")
+            print("  -v, --verbose            Print every test instead of the single progress line on a terminal")
+            print("  --schedule <mode>        Dispatch order: matrix (default), lpt (longest first) or smoke (fastest per pipeline first)")
+            print("  --history <files>        Result CSVs/globs (comma-separated) to estimate durations from (default: test_results_*.csv)")
+            print("  --trace <file>           Record a Trace Event timeline of every test and attempt (open in ui.perfetto.dev)")
             print("  --help                   Show this help message")
             print("\nExamples:")
             print("  python test_suite_runner.py                        # Run with default config")
             print("  python test_suite_runner.py --pause                # Run with pauses")
             print("  python test_suite_runner.py --html                 # Run tests and generate HTML")
             print("  python test_suite_runner.py --host my-server.com   # Test against custom host")
+            print("  python test_suite_runner.py --host eu.example.com,us.example.com=2 --concurrency 12  # Host pool")
             print("  python test_suite_runner.py --host https://api.example.com:3000  # Full URL")
             print("  python test_suite_runner.py --pause --html --host staging.myapp.com  # All options")
+            print("  python test_suite_runner.py --concurrency 8        # Run 8 tests in parallel")
+            print("  python test_suite_runner.py --matrix pairwise      # Cover every pair of values with fewer tests")
+            print("  python test_suite_runner.py --resume test_results_20250630_212048.jsonl  # Continue a killed run")
+            print("  python test_suite_runner.py --coordinator queue.db --serve 0.0.0.0:7070  # Coordinate remote workers")
+            print("  AIGC_QUEUE_TOKEN=<token> python test_suite_runner.py --worker tcp://coordinator-host:7070 --concurrency 8  # Join as a worker")
+            print("  python test_suite_runner.py --video --concurrency 4  # Time images → AIGC → rendered video")
+            print("  python test_suite_runner.py --load ramp:0.1-2 --load-duration 1800 --poisson  # Capacity ramp")
+            print("  python test_suite_runner.py --concurrency 16 --metrics :9464  # Scrape the run while it goes")
+            print("  python test_suite_runner.py --concurrency 8 --trace trace.json  # See where the time went")
+            print("  python test_suite_runner.py --concurrency 8 --schedule smoke  # Fail fast on a broken pipeline")
             print("  python test_suite_runner.py custom_config.json     # Use custom config")
             print("  python test_suite_runner.py --html-from-csv results.csv  # Generate HTML from existing CSV")
+            print("  python test_suite_runner.py --store-stats test_results.db --pipeline 360  # p95 of the 360 pipeline, last 30 runs")
+            print("  python test_suite_runner.py --compare baseline.csv candidate.csv --threshold 15  # CI regression gate")
             sys.exit(0)
         elif not arg.startswith("-"):
             config_file = arg
         i += 1
     
+    # Regression comparison of two result files
+    if compare_files:
+        sys.exit(1 if compare_result_files(*compare_files, config_file, compare_threshold) else 0)
+        
+    # Report generation and queries from the results store
+    if html_from_store or csv_from_store:
+        generate_reports_from_store(html_from_store or csv_from_store, store_run, bool(html_from_store),
+                                    bool(csv_from_store), config_file, thumbnails)
+        return
+    if store_stats:
+        print_store_stats(store_stats, last_runs, stats_pipeline)
+        return
+        
     # Handle HTML generation from CSV mode
     if html_from_csv:
-        generate_html_from_csv(html_from_csv)
+        generate_html_from_csv(html_from_csv, config_file, thumbnails)
         return
         
     if not os.path.exists(config_file):
@@ -871,25 +2722,41 @@ def main():
         print("Use --help for more information.")
         sys.exit(1)
         
-    # Determine the health check URL
-    if host_url:
-        # Ensure host_url has proper format for health check
-        if not host_url.startswith(('http://', 'https://')):
-            health_url = f"http://{host_url}/health"
+    # Coordinator mode only publishes work and merges results; workers talk to the API
+    if coordinator_queue:
+        runner = TestSuiteRunner(config_file, generate_html=generate_html, host_url=host_url, matrix_mode=matrix_mode,
+                                 thumbnails=thumbnails, store_path=store_path)
+        if runner.run_coordinator(coordinator_queue, serve_address):
+            print("\n🎉 Distributed test run completed successfully!")
         else:
-            health_url = f"{host_url}/health"
+            print("\n⚠️  Distributed test run did not complete; rerun the coordinator with the same queue to continue.")
+        return
+        
+    # Determine the health check URLs (every host of a --host list)
+    if host_url:
+        try:
+            health_urls = [f"{url}/health" for url, _ in parse_host_list(host_url)]
+        except HostPoolError as e:
+            print(f"❌ {e}")
+            sys.exit(1)
     else:
-        health_url = "http://localhost:8080/health"
+        health_urls = ["http://localhost:8080/health"]
     
-    # Check if API server is reachable
-    try:
-        response = requests.get(health_url, timeout=5)
-        if response.status_code == 200:
-            print(f"✅ API server is reachable at {health_url.replace('/health', '')}")
-        else:
-            print(f"⚠️  API server at {health_url.replace('/health', '')} responded but not healthy")
-    except requests.exceptions.ConnectionError:
-        print(f"❌ Cannot reach API server at {health_url.replace('/health', '')}")
+    # Check if the API servers are reachable; a pool routes around the ones that aren't
+    unreachable = 0
+    for health_url in health_urls:
+        try:
+            response = requests.get(health_url, timeout=5)
+            if response.status_code == 200:
+                print(f"✅ API server is reachable at {health_url.replace('/health', '')}")
+            else:
+                print(f"⚠️  API server at {health_url.replace('/health', '')} responded but not healthy")
+        except requests.exceptions.ConnectionError:
+            print(f"❌ Cannot reach API server at {health_url.replace('/health', '')}")
+            unreachable += 1
+        except Exception as e:
+            print(f"⚠️  Could not check API server status: {e}")
+    if unreachable == len(health_urls):
         if not host_url:
             print("💡 Make sure the API server is running with: python main.py")
         else:
@@ -897,8 +2764,6 @@ def main():
         answer = input("Continue anyway? (y/N): ").lower().strip()
         if answer != 'y':
             sys.exit(1)
-    except Exception as e:
-        print(f"⚠️  Could not check API server status: {e}")
         
     # Show mode status
     if pause_after_tests:
@@ -908,9 +2773,40 @@ def main():
         print("🌐 HTML report generation enabled")
     if host_url:
         print(f"🌐 Custom host specified: {host_url}")
+    if concurrency > 1:
+        print(f"⚡ Concurrent mode enabled - {concurrency} requests in flight")
+        if pause_after_tests:
+            print("⚠️  Pause mode is not available with --concurrency; pauses disabled")
+            pause_after_tests = False
     
+    # Validate the load schedule before anything is sent
+    schedule = None
+    if load_spec:
+        try:
+            schedule = parse_load_schedule(load_spec, load_duration, poisson_arrivals)
+        except LoadScheduleError as e:
+            print(f"❌ {e}")
+            sys.exit(1)
+        
     # Run the test suite
-    runner = TestSuiteRunner(config_file, pause_after_tests, generate_html, host_url)
+    runner = TestSuiteRunner(config_file, pause_after_tests, generate_html, host_url, concurrency,
+                             journal_file=journal_file, resume_journal=resume_journal, matrix_mode=matrix_mode,
+                             cache_mode=cache_mode, preflight_mode=preflight_mode, verify_outputs=verify_outputs,
+                             thumbnails=thumbnails, store_path=store_path, video=video, video_host=video_host,
+                             webhooks=webhooks, metrics_address=metrics_address, verbose=verbose,
+                             trace_file=trace_file, schedule_mode=schedule_mode, history=history)
+    if schedule:
+        if runner.run_load_test(schedule):
+            print("\n🎉 Load test completed!")
+        else:
+            print("\n⚠️  Load test was interrupted, but results have been saved.")
+        return
+    if worker_queue:
+        if runner.run_worker(worker_queue):
+            print("\n🎉 Work queue drained - worker finished!")
+        else:
+            print("\n⚠️  Worker stopped early; its unfinished tests will be picked up by other workers.")
+        return
     completed_fully = runner.run_all_tests()
     
     if completed_fully:
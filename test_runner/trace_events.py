@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Trace Event timeline of a test run for the AIGC Preview API Test Suite Runner
+
+`--trace out.json` records where a run's time went: one span per test,
+child spans for every attempt, backoff sleep and response decode, and a
+counter track of the requests in flight. The file is in the Trace Event
+format and loads in Perfetto (ui.perfetto.dev) or chrome://tracing.
+
+Recording is cheap enough to leave on for a whole run: events go into
+fixed-size arrays allocated up front, a slot is claimed with one atomic
+counter step, and nothing is formatted until the file is written at the
+end. Once `max_events` slots are used up, further events are dropped and
+counted.
+"""
+
+import itertools
+import json
+import os
+import threading
+import time
+from array import array
+from typing import Dict, List, Any, Optional
+
+# Event kinds stored per slot
+COMPLETE = 0  # span with a duration ("X")
+COUNTER = 1  # counter track sample ("C")
+INSTANT = 2  # point in time ("i")
+PHASES = {COMPLETE: "X", COUNTER: "C", INSTANT: "i"}
+
+
+class TraceRecorder:
+    """Preallocated, thread-safe buffer of trace events, written out once at the end."""
+
+    def __init__(self, max_events: int = 500_000):
+        self.max_events = max_events
+        self._kind = array("b", bytes(max_events))
+        self._start = array("d", bytes(8 * max_events))  # seconds since the recorder's origin
+        self._duration = array("d", bytes(8 * max_events))  # seconds for spans, the value for counters
+        self._thread = array("Q", bytes(8 * max_events))
+        self._name = array("L", bytes(array("L").itemsize * max_events))  # index into self._names
+        self._args: List[Optional[Dict[str, Any]]] = [None] * max_events
+        self._slots = itertools.count()  # next() is atomic under the GIL
+        self._names: List[str] = []
+        self._name_index: Dict[str, int] = {}
+        self._thread_names: Dict[int, str] = {}
+        self._lock = threading.Lock()
+        self.origin = time.perf_counter()
+        self.dropped = 0
+
+    @classmethod
+    def from_config(cls, config: Dict) -> "TraceRecorder":
+        return cls(max_events=config.get("trace", {}).get("max_events", 500_000))
+
+    @staticmethod
+    def now() -> float:
+        return time.perf_counter()
+
+    def _intern(self, name: str) -> int:
+        index = self._name_index.get(name)
+        if index is None:
+            with self._lock:
+                index = self._name_index.get(name)
+                if index is None:
+                    index = len(self._names)
+                    self._names.append(name)
+                    self._name_index[name] = index
+        return index
+
+    def _record(self, kind: int, name: str, start: float, value: float, args: Optional[Dict[str, Any]]) -> None:
+        slot = next(self._slots)
+        if slot >= self.max_events:
+            self.dropped += 1
+            return
+        thread = threading.get_ident()
+        if thread not in self._thread_names:
+            self._thread_names[thread] = threading.current_thread().name
+        self._kind[slot] = kind
+        self._start[slot] = start - self.origin
+        self._duration[slot] = value
+        self._thread[slot] = thread
+        self._name[slot] = self._intern(name)
+        self._args[slot] = args
+
+    def span(self, name: str, start: float, end: Optional[float] = None, args: Optional[Dict[str, Any]] = None) -> None:
+        """A span on the calling thread from `start` to `end` (default: now), both `perf_counter()` values."""
+        end = time.perf_counter() if end is None else end
+        self._record(COMPLETE, name, start, end - start, args)
+
+    def counter(self, name: str, value: float) -> None:
+        """A sample of the counter track `name`."""
+        self._record(COUNTER, name, time.perf_counter(), value, None)
+
+    def instant(self, name: str, args: Optional[Dict[str, Any]] = None) -> None:
+        """A point-in-time marker on the calling thread."""
+        self._record(INSTANT, name, time.perf_counter(), 0.0, args)
+
+    def write(self, filename: str, metadata: Optional[Dict[str, Any]] = None) -> int:
+        """Write the recorded events as a Trace Event JSON file; returns the number of events written."""
+        count = min(self.max_events, next(self._slots))  # claims one more slot: recording is over
+        pid = os.getpid()
+        # Small, stable thread ids in order of first appearance keep the timeline tidy
+        tids = {thread: index + 1 for index, thread in enumerate(self._thread_names)}
+        with open(filename, "w", encoding="utf-8") as f:
+            f.write('{"displayTimeUnit": "ms", "otherData": ')
+            f.write(json.dumps({**(metadata or {}), "dropped_events": self.dropped}))
+            f.write(',\n"traceEvents": [\n')
+            f.write(json.dumps({"ph": "M", "name": "process_name", "pid": pid, "tid": 0,
+                                "args": {"name": "AIGC test suite runner"}}))
+            for thread, tid in tids.items():
+                f.write(",\n" + json.dumps({"ph": "M", "name": "thread_name", "pid": pid, "tid": tid,
+                                            "args": {"name": self._thread_names[thread]}}))
+            for slot in range(count):
+                kind = self._kind[slot]
+                event = {"ph": PHASES[kind], "name": self._names[self._name[slot]], "pid": pid,
+                         "tid": tids.get(self._thread[slot], 0), "ts": round(self._start[slot] * 1e6, 1)}
+                if kind == COMPLETE:
+                    event["dur"] = round(self._duration[slot] * 1e6, 1)
+                    if self._args[slot]:
+                        event["args"] = self._args[slot]
+                elif kind == COUNTER:
+                    event["args"] = {"value": self._duration[slot]}
+                else:
+                    event["s"] = "t"
+                    if self._args[slot]:
+                        event["args"] = self._args[slot]
+                f.write(",\n" + json.dumps(event, default=str))
+            f.write("\n]}\n")
+        return count
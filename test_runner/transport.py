@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+"""
+Pooled HTTP transport for the AIGC Preview API Test Suite Runner
+
+Keeps keep-alive connections to each API host open between tests and
+retries, optionally gzips large request bodies, caps how much of an error
+body is read, and counts connection reuse and bytes on the wire so the
+runner can report handshake overhead per test.
+"""
+
+import gzip
+import http.client
+import json
+import select
+import socket
+import ssl
+import threading
+import time
+from typing import Dict, List, Tuple, Any, Optional
+from urllib.parse import urlsplit
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the standard library
+    orjson = None
+
+
+# Request phases timed with a monotonic clock, in the order they happen
+TIMING_PHASES = ("dns", "connect", "tls", "upload", "ttfb", "download")
+
+# Errors raised on a kept-alive connection that the server already closed (only retried before the request is written)
+STALE_CONNECTION_ERRORS = (
+    http.client.RemoteDisconnected,
+    http.client.BadStatusLine,
+    BrokenPipeError,
+    ConnectionResetError,
+    ConnectionAbortedError,
+)
+
+
+class TransportError(Exception):
+    """Base class for transport failures."""
+
+
+class TransportTimeout(TransportError):
+    """The server did not answer within the request timeout."""
+
+
+class TransportConnectionError(TransportError):
+    """The connection could not be established or was lost."""
+
+
+class TransportResponse:
+    """Status, headers and (possibly truncated) body of a finished request."""
+
+    def __init__(self, status: int, headers: Dict[str, str], body: bytes, truncated: bool = False):
+        self.status = status
+        self.headers = headers
+        self.body = body
+        self.truncated = truncated
+
+    @property
+    def text(self) -> str:
+        return self.body.decode("utf-8", errors="replace")
+
+
+class HttpTransport:
+    """Thread-safe pool of keep-alive HTTP(S) connections keyed by host."""
+
+    def __init__(self, pool_size: int = 10, keep_alive: bool = True, compress_requests: bool = False,
+                 compress_min_bytes: int = 1024, max_error_body_bytes: int = 4096):
+        self.pool_size = max(1, pool_size)
+        self.keep_alive = keep_alive
+        self.compress_requests = compress_requests
+        self.compress_min_bytes = compress_min_bytes
+        self.max_error_body_bytes = max_error_body_bytes
+        self._idle: Dict[Tuple[str, str, int], List[http.client.HTTPConnection]] = {}
+        self._lock = threading.Lock()
+        self._ssl_context = ssl.create_default_context()
+
+    @classmethod
+    def from_config(cls, config: Dict, min_pool_size: int = 1) -> "HttpTransport":
+        """Build a transport from the optional `transport` section of the suite config."""
+        settings = config.get("transport", {})
+        return cls(
+            pool_size=max(settings.get("pool_size", 10), min_pool_size),
+            keep_alive=settings.get("keep_alive", True),
+            compress_requests=settings.get("compress_requests", False),
+            compress_min_bytes=settings.get("compress_min_bytes", 1024),
+            max_error_body_bytes=settings.get("max_error_body_bytes", 4096),
+        )
+
+    # JSON helpers -------------------------------------------------------
+
+    @staticmethod
+    def encode_json(payload: Any) -> bytes:
+        if orjson is not None:
+            return orjson.dumps(payload)
+        return json.dumps(payload, separators=(",", ":")).encode("utf-8")
+
+    @staticmethod
+    def decode_json(body: bytes) -> Any:
+        if orjson is not None:
+            return orjson.loads(body)
+        return json.loads(body)
+
+    # Requests -----------------------------------------------------------
+
+    def post_json(self, url: str, payload: Any, timeout: float, stats: Optional[Dict] = None,
+                  headers: Optional[Dict[str, str]] = None) -> TransportResponse:
+        """POST `payload` as JSON; transfer counters are added to `stats`."""
+        return self.post_encoded(url, self.encode_json(payload), timeout, stats, headers)
+
+    def post_encoded(self, url: str, body: bytes, timeout: float, stats: Optional[Dict] = None,
+                     headers: Optional[Dict[str, str]] = None) -> TransportResponse:
+        """POST an already serialized JSON body (e.g. one reused across retries)."""
+        request_headers = {"Content-Type": "application/json"}
+        if self.compress_requests and len(body) >= self.compress_min_bytes:
+            body = gzip.compress(body, compresslevel=5)
+            request_headers["Content-Encoding"] = "gzip"
+        request_headers.update(headers or {})
+        return self.request("POST", url, body, request_headers, timeout, stats)
+
+    def get(self, url: str, timeout: float, stats: Optional[Dict] = None,
+            headers: Optional[Dict[str, str]] = None) -> TransportResponse:
+        return self.request("GET", url, None, headers or {}, timeout, stats)
+
+    def request(self, method: str, url: str, body: Optional[bytes], headers: Dict[str, str],
+                timeout: float, stats: Optional[Dict] = None) -> TransportResponse:
+        """Send one request, transparently replacing a stale pooled connection once.
+
+        The request is only re-sent if the pooled connection failed before the
+        request was fully written; once the server may have received it, a
+        dropped connection is a `TransportConnectionError` for the caller's
+        retry policy to decide on (the API calls are not idempotent).
+        `stats["phases"]` holds the per-phase timings (seconds) of the last try.
+        """
+        if stats is None:
+            stats = {}
+        for key in ("connections_opened", "connections_reused", "bytes_sent", "bytes_received"):
+            stats.setdefault(key, 0)
+
+        parts = urlsplit(url)
+        scheme = parts.scheme or "http"
+        port = parts.port or (443 if scheme == "https" else 80)
+        pool_key = (scheme, parts.hostname, port)
+        path = parts.path or "/"
+        if parts.query:
+            path += f"?{parts.query}"
+
+        for _ in range(2):
+            conn, reused = self._acquire(pool_key, timeout)
+            stats["connections_reused" if reused else "connections_opened"] += 1
+            stats["phases"] = {}  # only phases that run are timed: a reused connection has no dns/connect/tls
+            try:
+                if conn.sock is None:
+                    self._connect(conn, pool_key, timeout, stats["phases"])
+                response, keep = self._send(conn, method, pool_key, path, body, headers, stats)
+            except STALE_CONNECTION_ERRORS as e:
+                conn.close()
+                if reused and "upload" not in stats["phases"]:
+                    continue  # the server closed an idle keep-alive connection before it got the request
+                raise TransportConnectionError(str(e)) from e
+            except socket.timeout as e:
+                conn.close()
+                raise TransportTimeout(f"timed out after {timeout} seconds") from e
+            except (OSError, http.client.HTTPException) as e:
+                conn.close()
+                raise TransportConnectionError(str(e)) from e
+            except BaseException:
+                conn.close()
+                raise
+            self._release(pool_key, conn, keep)
+            return response
+
+        raise TransportConnectionError("connection closed by server")
+
+    def close(self) -> None:
+        """Close every idle pooled connection."""
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for connections in idle.values():
+            for conn in connections:
+                conn.close()
+
+    # Internals ----------------------------------------------------------
+
+    def _acquire(self, pool_key: Tuple[str, str, int], timeout: float) -> Tuple[http.client.HTTPConnection, bool]:
+        while True:
+            with self._lock:
+                idle = self._idle.get(pool_key)
+                conn = idle.pop() if idle else None
+            if conn is None:
+                break
+            if conn.sock is None or self._peer_closed(conn.sock):
+                conn.close()  # closed by the server while idle: don't send a request into it
+                continue
+            conn.timeout = timeout
+            conn.sock.settimeout(timeout)
+            return conn, True
+
+        scheme, host, port = pool_key
+        if scheme == "https":
+            return http.client.HTTPSConnection(host, port, timeout=timeout, context=self._ssl_context), False
+        return http.client.HTTPConnection(host, port, timeout=timeout), False
+
+    @staticmethod
+    def _peer_closed(sock: socket.socket) -> bool:
+        """An idle keep-alive socket that is readable was closed by the server (or got unsolicited data)."""
+        try:
+            readable, _, _ = select.select([sock], [], [], 0)
+        except (OSError, ValueError):
+            return True
+        return bool(readable)
+
+    def _connect(self, conn: http.client.HTTPConnection, pool_key: Tuple[str, str, int], timeout: float,
+                 phases: Dict[str, float]) -> None:
+        """Open the socket ourselves so DNS, TCP connect and TLS handshake can be timed separately."""
+        scheme, host, port = pool_key
+        start = time.perf_counter()
+        addresses = socket.getaddrinfo(host, port, type=socket.SOCK_STREAM)
+        phases["dns"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        sock, last_error = None, None
+        for family, socktype, proto, _, address in addresses:
+            try:
+                sock = socket.socket(family, socktype, proto)
+                sock.settimeout(timeout)
+                sock.connect(address)
+                break
+            except OSError as e:
+                last_error = e
+                if sock is not None:
+                    sock.close()
+                sock = None
+        if sock is None:
+            raise last_error or OSError(f"no addresses for {host}")
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        phases["connect"] = time.perf_counter() - start
+
+        if scheme == "https":
+            start = time.perf_counter()
+            try:
+                sock = self._ssl_context.wrap_socket(sock, server_hostname=host)
+            except BaseException:
+                sock.close()
+                raise
+            phases["tls"] = time.perf_counter() - start
+        conn.sock = sock
+
+    def _release(self, pool_key: Tuple[str, str, int], conn: http.client.HTTPConnection, keep: bool) -> None:
+        if keep and self.keep_alive:
+            with self._lock:
+                idle = self._idle.setdefault(pool_key, [])
+                if len(idle) < self.pool_size:
+                    idle.append(conn)
+                    return
+        conn.close()
+
+    def _send(self, conn: http.client.HTTPConnection, method: str, pool_key: Tuple[str, str, int], path: str,
+              body: Optional[bytes], headers: Dict[str, str], stats: Dict) -> Tuple[TransportResponse, bool]:
+        scheme, host, port = pool_key
+        default_port = 443 if scheme == "https" else 80
+        all_headers = {
+            "Host": host if port == default_port else f"{host}:{port}",
+            "Accept-Encoding": "identity",
+            "Connection": "keep-alive" if self.keep_alive else "close",
+        }
+        all_headers.update(headers)
+        if body is not None:
+            all_headers["Content-Length"] = str(len(body))
+
+        phases = stats["phases"]
+        start = time.perf_counter()
+        conn.putrequest(method, path, skip_host=True, skip_accept_encoding=True)
+        for name, value in all_headers.items():
+            conn.putheader(name, value)
+        conn.endheaders(body)
+        phases["upload"] = time.perf_counter() - start
+        stats["bytes_sent"] += len(f"{method} {path} HTTP/1.1\r\n") + 2 + (len(body) if body else 0) + sum(
+            len(name) + len(value) + 4 for name, value in all_headers.items()
+        )
+
+        start = time.perf_counter()
+        response = conn.getresponse()
+        phases["ttfb"] = time.perf_counter() - start
+        response_headers = {name.lower(): value for name, value in response.getheaders()}
+        stats["bytes_received"] += len(f"HTTP/1.1 {response.status} {response.reason}\r\n") + 2 + sum(
+            len(name) + len(value) + 4 for name, value in response_headers.items()
+        )
+
+        start = time.perf_counter()
+        if 200 <= response.status < 300:
+            data = response.read()
+        else:
+            data = response.read(self.max_error_body_bytes)
+        phases["download"] = time.perf_counter() - start
+        stats["bytes_received"] += len(data)
+
+        # Only connections whose response was fully consumed can go back to the pool
+        truncated = not response.isclosed()
+        keep = not truncated and not response.will_close
+        return TransportResponse(response.status, response_headers, data, truncated), keep
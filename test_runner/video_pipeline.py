@@ -0,0 +1,364 @@
+#!/usr/bin/env python3
+"""
+Images → AIGC → video benchmark stages for the AIGC Preview API Test Suite Runner
+
+In production the AIGC call is only the first stage: its `saved_state_blob`
+is handed to the Main Video API (`/ae_new_video_from_preset`), and the
+latency that matters ends when `/ae_get_video` reports "Completed". With the
+video pipeline enabled, every successful test submits a video and the
+runner waits for it to render.
+
+Renders take minutes, so they are tracked by one shared scheduler instead of
+a poller per video: a single thread keeps every outstanding render in a heap
+ordered by its next poll time and hands due polls to a small, bounded pool.
+Each render backs off exponentially between polls, and its first poll is
+scheduled adaptively, at a fraction of the median render time seen so far,
+so fast renders aren't polled late and slow ones aren't polled in vain.
+
+Poll granularity means a render is only seen complete at the next poll;
+`video_poll_gap_seconds` is the window the real completion fell in. With a
+webhook receiver, completion is taken from the render's callback instead,
+either without polling at all or alongside it for comparison.
+"""
+
+import heapq
+import itertools
+import os
+import statistics
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, Any, Optional, Tuple
+
+import requests
+
+from rate_control import parse_retry_after
+
+SUBMIT_PATH = "/ae_new_video_from_preset"
+STATUS_PATH = "/ae_get_video"
+COMPLETED = "Completed"
+FAILED_STATUSES = ("Failed", "Error", "Cancelled")
+RECENT_RENDERS = 50  # completed render times kept for the adaptive first poll
+
+
+class VideoApiError(Exception):
+    """A Main Video API call that failed (HTTP error, `"status": "error"` or unexpected response)."""
+
+    def __init__(self, message: str, retry_after: Optional[float] = None, retryable: bool = False):
+        super().__init__(message)
+        self.retry_after = retry_after
+        self.retryable = retryable
+
+
+class VideoRender:
+    """One submitted video and its render outcome."""
+
+    def __init__(self, video_id: str, submitted_at: float, deadline: float):
+        self.video_id = video_id
+        self.submitted_at = submitted_at
+        self.deadline = deadline
+        self.status = "pending"
+        self.video_url = ""
+        self.error = ""
+        self.polls = 0
+        self.poll_errors = 0
+        self.interval = 0.0
+        self.last_poll_at = submitted_at
+        self.poll_gap = 0.0
+        self.render_seconds = 0.0
+        self.callback: Optional[Future] = None
+        self.callback_status = ""
+        self.callback_seconds = 0.0
+        self.callback_payload = ""
+        self.future: Future = Future()
+
+    @property
+    def completed(self) -> bool:
+        return self.status == COMPLETED
+
+
+class VideoPipeline:
+    """Submits videos from saved state blobs and tracks every render with one shared backoff poller."""
+
+    def __init__(self, base_url: str, user_key: str, preset_video_id: str, api_token: str = "",
+                 video_name: str = "AIGC benchmark {test_id}", options: Optional[Dict[str, Any]] = None,
+                 poll_initial_seconds: float = 5, poll_max_seconds: float = 60, poll_backoff: float = 1.5,
+                 first_poll_fraction: float = 0.8, render_timeout_seconds: float = 1800,
+                 max_concurrent_polls: int = 8, submit_retries: int = 2, timeout: float = 60):
+        self.base_url = base_url.rstrip("/")
+        self.user_key = user_key
+        self.preset_video_id = preset_video_id
+        self.api_token = api_token
+        self.video_name = video_name
+        self.options = dict(options or {})
+        self.poll_initial_seconds = poll_initial_seconds
+        self.poll_max_seconds = max(poll_max_seconds, poll_initial_seconds)
+        self.poll_backoff = max(1.0, poll_backoff)
+        self.first_poll_fraction = first_poll_fraction
+        self.render_timeout_seconds = render_timeout_seconds
+        self.max_concurrent_polls = max(1, max_concurrent_polls)
+        self.submit_retries = max(0, submit_retries)
+        self.timeout = timeout
+        self.receiver = None  # WebhookReceiver, when completion comes from callbacks
+        self.poll_with_webhooks = False
+        self.stats = {"submitted": 0, "polls": 0, "poll_errors": 0, "max_outstanding": 0}
+        self._recent = deque(maxlen=RECENT_RENDERS)
+        self._heap: List[Tuple[float, int, VideoRender]] = []
+        self._sequence = itertools.count()
+        self._outstanding = set()
+        self._closed = False
+        self._condition = threading.Condition()
+        self._local = threading.local()
+        self._pollers = ThreadPoolExecutor(max_workers=self.max_concurrent_polls, thread_name_prefix="aigc-video-poll")
+        self._scheduler = threading.Thread(target=self._schedule, name="aigc-video-scheduler", daemon=True)
+        self._scheduler.start()
+
+    @classmethod
+    def from_config(cls, config: Dict) -> "VideoPipeline":
+        """Build the pipeline from the `video_pipeline` config section; the token may come from `AEON_API_TOKEN`."""
+        settings = config.get("video_pipeline", {})
+        options = {key: settings[key] for key in ("captions", "voice", "language", "soundtrack") if key in settings}
+        return cls(
+            settings.get("base_url", "https://app.project-aeon.com/api/1.1/wf"),
+            user_key=settings.get("user_key", ""),
+            preset_video_id=settings.get("preset_video_id", ""),
+            api_token=settings.get("api_token") or os.environ.get("AEON_API_TOKEN", ""),
+            video_name=settings.get("video_name", "AIGC benchmark {test_id}"),
+            options=options,
+            poll_initial_seconds=settings.get("poll_initial_seconds", 5),
+            poll_max_seconds=settings.get("poll_max_seconds", 60),
+            poll_backoff=settings.get("poll_backoff", 1.5),
+            first_poll_fraction=settings.get("first_poll_fraction", 0.8),
+            render_timeout_seconds=settings.get("render_timeout_seconds", 1800),
+            max_concurrent_polls=settings.get("max_concurrent_polls", 8),
+            submit_retries=settings.get("submit_retries", 2),
+            timeout=settings.get("timeout_seconds", 60),
+        )
+
+    def close(self) -> None:
+        """Stop polling; renders still outstanding resolve as `cancelled`."""
+        with self._condition:
+            self._closed = True
+            pending = list(self._outstanding)  # queued and mid-poll renders alike
+            self._heap.clear()
+            self._condition.notify()
+        for render in pending:
+            self._finish(render, "cancelled", "runner stopped before the render finished")
+        self._pollers.shutdown(wait=False, cancel_futures=True)
+
+    def _session(self) -> requests.Session:
+        if not hasattr(self._local, "session"):
+            self._local.session = requests.Session()
+            if self.api_token:
+                self._local.session.headers["Authorization"] = f"Bearer {self.api_token}"
+        return self._local.session
+
+    def _post(self, path: str, body: Dict[str, Any]) -> Dict[str, Any]:
+        """POST to the Main Video API; the `response` object of a `"status": "success"` reply."""
+        try:
+            response = self._session().post(f"{self.base_url}{path}", json=body, timeout=self.timeout)
+        except requests.exceptions.Timeout:
+            raise VideoApiError(f"{path} timed out after {self.timeout}s", retryable=True)
+        except requests.exceptions.RequestException as e:
+            raise VideoApiError(f"{path} failed ({type(e).__name__})", retryable=True)
+        if response.status_code != 200:
+            raise VideoApiError(f"{path}: HTTP {response.status_code}: {response.text[:200]}",
+                                retry_after=parse_retry_after(response.headers.get("Retry-After")),
+                                retryable=response.status_code == 429 or response.status_code >= 500)
+        try:
+            data = response.json()
+        except ValueError:
+            raise VideoApiError(f"{path}: response is not JSON", retryable=True)
+        if data.get("status") != "success" or not isinstance(data.get("response"), dict):
+            raise VideoApiError(f"{path}: {data.get('message') or data.get('error_code') or 'unexpected response'}")
+        return data["response"]
+
+    def submit(self, saved_state_blob: str, test_id: str, callback_url: str = "") -> Tuple[str, float]:
+        """Create a video from an AIGC saved state; returns (video_id, submit seconds, including retries).
+
+        Throttled (`429`) and server-error submissions are retried up to `submit_retries` times.
+        """
+        body = {
+            "preset_video_id": self.preset_video_id,
+            "video_name": self.video_name.format(test_id=test_id),
+            "user_key": self.user_key,
+            "save_state": saved_state_blob,
+        }
+        if callback_url:
+            body["callback_url"] = callback_url
+        body.update(self.options)
+        start = time.perf_counter()
+        for attempt in range(self.submit_retries + 1):
+            try:
+                response = self._post(SUBMIT_PATH, body)
+                break
+            except VideoApiError as e:
+                if not e.retryable or attempt >= self.submit_retries:
+                    raise
+                time.sleep(e.retry_after if e.retry_after is not None else self.poll_initial_seconds * (attempt + 1))
+        seconds = time.perf_counter() - start
+        if not response.get("video_id"):
+            raise VideoApiError(f"{SUBMIT_PATH}: no video_id in response")
+        with self._condition:
+            self.stats["submitted"] += 1
+        return str(response["video_id"]), seconds
+
+    def first_poll_delay(self) -> float:
+        """Initial poll delay: a fraction of the recent median render time, once there is one."""
+        with self._condition:
+            recent = list(self._recent)
+        if not recent:
+            return self.poll_initial_seconds
+        expected = statistics.median(recent) * self.first_poll_fraction
+        return min(max(self.poll_initial_seconds, expected), self.render_timeout_seconds)
+
+    def track(self, video_id: str, callback: Optional[Future] = None) -> Future:
+        """Start tracking a submitted render; the future resolves to its `VideoRender` when it is done.
+
+        With a `callback` (a receiver future resolving to a `WebhookCallback`) the render
+        completes when its callback arrives; it is only polled if `poll_with_webhooks` is set.
+        """
+        now = time.perf_counter()
+        render = VideoRender(video_id, now, now + self.render_timeout_seconds)
+        render.interval = self.poll_initial_seconds
+        render.callback = callback
+        with self._condition:
+            if self._closed:
+                raise VideoApiError("video pipeline is closed")
+            self._outstanding.add(render)
+            self.stats["max_outstanding"] = max(self.stats["max_outstanding"], len(self._outstanding))
+        if callback is not None:
+            callback.add_done_callback(lambda done: self._on_callback(render, done.result()))
+        if callback is None or self.poll_with_webhooks:
+            self._schedule_poll(render, now + self.first_poll_delay())
+        return render.future
+
+    def _schedule_poll(self, render: VideoRender, when: float) -> None:
+        with self._condition:
+            if self._closed:
+                return
+            heapq.heappush(self._heap, (min(when, render.deadline), next(self._sequence), render))
+            self._condition.notify()
+
+    def _schedule(self) -> None:
+        """Scheduler thread: sleep until the earliest poll is due, then hand every due poll to the pool."""
+        while True:
+            with self._condition:
+                while not self._closed and (not self._heap or self._heap[0][0] > time.perf_counter()):
+                    self._condition.wait(self._heap[0][0] - time.perf_counter() if self._heap else None)
+                if self._closed:
+                    return
+                now = time.perf_counter()
+                due = []
+                while self._heap and self._heap[0][0] <= now:
+                    due.append(heapq.heappop(self._heap)[2])
+            for render in due:
+                if now >= render.deadline:
+                    self._finish(render, "timeout", f"not completed after {self.render_timeout_seconds:.0f}s")
+                    continue
+                try:
+                    self._pollers.submit(self._poll, render)
+                except RuntimeError:  # pool shut down by close()
+                    return
+
+    def _poll(self, render: VideoRender) -> None:
+        now = time.perf_counter()
+        render.polls += 1
+        render.poll_gap = now - render.last_poll_at
+        render.last_poll_at = now
+        with self._condition:
+            self.stats["polls"] += 1
+        retry_after = None
+        try:
+            response = self._post(STATUS_PATH, {"video_id": render.video_id, "user_key": self.user_key})
+            status = str(response.get("status", ""))
+            if status == COMPLETED:
+                self._finish(render, COMPLETED, video_url=response.get("video_url", "") or "")
+                return
+            if status in FAILED_STATUSES:
+                self._finish(render, "failed", f"render {status.lower()}")
+                return
+        except VideoApiError as e:
+            render.poll_errors += 1
+            with self._condition:
+                self.stats["poll_errors"] += 1
+            if not e.retryable:
+                self._finish(render, "failed", str(e))
+                return
+            retry_after = e.retry_after
+        except Exception as e:
+            self._finish(render, "failed", f"poll failed: {e}")
+            return
+        # Still rendering (or a transient poll error): back off, honouring Retry-After on 429/503
+        render.interval = min(render.interval * self.poll_backoff, self.poll_max_seconds)
+        self._schedule_poll(render, time.perf_counter() + max(render.interval, retry_after or 0))
+
+    def _on_callback(self, render: VideoRender, callback) -> None:
+        """Record a render's webhook callback (or its timeout); without polling it also completes the render."""
+        with self._condition:
+            render.callback_status = callback.status
+            if callback.arrived_at is not None:
+                render.callback_seconds = callback.arrived_at - render.submitted_at
+                render.callback_payload = callback.raw
+        status = str(callback.payload.get("status", ""))
+        if callback.status == "received" and status == COMPLETED:
+            self._finish(render, COMPLETED, at=callback.arrived_at, video_url=callback.payload.get("video_url") or "")
+        elif callback.status == "received" and not self.poll_with_webhooks:
+            self._finish(render, "failed", f"callback reported {status or 'no status'}", at=callback.arrived_at)
+        elif not self.poll_with_webhooks:
+            self._finish(render, "timeout", "no callback received")
+        self._resolve(render)
+
+    def _finish(self, render: VideoRender, status: str, error: str = "", at: Optional[float] = None,
+                video_url: str = "") -> None:
+        with self._condition:
+            if render.status != "pending":  # close(), a poll and a callback can race to finish the same render
+                return
+            render.status = status
+            render.error = error
+            if video_url:
+                render.video_url = video_url
+            render.render_seconds = (at or time.perf_counter()) - render.submitted_at
+            self._outstanding.discard(render)
+            if status == COMPLETED:
+                self._recent.append(render.render_seconds)
+        self._resolve(render)
+
+    def _resolve(self, render: VideoRender) -> None:
+        """Hand the render to the runner once it is finished and its callback (if any) has arrived or timed out."""
+        with self._condition:
+            if (render.status == "pending" or render.future.done()
+                    or (render.callback is not None and not render.callback_status)):
+                return
+            render.future.set_result(render)
+
+    @property
+    def outstanding(self) -> int:
+        return len(self._outstanding)
+
+
+def video_columns(aigc_seconds: float, video_id: str = "", status: str = "", error: str = "",
+                  submit_seconds: float = 0.0, render: Optional[VideoRender] = None,
+                  callbacks: bool = False) -> Dict[str, Any]:
+    """Per-test CSV columns of the video stages; `total_seconds` spans images → completed video."""
+    render_seconds = render.render_seconds if render else 0.0
+    columns = {
+        "video_id": video_id,
+        "video_status": render.status if render else status,
+        "video_url": render.video_url if render else "",
+        "video_error": (render.error if render else error) or "",
+        "aigc_seconds": round(aigc_seconds, 2),
+        "video_submit_seconds": round(submit_seconds, 2),
+        "video_render_seconds": round(render_seconds, 2),
+        "video_polls": render.polls if render else 0,
+        "video_poll_gap_seconds": round(render.poll_gap, 2) if render else 0,
+        "total_seconds": round(aigc_seconds + submit_seconds + render_seconds, 2),
+    }
+    if callbacks:
+        columns.update({
+            "callback_status": render.callback_status if render else "",
+            "callback_seconds": round(render.callback_seconds, 2) if render else 0,
+            "callback_payload": render.callback_payload if render else "",
+        })
+    return columns
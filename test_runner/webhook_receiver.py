@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+Embedded webhook receiver for the video stage of the AIGC Preview API Test Suite Runner
+
+The Main Video API POSTs to a video's `callback_url` when it finishes
+rendering, so completion can be measured at the moment it is reported
+instead of at the next poll. The receiver is one small asyncio HTTP/1.1
+server on its own thread and event loop; every outstanding render is just
+an entry in a dict and a timer handle, so thousands of them cost nothing
+but memory.
+
+Each test gets its own callback URL (`<public_url><path>/<token>`). An
+incoming POST is matched by its token only and checked against the
+`video_id` in the payload; a POST with a missing or unknown token is
+counted as unmatched, so nobody who can reach the listener can complete a
+test by guessing a video_id. A callback that doesn't arrive within
+`callback_timeout_seconds` of the submission resolves as a timeout.
+"""
+
+import asyncio
+import json
+import secrets
+import threading
+import time
+from concurrent.futures import Future
+from typing import Dict, Any, Optional, Tuple
+
+MAX_BODY_BYTES = 1024 * 1024
+MAX_HEADER_BYTES = 16 * 1024
+
+
+class WebhookError(Exception):
+    """The receiver could not start (e.g. the listen port is taken)."""
+
+
+class WebhookCallback:
+    """Outcome of one expected callback."""
+
+    def __init__(self, status: str, arrived_at: Optional[float] = None, payload: Optional[Dict[str, Any]] = None,
+                 raw: str = ""):
+        self.status = status  # "received" or "timeout"
+        self.arrived_at = arrived_at
+        self.payload = payload or {}
+        self.raw = raw
+
+
+class _Expectation:
+    def __init__(self, token: str):
+        self.token = token
+        self.video_id = ""
+        self.future: Future = Future()
+        self.timer: Optional[asyncio.TimerHandle] = None
+        self.early: Optional[WebhookCallback] = None  # arrived before the submission returned the video_id
+
+
+class WebhookReceiver:
+    """Single embedded HTTP listener correlating render callbacks with the tests that submitted them."""
+
+    def __init__(self, listen_host: str = "127.0.0.1", port: int = 8765, public_url: str = "",
+                 path: str = "/aeon-webhook", callback_timeout_seconds: float = 1800):
+        self.listen_host = listen_host
+        self.port = port
+        self.public_url = public_url.rstrip("/")
+        self.path = "/" + path.strip("/")
+        self.callback_timeout_seconds = callback_timeout_seconds
+        self.stats = {"received": 0, "matched": 0, "unmatched": 0, "duplicates": 0, "late": 0, "rejected": 0,
+                      "timeouts": 0}
+        self._by_token: Dict[str, _Expectation] = {}
+        self._resolved: Dict[str, str] = {}  # token → "received"/"timeout", to acknowledge retried or late callbacks
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._server = None
+        self._thread: Optional[threading.Thread] = None
+
+    @classmethod
+    def from_config(cls, config: Dict) -> "WebhookReceiver":
+        settings = config.get("webhooks", {})
+        port = settings.get("port", 8765)
+        return cls(
+            listen_host=settings.get("listen_host", "127.0.0.1"),
+            port=port,
+            public_url=settings.get("public_url", ""),
+            path=settings.get("path", "/aeon-webhook"),
+            callback_timeout_seconds=settings.get("callback_timeout_seconds", 1800),
+        )
+
+    def start(self) -> None:
+        """Start listening on a background thread; raises WebhookError if the port can't be bound."""
+        started = threading.Event()
+        failure = []
+
+        def run() -> None:
+            self._loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(self._loop)
+            try:
+                self._server = self._loop.run_until_complete(
+                    asyncio.start_server(self._handle, self.listen_host, self.port, backlog=1024))
+            except OSError as e:
+                failure.append(e)
+                started.set()
+                return
+            if not self.port:  # port 0: an ephemeral port was picked
+                self.port = self._server.sockets[0].getsockname()[1]
+            self.public_url = self.public_url or f"http://localhost:{self.port}"
+            started.set()
+            self._loop.run_forever()
+            self._server.close()
+            self._loop.run_until_complete(self._server.wait_closed())
+            self._loop.close()
+
+        self._thread = threading.Thread(target=run, name="aigc-webhooks", daemon=True)
+        self._thread.start()
+        started.wait()
+        if failure:
+            raise WebhookError(f"Cannot listen for webhooks on {self.listen_host}:{self.port}: {failure[0]}")
+
+    def close(self) -> None:
+        """Stop listening; callbacks still expected resolve as timeouts."""
+        if not self._loop:
+            return
+        self._loop.call_soon_threadsafe(self._expire_all)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=5)
+
+    @property
+    def outstanding(self) -> int:
+        return len(self._by_token)
+
+    def register(self) -> Tuple[str, str]:
+        """Reserve a callback URL for one test, before its video is submitted; returns (token, callback_url)."""
+        token = secrets.token_urlsafe(12)
+        self._by_token[token] = _Expectation(token)
+        return token, f"{self.public_url}{self.path}/{token}"
+
+    def discard(self, token: str) -> None:
+        """Forget a callback URL whose submission failed."""
+        self._loop.call_soon_threadsafe(self._forget, token)
+
+    def expect(self, token: str, video_id: str) -> Future:
+        """Bind a registered callback to its submitted video; the future resolves to a WebhookCallback."""
+        expectation = self._by_token.get(token)
+        if expectation is None:  # expired by close()
+            future = Future()
+            future.set_result(WebhookCallback("timeout"))
+            return future
+        self._loop.call_soon_threadsafe(self._bind, expectation, video_id)
+        return expectation.future
+
+    # Everything below runs on the receiver's event loop
+
+    def _bind(self, expectation: _Expectation, video_id: str) -> None:
+        expectation.video_id = video_id
+        if expectation.early is not None:
+            self._resolve(expectation, expectation.early)
+            return
+        expectation.timer = self._loop.call_later(self.callback_timeout_seconds, self._expire, expectation)
+
+    def _forget(self, token: str) -> None:
+        expectation = self._by_token.pop(token, None)
+        if expectation and expectation.timer:
+            expectation.timer.cancel()
+
+    def _resolve(self, expectation: _Expectation, callback: WebhookCallback) -> None:
+        self._forget(expectation.token)
+        self._resolved[expectation.token] = callback.status
+        if not expectation.future.done():
+            expectation.future.set_result(callback)
+
+    def _expire(self, expectation: _Expectation) -> None:
+        self.stats["timeouts"] += 1
+        self._resolve(expectation, WebhookCallback("timeout"))
+
+    def _expire_all(self) -> None:
+        for expectation in list(self._by_token.values()):
+            self._expire(expectation)
+
+    def _accept(self, token: str, body: bytes, arrived_at: float) -> int:
+        """Match one callback POST; returns the HTTP status to answer with."""
+        self.stats["received"] += 1
+        try:
+            payload = json.loads(body)
+            if not isinstance(payload, dict):
+                raise ValueError("not an object")
+        except ValueError:
+            self.stats["rejected"] += 1
+            return 400
+        video_id = str(payload.get("video_id", ""))
+        expectation = self._by_token.get(token)
+        if expectation is None and token in self._resolved:
+            # The API retries callbacks it thinks failed; one that comes after the timeout is only counted
+            self.stats["duplicates" if self._resolved[token] == "received" else "late"] += 1
+            return 200
+        if expectation is None:
+            self.stats["unmatched"] += 1
+            return 404
+        if expectation.video_id and video_id and expectation.video_id != video_id:
+            self.stats["rejected"] += 1  # a callback for another video on this test's URL
+            return 409
+        callback = WebhookCallback("received", arrived_at, payload, body.decode("utf-8", "replace"))
+        self.stats["matched"] += 1
+        if not expectation.video_id:
+            expectation.early = callback  # submission still in flight: resolve once its video_id is bound
+        else:
+            self._resolve(expectation, callback)
+        return 200
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Serve keep-alive HTTP/1.1 requests on one connection; only POSTs to the callback path are accepted."""
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except asyncio.LimitOverrunError:
+                    await self._respond(writer, 431, close=True)
+                    return
+                if len(head) > MAX_HEADER_BYTES:
+                    await self._respond(writer, 431, close=True)
+                    return
+                lines = head.decode("latin-1").split("\r\n")
+                method, target, version = (lines[0].split(" ") + ["", "", ""])[:3]
+                headers = {}
+                for line in lines[1:]:
+                    name, _, value = line.partition(":")
+                    if name:
+                        headers[name.strip().lower()] = value.strip()
+                length = int(headers.get("content-length", "0") or 0)
+                if length > MAX_BODY_BYTES:
+                    await self._respond(writer, 413, close=True)
+                    return
+                body = await reader.readexactly(length) if length else b""
+                arrived_at = time.perf_counter()
+                keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+                prefix = f"{self.path}/"
+                if method != "POST":
+                    status = 405
+                elif not target.startswith(prefix) and target != self.path:
+                    status = 404
+                else:
+                    status = self._accept(target[len(prefix):].split("?")[0], body, arrived_at)
+                await self._respond(writer, status, close=not keep_alive)
+                if not keep_alive:
+                    return
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def _respond(writer: asyncio.StreamWriter, status: int, close: bool = False) -> None:
+        reasons = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 409: "Conflict",
+                   413: "Payload Too Large", 431: "Request Header Fields Too Large"}
+        body = json.dumps({"status": "received" if status == 200 else "error"}).encode()
+        writer.write(f"HTTP/1.1 {status} {reasons.get(status, 'Error')}\r\nContent-Type: application/json\r\n"
+                     f"Content-Length: {len(body)}\r\nConnection: {'close' if close else 'keep-alive'}\r\n\r\n"
+                     .encode() + body)
+        await writer.drain()
@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+"""
+Shared work queue for distributed AIGC Preview API test runs
+
+A coordinator publishes the test matrix into a queue and any number of
+worker processes, on one or several hosts, claim combinations with a lease,
+run them and report the results back. Leases that are not renewed in time
+(crashed or killed workers) are requeued automatically.
+
+Two backends are available, neither needs an external service:
+- a SQLite file (`results/queue.db`), shared by processes on one host
+- a TCP coordinator (`tcp://host:port`) that serves a SQLite queue to
+  workers on other hosts; every request must carry the shared queue token
+"""
+
+import hmac
+import json
+import socket
+import socketserver
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Tuple, Any, Optional, Iterable, Iterator
+
+
+class WorkQueueError(Exception):
+    """The queue could not be reached or rejected a request."""
+
+
+class SqliteWorkQueue:
+    """Lease-based work queue stored in a SQLite file."""
+
+    def __init__(self, path: str):
+        self.path = path
+        with self._connect() as db:
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("""
+                CREATE TABLE IF NOT EXISTS items (
+                    test_id TEXT PRIMARY KEY,
+                    test_number INTEGER NOT NULL,
+                    combination TEXT NOT NULL,
+                    status TEXT NOT NULL DEFAULT 'pending',
+                    worker_id TEXT,
+                    lease_expires REAL,
+                    claims INTEGER NOT NULL DEFAULT 0,
+                    result TEXT
+                )
+            """)
+            db.execute("CREATE INDEX IF NOT EXISTS items_status ON items (status, test_number)")
+            db.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        db = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        try:
+            yield db
+        finally:
+            db.close()
+
+    def publish(self, items: Iterable[Tuple[int, Dict]], batch_size: int = 500) -> int:
+        """Add numbered combinations; already published test_ids are kept as they are."""
+        added = 0
+        batch = []
+        with self._connect() as db:
+            for test_number, combination in items:
+                batch.append((combination["test_id"], test_number, json.dumps(combination)))
+                if len(batch) >= batch_size:
+                    added += self._insert(db, batch)
+                    batch = []
+            if batch:
+                added += self._insert(db, batch)
+            db.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('published', '1')")
+        return added
+
+    @staticmethod
+    def _insert(db: sqlite3.Connection, batch: List[Tuple]) -> int:
+        db.execute("BEGIN IMMEDIATE")
+        before = db.total_changes
+        db.executemany("INSERT OR IGNORE INTO items (test_id, test_number, combination) VALUES (?, ?, ?)", batch)
+        db.execute("COMMIT")
+        return db.total_changes - before
+
+    def is_published(self) -> bool:
+        with self._connect() as db:
+            row = db.execute("SELECT value FROM meta WHERE key = 'published'").fetchone()
+        return bool(row)
+
+    def claim(self, worker_id: str, lease_seconds: float, max_claims: int = 3) -> Optional[Tuple[int, Dict]]:
+        """Lease the next pending combination to `worker_id`, requeueing expired leases first."""
+        now = time.time()
+        with self._connect() as db:
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                self._requeue_expired(db, now, max_claims)
+                row = db.execute(
+                    "SELECT test_id, test_number, combination FROM items "
+                    "WHERE status = 'pending' ORDER BY test_number LIMIT 1"
+                ).fetchone()
+                if row:
+                    db.execute(
+                        "UPDATE items SET status = 'claimed', worker_id = ?, lease_expires = ?, claims = claims + 1 "
+                        "WHERE test_id = ?",
+                        (worker_id, now + lease_seconds, row[0]),
+                    )
+                db.execute("COMMIT")
+            except BaseException:
+                db.execute("ROLLBACK")
+                raise
+        return (row[1], json.loads(row[2])) if row else None
+
+    @staticmethod
+    def _requeue_expired(db: sqlite3.Connection, now: float, max_claims: int) -> None:
+        db.execute(
+            "UPDATE items SET status = 'abandoned', worker_id = NULL, lease_expires = NULL "
+            "WHERE status = 'claimed' AND lease_expires < ? AND claims >= ?",
+            (now, max_claims),
+        )
+        db.execute(
+            "UPDATE items SET status = 'pending', worker_id = NULL, lease_expires = NULL "
+            "WHERE status = 'claimed' AND lease_expires < ?",
+            (now,),
+        )
+
+    def expire_leases(self, max_claims: int = 3) -> None:
+        """Requeue (or abandon, after `max_claims`) combinations whose lease ran out."""
+        with self._connect() as db:
+            db.execute("BEGIN IMMEDIATE")
+            self._requeue_expired(db, time.time(), max_claims)
+            db.execute("COMMIT")
+
+    def renew(self, worker_id: str, lease_seconds: float) -> int:
+        """Extend every lease held by `worker_id`; returns how many were renewed."""
+        with self._connect() as db:
+            cursor = db.execute(
+                "UPDATE items SET lease_expires = ? WHERE status = 'claimed' AND worker_id = ?",
+                (time.time() + lease_seconds, worker_id),
+            )
+            return cursor.rowcount
+
+    def complete(self, worker_id: str, test_id: str, result: Dict) -> bool:
+        """Store a result. Late results from an expired lease are still accepted if nobody finished first."""
+        with self._connect() as db:
+            cursor = db.execute(
+                "UPDATE items SET status = 'done', result = ?, worker_id = ?, lease_expires = NULL "
+                "WHERE test_id = ? AND status != 'done'",
+                (json.dumps(result), worker_id, test_id),
+            )
+            return cursor.rowcount == 1
+
+    def requeue_abandoned(self) -> int:
+        """Give abandoned combinations another chance (e.g. when a coordinator is restarted)."""
+        with self._connect() as db:
+            cursor = db.execute("UPDATE items SET status = 'pending', claims = 0 WHERE status = 'abandoned'")
+            return cursor.rowcount
+
+    def stats(self) -> Dict[str, int]:
+        with self._connect() as db:
+            counts = dict(db.execute("SELECT status, COUNT(*) FROM items GROUP BY status").fetchall())
+        counts = {status: counts.get(status, 0) for status in ("pending", "claimed", "done", "abandoned")}
+        counts["total"] = sum(counts.values())
+        return counts
+
+    def results(self) -> List[Dict]:
+        """Finished results in test number order."""
+        with self._connect() as db:
+            rows = db.execute("SELECT result FROM items WHERE status = 'done' ORDER BY test_number").fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def abandoned(self) -> List[Tuple[int, Dict, int]]:
+        """(test_number, combination, claims) of combinations whose leases expired too often."""
+        with self._connect() as db:
+            rows = db.execute(
+                "SELECT test_number, combination, claims FROM items WHERE status = 'abandoned' ORDER BY test_number"
+            ).fetchall()
+        return [(row[0], json.loads(row[1]), row[2]) for row in rows]
+
+
+# TCP coordinator ------------------------------------------------------------
+
+QUEUE_METHODS = ("is_published", "claim", "renew", "complete", "stats")
+QUEUE_TOKEN_ENV = "AIGC_QUEUE_TOKEN"  # environment variable overriding work_queue.token
+
+
+class _QueueRequestHandler(socketserver.StreamRequestHandler):
+    """One JSON request line in, one JSON response line out."""
+
+    def handle(self) -> None:
+        line = self.rfile.readline()
+        try:
+            request = json.loads(line)
+            if not hmac.compare_digest(str(request.get("token", "")).encode("utf-8"), self.server.token.encode("utf-8")):
+                raise ValueError("invalid queue token")
+            if request.get("method") not in QUEUE_METHODS:
+                raise ValueError(f"unknown method {request.get('method')!r}")
+            value = getattr(self.server.queue, request["method"])(*request.get("args", []))
+            response = {"ok": True, "value": value}
+        except Exception as e:
+            response = {"ok": False, "error": str(e)}
+        self.wfile.write((json.dumps(response) + "\n").encode("utf-8"))
+
+
+class WorkQueueServer(socketserver.ThreadingTCPServer):
+    """Serves a SqliteWorkQueue to remote workers that present the shared token."""
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, address: Tuple[str, int], queue: SqliteWorkQueue, token: str):
+        if not token:
+            raise WorkQueueError("Serving a work queue requires a token")
+        super().__init__(address, _QueueRequestHandler)
+        self.queue = queue
+        self.token = token
+
+    def start(self) -> threading.Thread:
+        thread = threading.Thread(target=self.serve_forever, name="work-queue-server", daemon=True)
+        thread.start()
+        return thread
+
+
+class TcpWorkQueueClient:
+    """Worker-side proxy for a queue served by WorkQueueServer."""
+
+    def __init__(self, host: str, port: int, token: str, timeout: float = 30):
+        self.host = host
+        self.port = port
+        self.token = token
+        self.timeout = timeout
+
+    def _call(self, method: str, *args: Any) -> Any:
+        try:
+            with socket.create_connection((self.host, self.port), timeout=self.timeout) as sock:
+                sock.sendall((json.dumps({"method": method, "args": list(args), "token": self.token}) + "\n").encode("utf-8"))
+                with sock.makefile("rb") as f:
+                    line = f.readline()
+        except OSError as e:
+            raise WorkQueueError(f"cannot reach coordinator at {self.host}:{self.port}: {e}") from e
+        if not line:
+            raise WorkQueueError(f"coordinator at {self.host}:{self.port} closed the connection")
+        response = json.loads(line)
+        if not response["ok"]:
+            raise WorkQueueError(response["error"])
+        return response["value"]
+
+    def is_published(self) -> bool:
+        return self._call("is_published")
+
+    def claim(self, worker_id: str, lease_seconds: float, max_claims: int = 3) -> Optional[Tuple[int, Dict]]:
+        item = self._call("claim", worker_id, lease_seconds, max_claims)
+        return tuple(item) if item else None
+
+    def renew(self, worker_id: str, lease_seconds: float) -> int:
+        return self._call("renew", worker_id, lease_seconds)
+
+    def complete(self, worker_id: str, test_id: str, result: Dict) -> bool:
+        return self._call("complete", worker_id, test_id, result)
+
+    def stats(self) -> Dict[str, int]:
+        return self._call("stats")
+
+
+def open_work_queue(location: str, token: Optional[str] = None):
+    """Open `tcp://host:port` as a client (with the coordinator's token), anything else as a SQLite queue file."""
+    if location.startswith("tcp://"):
+        host, _, port = location[len("tcp://"):].rpartition(":")
+        if not host or not port.isdigit():
+            raise WorkQueueError(f"Invalid queue address '{location}' (expected tcp://host:port)")
+        if not token:
+            raise WorkQueueError(f"A TCP queue needs the coordinator's token (set {QUEUE_TOKEN_ENV} or work_queue.token)")
+        return TcpWorkQueueClient(host, int(port), token)
+    return SqliteWorkQueue(location)
+
+
+def parse_listen_address(address: str) -> Tuple[str, int]:
+    """Parse `host:port` or `:port` (loopback only; use `0.0.0.0:port` to listen on all interfaces)."""
+    host, _, port = address.rpartition(":")
+    if not port.isdigit():
+        raise WorkQueueError(f"Invalid listen address '{address}' (expected host:port)")
+    return host or "127.0.0.1", int(port)